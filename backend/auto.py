@@ -1,7 +1,15 @@
-from bj import Game, PlayerHand, DealerHand, Deck, Card
+from bj import Game, PlayerHand, DealerHand, Deck, Shoe, Card, DEFAULT_PENETRATION
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
 import copy
+import time
+from strategy import StrategyRegistry, read_strategy_cells
+from rng import make_rng, spawn_seeds
+from results import ResultColumns, SHUFFLE_COLUMNS, RESULTS_PATH, RESULTS_CSV_PATH
+from precision import PrecisionTracker, PRECISION_CHECK_HANDS
+from counting import ShoeCounter, SystemComparison, get_systems, DEFAULT_SYSTEM
 
 # Ordered from highest TCC to lowest (matches determine_strategy priority)
 _TCC_KEY_THRESHOLDS = [
@@ -20,9 +28,53 @@ _TCC_KEY_THRESHOLDS = [
 
 _TCC_BASE_PATH = 'strategies/strategy_tcc_0_1.xlsx'
 
+# TCC key -> workbook path, and TCC key -> slot (index into _TCC_KEY_THRESHOLDS,
+# which is also the bet_ramp index and the CompiledStrategy bucket)
+_TCC_KEY_TO_PATH = {key: f'strategies/strategy_{key}.xlsx' for key, _ in _TCC_KEY_THRESHOLDS}
+_TCC_KEY_TO_SLOT = {key: slot for slot, (key, _) in enumerate(_TCC_KEY_THRESHOLDS)}
+_TCC_BASE_SLOT = _TCC_KEY_TO_SLOT['tcc_0_1']
+
+# Shared compiled tables for every simulation, API request and quiz answer
+STRATEGY_REGISTRY = StrategyRegistry(_TCC_KEY_TO_PATH[key] for key, _ in _TCC_KEY_THRESHOLDS)
+
+# Hands per shard in parallel runs. Fixed (not derived from the worker count)
+# so a seeded run plays the same shoes however many workers or threads execute it.
+PARALLEL_SHARD_HANDS = 50000
+
+
+def _auto_play_shard(job):
+    """Run one shard of a parallel simulation (top level so worker processes can pickle it).
+
+    Returns the result columns as arrays, which pickle far smaller than row dicts.
+    """
+    seed, kwargs = job
+    columns, summary = AutoGame.collect(AutoGame.auto_play_iter(
+        input_func=lambda *args, **kw: None,
+        output_func=lambda *args, **kw: None,
+        seed=seed,
+        **kwargs,
+    ))
+    return columns.arrays(), summary
+
+
+def _tcc_slot(true_count: float) -> int:
+    """Return the slot of the highest TCC threshold at or below true_count."""
+    for slot, (_, threshold) in enumerate(_TCC_KEY_THRESHOLDS):
+        if true_count >= threshold:
+            return slot
+    return len(_TCC_KEY_THRESHOLDS) - 1
 
-def _resolve_strategy_key(true_count: float, strategy_overrides: dict, tcc_key_to_path: dict) -> str:
-    """Resolve the strategy file path for a given TCC when user-defined override rows exist.
+
+_THRESHOLDS = np.array([t for _, t in _TCC_KEY_THRESHOLDS], dtype=float)
+
+
+def _tcc_slots(true_counts):
+    """Vectorized _tcc_slot."""
+    return np.minimum((true_counts[:, None] < _THRESHOLDS).sum(axis=1), len(_THRESHOLDS) - 1)
+
+
+def _resolve_strategy_tcc_key(true_count: float, strategy_overrides: dict) -> str:
+    """Resolve the TCC key to play for a given TCC when user-defined override rows exist.
 
     Rules:
     - Empty dict  -> use base strategy (tcc_0_1)
@@ -30,52 +82,67 @@ def _resolve_strategy_key(true_count: float, strategy_overrides: dict, tcc_key_t
                      If none are <= true_count, use the lowest defined threshold (floor fallback).
     """
     if not strategy_overrides:           # {} or None -> base strategy
-        return tcc_key_to_path.get('tcc_0_1', _TCC_BASE_PATH)
+        return 'tcc_0_1'
 
     defined = [(k, t) for k, t in _TCC_KEY_THRESHOLDS if k in strategy_overrides]
     if not defined:
-        return tcc_key_to_path.get('tcc_0_1', _TCC_BASE_PATH)
+        return 'tcc_0_1'
 
     # Prefer highest threshold that is still <= current count
     below = [(k, t) for k, t in defined if t <= true_count]
     if below:
-        best_key = max(below, key=lambda x: x[1])[0]   # highest threshold <= count
-    else:
-        best_key = min(defined, key=lambda x: x[1])[0]  # floor: lowest defined
+        return max(below, key=lambda x: x[1])[0]   # highest threshold <= count
+    return min(defined, key=lambda x: x[1])[0]      # floor: lowest defined
+
 
+def _resolve_strategy_key(true_count: float, strategy_overrides: dict, tcc_key_to_path: dict) -> str:
+    """Resolve the strategy file path for a given TCC when user-defined override rows exist."""
+    best_key = _resolve_strategy_tcc_key(true_count, strategy_overrides)
     return tcc_key_to_path.get(best_key, _TCC_BASE_PATH)
 
 
+def _with_overrides(compiled, strategy_overrides):
+    """The compiled tables with any user strategy overrides applied per TCC key."""
+    if strategy_overrides:
+        for tcc_key, overrides in strategy_overrides.items():
+            if tcc_key in _TCC_KEY_TO_SLOT:
+                compiled = compiled.with_overrides(_TCC_KEY_TO_SLOT[tcc_key], overrides)
+    return compiled
+
+
+def _strategy_slot(true_count, tcc_slot, strategy_overrides, use_base_strategy_only):
+    """Bucket of the strategy table to play at true_count."""
+    if strategy_overrides is not None:
+        # User has configured the strategy editor (even if empty = base fallback)
+        return _TCC_KEY_TO_SLOT[_resolve_strategy_tcc_key(true_count, strategy_overrides)]
+    if use_base_strategy_only:
+        return _TCC_BASE_SLOT  # always tcc_0_1
+    return tcc_slot
+
+
+def _bet_multiple(bet_ramp, bet_slot, bet_count):
+    # Custom bet ramp: 11 multipliers, one per TCC level in descending order:
+    # [tcc_8plus, tcc_7, tcc_6, tcc_5, tcc_4, tcc_3, tcc_2, tcc_0_1, tcc_neg1, tcc_neg2, tcc_under_neg2]
+    if bet_ramp and len(bet_ramp) >= 11:
+        return bet_ramp[bet_slot]
+    return AutoGame.determine_bet_multiple(bet_count)
+
+
+def _insurance_profit(game, bet, true_count, insurance_threshold):
+    """Insurance side-bet: settled after the hand is played, the dealer's cards already known."""
+    if (insurance_threshold is not None and
+            true_count >= insurance_threshold and
+            len(game.dealer_hand.cards) > 0 and
+            game.dealer_hand.cards[0].rank == 'A'):
+        ins_bet = bet * 0.5
+        if game.dealer_hand.blackjack():
+            return ins_bet * 2   # 2:1 payout (net +ins_bet)
+        return -ins_bet
+    return 0
+
+
 class AutoGame:
     
-    def count_cards(items):
-        """Return Hi-Lo count for a collection which may contain hands or raw cards."""
-        total = 0
-        # If we got a single hand, wrap it in a list
-        if not isinstance(items, list):
-            items = [items]
-            
-        for item in items:
-            if hasattr(item, 'cards'):
-                # It's a Hand object
-                item_cards = item.cards
-            elif hasattr(item, 'rank'):
-                # It's a Card object
-                item_cards = [item]
-            elif isinstance(item, list):
-                # It's already a list of cards
-                item_cards = item
-            else:
-                continue
-                
-            for c in item_cards:
-                r = str(c.rank)
-                if r in ('2', '3', '4', '5', '6'):
-                    total += 1
-                elif r in ('10', 'J', 'Q', 'K', 'A'):
-                    total -= 1
-        return total
-
     def determine_strategy(true_card_count: int) -> str:
         """
         Returns the appropriate blackjack strategy file based on the true card count (TCC).
@@ -156,18 +223,8 @@ class AutoGame:
             self.hard_df, self.soft_df, self.split_df = self.read_exact_ranges(path)
 
         def read_exact_ranges(self, path: str):
-            wb = load_workbook(path, data_only=True)
-            ws = wb.active
-
-            def get_range(ws, ref):
-                data = ws[ref]
-                rows = [[cell.value for cell in row] for row in data]
-                return pd.DataFrame(rows)
-
-            hard = get_range(ws, "B3:K20")
-            soft = get_range(ws, "B23:K32")
-            split = get_range(ws, "B35:K44")
-            return hard, soft, split
+            hard, soft, split = read_strategy_cells(path)
+            return pd.DataFrame(hard), pd.DataFrame(soft), pd.DataFrame(split)
 
         def get_action(self, player_hand: PlayerHand, dealer_value, splitallowed=True) -> str:
             if player_hand.can_split() and splitallowed:
@@ -214,99 +271,103 @@ class AutoGame:
                 new_strat.split_df.iat[int(r), int(c)] = str(v).upper()
             return new_strat
 
-    def auto_play_loop(bet_amount=1, num_games=100, balance=1000, num_decks=8,
-                       input_func=input, output_func=print, return_as_json=False,
+    def auto_play_iter(bet_amount=1, num_games=100, balance=1000, num_decks=8,
+                       input_func=input, output_func=print,
                        rules=None,
                        bet_ramp=None,
                        strategy_overrides=None,
                        insurance_threshold=None,
-                       use_base_strategy_only=False):
-        if num_games <= 0:
-            if return_as_json:
-                return {"error": "Number of games must be at least 1.", "results": [], "logs": [],
-                        "final_balance": balance, "total_profit": 0}
-            else:
-                output_func("Number of games must be at least 1.")
-                return
-
-        deck = Deck(num_decks)
+                       use_base_strategy_only=False,
+                       seed=None,
+                       rng=None,
+                       cancel_event=None,
+                       num_shoes=None,
+                       target_se=None,
+                       max_seconds=None,
+                       penetration=DEFAULT_PENETRATION,
+                       burn_cards=0,
+                       counting_system=DEFAULT_SYSTEM,
+                       compare_systems=None):
+        """Generator form of auto_play_loop: yields one result row per hand as it is played.
+
+        Nothing is accumulated per hand, so memory stays flat however long the run.
+        The generator's return value (StopIteration.value) is the run summary:
+        {"final_balance", "total_profit", "shuffles", "cancelled", "precision"}.
+        "shuffles" lists every reshuffle as columns (results.SHUFFLE_COLUMNS):
+        hand = hands played when the shoe was retired, its shoe_profit and cards_dealt.
+        Setting cancel_event (a threading.Event) stops the run before the next hand.
+        With num_shoes the run also stops once that many shoes are finished.
+        penetration is the fraction of the shoe dealt before it is reshuffled, and
+        burn_cards the cards burned unseen after every shuffle.
+
+        With target_se the run stops as soon as the standard error of EV per unit
+        wagered is at or below it (checked every PRECISION_CHECK_HANDS hands);
+        num_games is then the hand budget, and max_seconds an optional time budget.
+        "precision" reports the EV per unit wagered, its standard error and 95%
+        interval, and why the run stopped ("target", "hands", "time", "bankroll",
+        "shoes" or "cancelled").
+
+        counting_system names the counting.SYSTEMS entry that sizes bets and picks
+        the strategy bucket (Hi-Lo by default). compare_systems lists systems to
+        score on the same hands: "counting" then reports each one's betting
+        correlation and the EV per unit wagered had its count sized the bets.
+        """
+        systems = get_systems(list(dict.fromkeys([counting_system, *(compare_systems or ())])))
+        # Every shuffle of this run draws from its own generator (seeded, or an explicit rng)
+        deck = Shoe(num_decks, rng=make_rng(seed, rng), penetration=penetration, burn_cards=burn_cards)
         deck.shuffle()
+        # Hi-Lo alone is read straight off the shoe; another system or any comparison uses a counter
+        counter = ShoeCounter(deck, systems) if compare_systems or counting_system != DEFAULT_SYSTEM else None
+        reshuffle = counter.shuffle if counter is not None else deck.shuffle
+        comparison = None
+        if compare_systems:
+            ramp = np.asarray(bet_ramp[:11], dtype=float) if bet_ramp and len(bet_ramp) >= 11 else None
+            comparison = SystemComparison(
+                get_systems(compare_systems),
+                (lambda tcs: ramp[_tcc_slots(tcs.ravel())].reshape(tcs.shape)) if ramp is not None
+                else np.vectorize(AutoGame.determine_bet_multiple, otypes=[float]))
+            compared = [systems.index(system) for system in comparison.systems]
         total_profit = 0
         shoe_profit = 0
-        card_count = 0
         MAX_SPLITS = 4
-        # Data storage
-        results = []
-        logs = []
-
-        def local_output(*args):
-            logs.append(" ".join(map(str, args)))
-            output_func(*args)
-
-        # legacy text file removed; use csv when not returning json
-        #if not return_as_json:
-        #    open('results.txt', 'w').close()
-
-        all_paths = [
-            "strategies/strategy_tcc_8plus.xlsx",
-            "strategies/strategy_tcc_7.xlsx",
-            "strategies/strategy_tcc_6.xlsx",
-            "strategies/strategy_tcc_5.xlsx",
-            "strategies/strategy_tcc_4.xlsx",
-            "strategies/strategy_tcc_3.xlsx",
-            "strategies/strategy_tcc_2.xlsx",
-            "strategies/strategy_tcc_0_1.xlsx",
-            "strategies/strategy_tcc_neg1.xlsx",
-            "strategies/strategy_tcc_neg2.xlsx",
-            "strategies/strategy_tcc_under_neg2.xlsx",
-        ]
-        strategies = {path: AutoGame.Strategy(path) for path in all_paths}
-
-        # Apply any user strategy overrides per TCC key
-        TCC_KEY_TO_PATH = {
-            'tcc_8plus':       'strategies/strategy_tcc_8plus.xlsx',
-            'tcc_7':           'strategies/strategy_tcc_7.xlsx',
-            'tcc_6':           'strategies/strategy_tcc_6.xlsx',
-            'tcc_5':           'strategies/strategy_tcc_5.xlsx',
-            'tcc_4':           'strategies/strategy_tcc_4.xlsx',
-            'tcc_3':           'strategies/strategy_tcc_3.xlsx',
-            'tcc_2':           'strategies/strategy_tcc_2.xlsx',
-            'tcc_0_1':         'strategies/strategy_tcc_0_1.xlsx',
-            'tcc_neg1':        'strategies/strategy_tcc_neg1.xlsx',
-            'tcc_neg2':        'strategies/strategy_tcc_neg2.xlsx',
-            'tcc_under_neg2':  'strategies/strategy_tcc_under_neg2.xlsx',
-        }
-        if strategy_overrides:
-            for tcc_key, overrides in strategy_overrides.items():
-                path = TCC_KEY_TO_PATH.get(tcc_key)
-                if path and path in strategies:
-                    strategies[path] = strategies[path].apply_overrides(overrides)
+        shuffles = ResultColumns(capacity=64, columns=SHUFFLE_COLUMNS)  # one row per reshuffle
+        shoe_size = deck.size
 
-        strategy_path = AutoGame.determine_strategy(0)
-        strategy = strategies[strategy_path]
+        # All TCC tables compiled into one tensor; strategy selection is a bucket index
+        compiled = _with_overrides(STRATEGY_REGISTRY.compiled(), strategy_overrides)
 
+        cancelled = False
+        precision = PrecisionTracker()
+        stopped = "hands"
+        started = time.perf_counter()
         for i in range(num_games):
             if balance <= 0:
                 output_func("Out of money! Balance is 0.")
+                stopped = "bankroll"
+                break
+
+            if cancel_event is not None and cancel_event.is_set():
+                output_func(f"Simulation cancelled after {i} games.")
+                cancelled = True
+                stopped = "cancelled"
                 break
             
             if i > 0 and i % 1000 == 0:
                 output_func(f"Progress: {i}/{num_games} games completed. Current Balance: {balance}")
 
-            true_card_count = card_count / (len(deck.cards)/52) if len(deck.cards) > 0 else 0
-
-            # Custom bet ramp: 11 multipliers, one per TCC level in descending order:
-            # [tcc_8plus, tcc_7, tcc_6, tcc_5, tcc_4, tcc_3, tcc_2, tcc_0_1, tcc_neg1, tcc_neg2, tcc_under_neg2]
-            if bet_ramp and len(bet_ramp) >= 11:
-                slot = 10  # default: lowest slot (tcc_under_neg2)
-                for idx_r, (_, threshold) in enumerate(_TCC_KEY_THRESHOLDS):
-                    if true_card_count >= threshold:
-                        slot = idx_r
-                        break
-                mult = bet_ramp[slot]
+            cards_left = deck.cards_remaining()
+            if counter is None:
+                true_card_count = bet_count = deck.true_count
             else:
-                mult = AutoGame.determine_bet_multiple(true_card_count)
-            base_bet = bet_amount * mult
+                true_counts = counter.true_counts()
+                bet_counts = counter.true_counts(betting=True)
+                true_card_count = float(true_counts[0])
+                bet_count = float(bet_counts[0])
+
+            tcc_slot = _tcc_slot(true_card_count)
+            bet_slot = tcc_slot if bet_count == true_card_count else _tcc_slot(bet_count)
+
+            base_bet = bet_amount * _bet_multiple(bet_ramp, bet_slot, bet_count)
             #base_bet = max(base_bet, bet_amount)   # <----------TESTING ONLY
 
 
@@ -318,48 +379,28 @@ class AutoGame:
             
             if modified_bet_amount == 0 and bet_amount > 0:
                 output_func("Time to leave the table, count is too low.")
-                deck = Deck(num_decks=num_decks)
-                deck.shuffle()
-                card_count = 0
+                shuffles.append({"hand": i, "shoe_profit": shoe_profit, "cards_dealt": shoe_size - cards_left})
+                if num_shoes is not None and len(shuffles) >= num_shoes:
+                    stopped = "shoes"
+                    break
+                reshuffle()
                 shoe_profit = 0
                 continue
             
             # Strategy selection: respect user-defined override rows if present
-            if strategy_overrides is not None:
-                # User has configured the strategy editor (even if empty = base fallback)
-                new_strategy_path = _resolve_strategy_key(
-                    true_card_count, strategy_overrides, TCC_KEY_TO_PATH
-                )
-            elif use_base_strategy_only:
-                new_strategy_path = AutoGame.determine_strategy(0)  # always tcc_0_1
-            else:
-                new_strategy_path = AutoGame.determine_strategy(true_card_count)
-            if new_strategy_path != strategy_path:
-                strategy_path = new_strategy_path
-                strategy = strategies[strategy_path]
+            strategy = compiled.buckets[_strategy_slot(true_card_count, tcc_slot, strategy_overrides,
+                                                       use_base_strategy_only)]
 
             game = deck.new_game()
             # Pass balance MINUS initial bet to played_hand for splits/doubles
             round_result = AutoGame.played_hand(game, modified_bet_amount, balance - modified_bet_amount, strategy, input_func=input_func, output_func=output_func, MAX_SPLITS=MAX_SPLITS)
 
-            # Insurance side-bet: applied after hand is played, dealer cards already known
-            ins_profit = 0
-            if (insurance_threshold is not None and
-                    true_card_count >= insurance_threshold and
-                    len(game.dealer_hand.cards) > 0 and
-                    game.dealer_hand.cards[0].rank == 'A'):
-                ins_bet = modified_bet_amount * 0.5
-                if game.dealer_hand.blackjack():
-                    ins_profit = ins_bet * 2   # 2:1 payout (net +ins_bet)
-                else:
-                    ins_profit = -ins_bet
-
+            ins_profit = _insurance_profit(game, modified_bet_amount, true_card_count, insurance_threshold)
             profit = Game.interpret_result(round_result) + ins_profit
             balance += profit
             total_profit += profit
             shoe_profit += profit
-            
-            card_count += Game.interpret_card_count(round_result)
+
             
             # Compute actual total bet placed this hand (handles splits & doubles)
             if isinstance(round_result, list):
@@ -367,50 +408,218 @@ class AutoGame:
             else:
                 actual_bet = round_result[1]
             
-            true_card_count_log = card_count / (len(deck.cards)/52) if len(deck.cards) > 0 else 0
-            results.append({
+            precision.add(profit, actual_bet)
+
+            if comparison is not None and modified_bet_amount > 0:
+                comparison.add(bet_counts[compared], profit / modified_bet_amount, actual_bet / modified_bet_amount)
+
+            cards_left = deck.cards_remaining()
+            game.end_game()
+            yield {
                 "hand": i+1,
                 "balance": balance,
-                "card_count": card_count,
-                "true_count": true_card_count_log,
+                "card_count": deck.running_count if counter is None else int(counter.running_counts()[0]),
+                "true_count": deck.true_count if counter is None else float(counter.true_counts()[0]),
                 "bet": actual_bet,
-            })
-            game.end_game()
+            }
             
-            if len(deck.cards) < (52 * num_decks * 0.25):
+            if deck.cut_card_reached():
                     output_func("Reshuffling deck. Shoe Profit: ", shoe_profit)
-                    deck = Deck(num_decks=num_decks)
-                    deck.shuffle()
-                    card_count = 0
+                    shuffles.append({"hand": i + 1, "shoe_profit": shoe_profit, "cards_dealt": shoe_size - cards_left})
+                    if num_shoes is not None and len(shuffles) >= num_shoes:
+                        stopped = "shoes"
+                        break
+                    reshuffle()
                     shoe_profit = 0
 
-        # convert accumulated rows into a pandas DataFrame and save csv
-        results_df = pd.DataFrame(results)
-        csv_saved = False
+            if (i + 1) % PRECISION_CHECK_HANDS == 0:
+                if target_se is not None and precision.reached(target_se):
+                    output_func(f"Target standard error reached after {i + 1} games.")
+                    stopped = "target"
+                    break
+                if max_seconds is not None and time.perf_counter() - started >= max_seconds:
+                    output_func(f"Time budget reached after {i + 1} games.")
+                    stopped = "time"
+                    break
+
+        return {
+            "final_balance": balance,
+            "total_profit": total_profit,
+            "shuffles": shuffles.to_lists(),
+            "cancelled": cancelled,
+            "precision": {**precision.snapshot(), "target_se": target_se, "stopped": stopped},
+            "counting": {"system": counting_system, "systems": comparison.summary() if comparison else []},
+        }
+
+    def drain(rows, sink):
+        """Feed every row of an auto_play_iter generator to sink and return the run summary."""
+        while True:
+            try:
+                sink(next(rows))
+            except StopIteration as stop:
+                return stop.value
+
+    def collect(rows):
+        """Drain an auto_play_iter generator into ResultColumns; returns (columns, summary)."""
+        columns = ResultColumns()
+        summary = AutoGame.drain(rows, columns.append)
+        return columns, summary
+
+    def save_results(columns, export_csv=False, output_func=print, shuffles=None):
+        """Persist run results as Parquet (and results.csv when export_csv). Returns True on success.
+        shuffles (the run's shuffle events) are stored in the Parquet file alongside the hands."""
         try:
-            results_df.to_csv('results.csv', index=False)
-            csv_saved = True
-        except Exception:
-            # if writing fails, still return dataframe
-            pass
+            columns.write_parquet(RESULTS_PATH, shuffles=shuffles)
+            if export_csv:
+                columns.write_csv(RESULTS_CSV_PATH)
+            return True
+        except Exception as e:
+            # if writing fails, the caller still has the in-memory results
+            output_func(f"Could not save results: {e}")
+            return False
+
+    def auto_play_loop(bet_amount=1, num_games=100, balance=1000, num_decks=8,
+                       input_func=input, output_func=print, return_as_json=False,
+                       rules=None,
+                       bet_ramp=None,
+                       strategy_overrides=None,
+                       insurance_threshold=None,
+                       use_base_strategy_only=False,
+                       save_results=True,
+                       export_csv=False,
+                       seed=None,
+                       rng=None,
+                       cancel_event=None,
+                       target_se=None,
+                       max_seconds=None,
+                       penetration=DEFAULT_PENETRATION,
+                       burn_cards=0,
+                       counting_system=DEFAULT_SYSTEM,
+                       compare_systems=None):
+        if num_games <= 0:
+            if return_as_json:
+                return {"error": "Number of games must be at least 1.", "results": [], "logs": [],
+                        "final_balance": balance, "total_profit": 0,
+                        "shuffles": ResultColumns(columns=SHUFFLE_COLUMNS).to_lists()}
+            else:
+                output_func("Number of games must be at least 1.")
+                return
+
+        # Data storage
+        logs = []
+
+        def local_output(*args):
+            logs.append(" ".join(map(str, args)))
+            output_func(*args)
+
+        # legacy text file removed; results are saved as results.parquet (csv is opt-in)
+        #if not return_as_json:
+        #    open('results.txt', 'w').close()
+
+        rows = AutoGame.auto_play_iter(
+            bet_amount=bet_amount, num_games=num_games, balance=balance, num_decks=num_decks,
+            input_func=input_func, output_func=output_func, rules=rules,
+            bet_ramp=bet_ramp, strategy_overrides=strategy_overrides,
+            insurance_threshold=insurance_threshold,
+            use_base_strategy_only=use_base_strategy_only,
+            seed=seed, rng=rng, cancel_event=cancel_event,
+            target_se=target_se, max_seconds=max_seconds, penetration=penetration, burn_cards=burn_cards,
+            counting_system=counting_system, compare_systems=compare_systems,
+        )
+        columns, summary = AutoGame.collect(rows)
+        balance = summary["final_balance"]
+        total_profit = summary["total_profit"]
+        shuffles = summary["shuffles"]
+
+        saved = save_results and AutoGame.save_results(columns, export_csv, output_func, shuffles=shuffles)
 
         if return_as_json:
             return {
                 "num_games": num_games,
-                "results": results,
+                "results": columns.to_records(),
                 "logs": logs,
                 "final_balance": balance,
-                "total_profit": total_profit
+                "total_profit": total_profit,
+                "shuffles": shuffles,
+                "precision": summary["precision"],
+                "counting": summary["counting"],
             }
         else:
             # Auto-generate the simulation graph after a console/script run
-            if csv_saved:
+            if saved:
                 try:
                     from graph import SimGraph
                     SimGraph().generate()
                 except Exception as e:
                     output_func(f"[SimGraph] Could not generate graph: {e}")
-            return results_df
+            return columns.to_dataframe()
+
+    def parallel_auto_play_loop(num_games=100, balance=1000, num_workers=None, seed=None,
+                                shard_hands=PARALLEL_SHARD_HANDS, save_results=True, export_csv=False,
+                                **kwargs):
+        """Run auto_play_loop as independent shards across a process pool and merge the JSON results.
+
+        The run is cut into shards of shard_hands hands. Shard k starts from a fresh
+        shoe and its own child seed spawned from the root seed (rng.spawn_seeds), so a
+        seeded run is bit-for-bit reproducible for any num_workers. Each shard plays on its own bankroll of
+        `balance`: bet sizing and "out of money" are decided per shard. Rows are then
+        stitched into one continuous path: hand numbers are offset by the hands
+        planned for earlier shards and balances by their accumulated profit, so
+        final_balance = balance + total_profit as in a single run. Shuffle events get the
+        same hand offset; the fresh shoe at a shard boundary is not listed as one.
+        kwargs are passed through to auto_play_iter (bet_amount, num_decks, bet_ramp, ...).
+        Shards have fixed sizes, so precision targets and time budgets need a serial run,
+        as does scoring several counting systems (compare_systems).
+        """
+        if kwargs.get("target_se") is not None or kwargs.get("max_seconds") is not None:
+            raise ValueError("target_se and max_seconds are only supported by auto_play_loop")
+        if kwargs.get("compare_systems"):
+            raise ValueError("compare_systems is only supported by auto_play_loop")
+        if num_games <= 0:
+            return AutoGame.auto_play_loop(num_games=num_games, balance=balance, return_as_json=True,
+                                           save_results=False, **kwargs)
+
+        sizes = [min(shard_hands, num_games - start) for start in range(0, num_games, shard_hands)]
+        jobs = [(shard_seed, dict(kwargs, num_games=size, balance=balance))
+                for shard_seed, size in zip(spawn_seeds(seed, len(sizes)), sizes)]
+
+        workers = min(num_workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            shard_results = [_auto_play_shard(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                shard_results = list(pool.map(_auto_play_shard, jobs))
+
+        columns = ResultColumns(capacity=max(num_games, 1))
+        shuffles = ResultColumns(columns=SHUFFLE_COLUMNS)
+        hand_offset = 0
+        profit_offset = 0
+        for size, (arrays, summary) in zip(sizes, shard_results):
+            arrays["hand"] = arrays["hand"] + hand_offset
+            arrays["balance"] = arrays["balance"] + profit_offset
+            columns.extend(arrays)
+            events = {name: np.asarray(values) for name, values in summary["shuffles"].items()}
+            events["hand"] = events["hand"] + hand_offset
+            shuffles.extend(events)
+            hand_offset += size
+            profit_offset += summary["total_profit"]
+
+        if save_results:
+            AutoGame.save_results(columns, export_csv, shuffles=shuffles.to_lists())
+        profits = np.diff(columns.column("balance"), prepend=balance)
+        precision = PrecisionTracker.from_arrays(profits, columns.column("bet"))
+
+        return {
+            "num_games": num_games,
+            "results": columns.to_records(),
+            "logs": [],
+            "final_balance": balance + profit_offset,
+            "total_profit": profit_offset,
+            "shuffles": shuffles.to_lists(),
+            "precision": {**precision.snapshot(), "target_se": None, "stopped": "hands"},
+            "counting": {"system": kwargs.get("counting_system", DEFAULT_SYSTEM), "systems": []},
+            "shards": len(jobs),
+        }
 
     def played_hand(game, bet_amount, balance, strategy, input_func=input, output_func=print, MAX_SPLITS=4):
         game.deal_initial()
@@ -419,14 +628,63 @@ class AutoGame:
         # Initial Blackjack check
         if game.player_hands[0].blackjack():
             if dealer_hand.blackjack():
-                return ("P", bet_amount, AutoGame.count_cards([game.player_hands[0], dealer_hand]))
-            return ("W!", bet_amount, AutoGame.count_cards([game.player_hands[0], dealer_hand]))
+                return ("P", bet_amount)
+            return ("W!", bet_amount)
         if dealer_hand.blackjack():
-            return ("L", bet_amount, AutoGame.count_cards([game.player_hands[0], dealer_hand]))
+            return ("L", bet_amount)
+
+        bets = AutoGame.play_hands(game, bet_amount, balance, strategy, MAX_SPLITS)
+            
+        # Dealer plays if any hand isn't busted
+        any_active = any(not h.is_busted() for h in game.player_hands)
+        if any_active:
+            game.dealer_play(Auto=True)
+            
+        # Collect results (the shoe has already counted every card dealt)
+        results = [(game.get_winner(idx), bets[idx]) for idx in range(len(game.player_hands))]
+
+        if len(results) == 1:
+            return results[0]
+        return results
+
+    def played_table(game, seats, bets, balances, strategies, MAX_SPLITS=4):
+        """Play one round for several seats against one dealer hand, in seat order.
+
+        seats lists the seats with a bet (indices into game.seats); bets, balances
+        (net of the bet) and strategies are given per listed seat. Returns each
+        seat's result in the form played_hand returns. The dealer checks for
+        blackjack once and draws once for the whole table, and only if some seat
+        still has a hand that is not busted.
+        """
+        game.deal_seats(seats)
+        dealer_hand = game.dealer_hand
+        dealer_blackjack = dealer_hand.blackjack()
+        results = [None] * len(seats)
+        hand_bets = {}
+        dealer_plays = False
+        for k, seat in enumerate(seats):
+            game.sit(seat)
+            if game.player_hands[0].blackjack():
+                results[k] = ("P" if dealer_blackjack else "W!", bets[k])
+            elif dealer_blackjack:
+                results[k] = ("L", bets[k])
+            else:
+                hand_bets[k] = AutoGame.play_hands(game, bets[k], balances[k], strategies[k], MAX_SPLITS)
+                dealer_plays = dealer_plays or any(not h.is_busted() for h in game.player_hands)
+        if dealer_plays:
+            game.dealer_play(Auto=True)
+        for k, seat_bets in hand_bets.items():
+            game.sit(seats[k])
+            seat_results = [(game.get_winner(idx), bet) for idx, bet in enumerate(seat_bets)]
+            results[k] = seat_results[0] if len(seat_results) == 1 else seat_results
+        return results
 
+    def play_hands(game, bet_amount, balance, strategy, MAX_SPLITS=4):
+        """Play the seated player's hands, splits included, after the deal; returns the bet on each hand.
+        balance is what the player can still put on the table for doubles and splits."""
+        dealer_hand = game.dealer_hand
         bets = [bet_amount]
-        played_indices = []
-        
+
         # Iteratively play all player hands (supports multiple splits)
         i = 0
         while i < len(game.player_hands):
@@ -459,28 +717,4 @@ class AutoGame:
                     # Fallback to stand if something is wrong
                     break
             i += 1
-            
-        # Dealer plays if any hand isn't busted
-        any_active = any(not h.is_busted() for h in game.player_hands)
-        if any_active:
-            game.dealer_play(Auto=True)
-            
-        # Collect results
-        results = []
-        total_count = 0
-        for idx, h in enumerate(game.player_hands):
-            res = game.get_winner(idx)
-            cnt = 0
-            if idx == 0:
-                # Only count dealer cards once
-                total_cards = []
-                for ph in game.player_hands:
-                    total_cards.extend(ph.cards)
-                total_cards.extend(dealer_hand.cards)
-                total_count = AutoGame.count_cards(total_cards)
-                cnt = total_count
-            results.append((res, bets[idx], cnt))
-            
-        if len(results) == 1:
-            return results[0]
-        return results
+        return bets
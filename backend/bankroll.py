@@ -0,0 +1,228 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from auto import AutoGame, STRATEGY_REGISTRY, _TCC_KEY_THRESHOLDS, _tcc_slots
+from cache import cache_key
+from results import ResultColumns, RESULT_COLUMNS
+from rng import make_np_rng, spawn_seeds
+
+# Shoes simulated to calibrate a model (about 40 hands each at 8 decks)
+CALIBRATION_SHOES = 2000
+# Shoes per calibration shard; fixed so a seeded calibration is the same for any worker count
+CALIBRATION_SHARD_SHOES = 250
+# Calibrated models kept for reuse (keyed by rules, strategy and seed)
+MAX_MODELS = 8
+
+DRAWDOWN_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+BANKROLL_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+TIME_QUANTILES = (0.1, 0.5, 0.9)
+
+# Calibration runs bet one unit on every hand from a bankroll that never binds
+_CALIBRATION_BALANCE = 10 ** 12
+_CALIBRATION_COLUMNS = {name: RESULT_COLUMNS[name] for name in ("hand", "balance", "true_count")}
+
+
+def default_ramp():
+    """AutoGame.determine_bet_multiple at each TCC bucket's threshold, as an 11-entry bet_ramp."""
+    return [AutoGame.determine_bet_multiple(t) for _, t in _TCC_KEY_THRESHOLDS]
+
+
+def _calibration_shard(job):
+    """Play one shard of flat one-unit hands (top level so worker processes can pickle it).
+
+    Returns each hand's TCC slot when it was bet, its profit in units, and the
+    number of hands in every shoe.
+    """
+    seed, num_shoes, options = job
+    rows = AutoGame.auto_play_iter(
+        num_games=sys.maxsize, num_shoes=num_shoes, bet_amount=1, balance=_CALIBRATION_BALANCE,
+        bet_ramp=[1] * len(_TCC_KEY_THRESHOLDS),
+        input_func=lambda *args, **kw: None, output_func=lambda *args, **kw: None,
+        seed=seed, **options,
+    )
+    columns = ResultColumns(columns=_CALIBRATION_COLUMNS)
+    summary = AutoGame.drain(rows, columns.append)
+    ends = np.asarray(summary["shuffles"]["hand"], dtype=np.int64)
+    lengths = np.diff(ends, prepend=0)
+    n = int(ends[-1]) if len(ends) else 0
+    units = np.diff(columns.column("balance")[:n], prepend=_CALIBRATION_BALANCE)
+    # a hand is bet on the count left by the hand before it; every shoe starts at 0
+    before = np.concatenate(([0.0], columns.column("true_count")[:n - 1])) if n else np.zeros(0)
+    before[ends[ends < n]] = 0.0
+    return _tcc_slots(before).astype(np.int8), units, lengths
+
+
+class BankrollModel:
+    """Bankroll trajectories resampled from simulated shoes.
+
+    A calibration run plays flat one-unit bets and keeps, per hand, the TCC
+    bucket the bet was made in and the result in units. A trajectory is a
+    sequence of whole shoes drawn at random from the calibration, so the count's
+    path through a shoe and its results stay together; a bet ramp just scales
+    each hand by its bucket's multiplier. As in auto_play_iter, a 0 multiplier
+    leaves the table and starts the next shoe.
+
+    All trajectories advance together, one shoe per step, in NumPy arrays:
+    per-hand running minimum, maximum and drawdown within every shoe are
+    precomputed for a ramp, so a step is a handful of array operations and the
+    exact hand of ruin or of reaching a goal is only searched for when a
+    trajectory gets there. Bets are not capped by a shrinking bankroll.
+    """
+
+    def __init__(self, slots, units, shoe_lengths):
+        self.slots = np.asarray(slots, dtype=np.int64)
+        self.units = np.asarray(units, dtype=float)
+        self.shoe_lengths = np.asarray(shoe_lengths, dtype=np.int64)
+        self.shoe_starts = np.concatenate(([0], np.cumsum(self.shoe_lengths)[:-1]))
+
+    @classmethod
+    def calibrate(cls, num_shoes=CALIBRATION_SHOES, num_decks=8, seed=None, num_workers=None,
+                  shard_shoes=CALIBRATION_SHARD_SHOES, **options):
+        """Simulate num_shoes shoes; options (strategy_overrides, insurance_threshold,
+        use_base_strategy_only) are passed to auto_play_iter."""
+        options = dict(options, num_decks=num_decks)
+        sizes = [min(shard_shoes, num_shoes - start) for start in range(0, num_shoes, shard_shoes)]
+        jobs = [(shard_seed, size, options) for shard_seed, size in zip(spawn_seeds(seed, len(sizes)), sizes)]
+        workers = min(num_workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            parts = [_calibration_shard(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_calibration_shard, jobs))
+        return cls(*(np.concatenate([p[k] for p in parts]) for k in range(3)))
+
+    def _shoe_paths(self, bet_ramp, bet_amount):
+        """Per-hand profit under a ramp and, within each shoe, the running profit and its
+        running minimum, maximum and worst drawdown so far; plus each shoe's playable length."""
+        ramp = np.asarray(bet_ramp, dtype=float)
+        bets = bet_amount * ramp[self.slots]
+        profit = bets * self.units
+        shoe_id = np.repeat(np.arange(len(self.shoe_lengths)), self.shoe_lengths)
+        running = pd.Series(profit).groupby(shoe_id).cumsum()
+        low = running.groupby(shoe_id).cummin().to_numpy()
+        high = np.maximum(running.groupby(shoe_id).cummax().to_numpy(), 0.0)
+        running = running.to_numpy()
+        drawdown = pd.Series(high - running).groupby(shoe_id).cummax().to_numpy()
+        # a shoe ends at its first hand with no bet (the player leaves and the shoe is reshuffled)
+        no_bet = np.where(bets == 0, np.arange(len(bets)) - self.shoe_starts[shoe_id], sys.maxsize)
+        first_no_bet = pd.Series(no_bet).groupby(shoe_id).min().reindex(
+            range(len(self.shoe_lengths)), fill_value=sys.maxsize).to_numpy()
+        lengths = np.minimum(self.shoe_lengths, first_no_bet)
+        return profit, running, low, high, drawdown, lengths, bets
+
+    def simulate(self, bankroll, bet_ramp=None, bet_amount=1, num_hands=100_000, num_trajectories=10_000,
+                 stop_loss=None, win_goal=None, seed=None):
+        """Simulate num_trajectories independent bankrolls for up to num_hands hands.
+
+        A trajectory stops when it is ruined (the bankroll is gone, or stop_loss
+        has been lost) or, with win_goal, once it is that much ahead. Returns risk
+        of ruin, the outcome split, time to double, drawdown and final bankroll
+        quantiles, and the per-hand EV and SD the ramp gives on the calibration.
+        """
+        bet_ramp = default_ramp() if bet_ramp is None else bet_ramp
+        profit, running, low, high, drawdown, lengths, bets = self._shoe_paths(bet_ramp, bet_amount)
+        if not lengths.any():
+            raise ValueError("The bet ramp never bets at the start of a shoe")
+        rng = make_np_rng(seed)
+        floor = bankroll - stop_loss if stop_loss is not None else 0.0
+        goal = bankroll + win_goal if win_goal is not None else np.inf
+        double = 2 * bankroll
+
+        n = num_trajectories
+        balance = np.full(n, float(bankroll))
+        peak = balance.copy()
+        max_drawdown = np.zeros(n)
+        hands = np.zeros(n, dtype=np.int64)
+        ruin_hand = np.full(n, -1, dtype=np.int64)
+        goal_hand = np.full(n, -1, dtype=np.int64)
+        double_hand = np.full(n, -1, dtype=np.int64)
+        active = np.arange(n)
+        while len(active):
+            shoe = rng.integers(len(lengths), size=len(active))
+            start = self.shoe_starts[shoe]
+            k = np.minimum(lengths[shoe], num_hands - hands[active])
+            played = k > 0
+            active, start, k = active[played], start[played], k[played]
+            if not len(active):
+                continue
+            last = start + k - 1
+            b = balance[active]
+            # the few trajectories that are ruined, reach the goal or double here: find the exact hand
+            upper = np.where(double_hand[active] < 0, min(goal, double), goal)
+            for j in np.flatnonzero((b + low[last] <= floor) | (b + high[last] >= upper)):
+                t = active[j]
+                path = b[j] + running[start[j]:last[j] + 1]
+                hit = np.flatnonzero((path <= floor) | (path >= goal))
+                if len(hit):
+                    k[j] = hit[0] + 1
+                    path = path[:k[j]]
+                    if path[-1] <= floor:
+                        ruin_hand[t] = hands[t] + k[j]
+                    else:
+                        goal_hand[t] = hands[t] + k[j]
+                if double_hand[t] < 0 and (path >= double).any():
+                    double_hand[t] = hands[t] + int(np.argmax(path >= double)) + 1
+            last = start + k - 1
+            max_drawdown[active] = np.maximum.reduce([max_drawdown[active], peak[active] - (b + low[last]),
+                                                      drawdown[last]])
+            peak[active] = np.maximum(peak[active], b + high[last])
+            balance[active] = b + running[last]
+            hands[active] += k
+            done = (hands[active] >= num_hands) | (ruin_hand[active] >= 0) | (goal_hand[active] >= 0)
+            active = active[~done]
+
+        ruined = ruin_hand >= 0
+        reached = goal_hand >= 0
+        doubled = double_hand >= 0
+        played = bets > 0
+        return {
+            "bankroll": bankroll,
+            "bet_ramp": list(bet_ramp),
+            "num_trajectories": n,
+            "num_hands": num_hands,
+            "ev_per_hand": float(profit.sum() / played.sum()) if played.any() else 0.0,
+            "sd_per_hand": float(profit[played].std()) if played.any() else 0.0,
+            "risk_of_ruin": float(ruined.mean()),
+            "outcomes": {
+                "stop_loss" if stop_loss is not None else "ruin": float(ruined.mean()),
+                "win_goal": float(reached.mean()),
+                "completed": float((~ruined & ~reached).mean()),
+            },
+            "hands_to_ruin": _quantiles(ruin_hand[ruined], TIME_QUANTILES),
+            "doubled": float(doubled.mean()),
+            "hands_to_double": _quantiles(double_hand[doubled], TIME_QUANTILES),
+            "max_drawdown": _quantiles(max_drawdown, DRAWDOWN_QUANTILES),
+            "final_bankroll": {"mean": float(balance.mean()), **_quantiles(balance, BANKROLL_QUANTILES)},
+        }
+
+
+def _quantiles(values, qs):
+    if not len(values):
+        return {f"p{round(q * 100)}": None for q in qs}
+    return {f"p{round(q * 100)}": float(v) for q, v in zip(qs, np.quantile(values, qs))}
+
+
+_MODELS = OrderedDict()
+_MODELS_LOCK = threading.Lock()
+
+
+def calibrated_model(num_decks=8, num_shoes=CALIBRATION_SHOES, seed=None, num_workers=None, **options):
+    """BankrollModel.calibrate, reusing a model already built for the same rules, strategy and seed."""
+    STRATEGY_REGISTRY.compiled()
+    key = cache_key("bankroll-model", {"num_decks": num_decks, "num_shoes": num_shoes, "seed": seed, **options},
+                    STRATEGY_REGISTRY.version)
+    with _MODELS_LOCK:
+        model = _MODELS.get(key)
+        if model is not None:
+            _MODELS.move_to_end(key)
+            return model
+    model = BankrollModel.calibrate(num_shoes, num_decks, seed=seed, num_workers=num_workers, **options)
+    with _MODELS_LOCK:
+        _MODELS[key] = model
+        if len(_MODELS) > MAX_MODELS:
+            _MODELS.popitem(last=False)
+    return model
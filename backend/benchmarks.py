@@ -1,6 +1,8 @@
 import time
+import tracemalloc
 from statistics import mean
 from auto import AutoGame
+from bj import PlayerHand, Deck, Shoe
 
 
 def run_single_benchmark(num_games, bet_amount=10, balance=1000, num_decks=8):
@@ -60,7 +62,103 @@ def benchmark_suite():
     for hands, avg_time, avg_hps in summary:
         print(f"{hands:>10} {avg_time:>15.4f} {avg_hps:>18.2f}")
 
+# full rescan of the hand on every query, as PlayerHand did before it tracked its totals
+def _rescan_value(cards):
+    total = 0
+    aces = 0
+    for card in cards:
+        total += card.get_value()
+        if card.rank == 'A':
+            aces += 1
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total, aces > 0
+
+
+# times the queries a decision makes per hand: value, soft check and bust check
+# after every card, once by rescanning the cards and once from the running state
+def benchmark_hand_evaluation(num_hands=200000, num_decks=8):
+    shoe = Shoe(num_decks)
+    shoe.shuffle()
+    hands = []
+    for _ in range(num_hands):
+        if shoe.cards_remaining() < 5:
+            shoe.shuffle()
+        hands.append([shoe.deal_card() for _ in range(4)])
+
+    start = time.perf_counter()
+    for cards in hands:
+        held = []
+        for card in cards:
+            held.append(card)
+            total, soft = _rescan_value(held)
+            _rescan_value(held)
+            _rescan_value(held)
+    rescan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for cards in hands:
+        hand = PlayerHand()
+        for card in cards:
+            hand.draw_card(card)
+            hand.get_value()
+            hand.has_soft_ace()
+            hand.is_busted()
+    incremental_time = time.perf_counter() - start
+
+    print("\nHand Evaluation Benchmark")
+    print("-" * 48)
+    print(f"{'Method':>14} {'Time (s)':>12} {'us/hand':>12}")
+    print("-" * 48)
+    print(f"{'rescan':>14} {rescan_time:>12.4f} {rescan_time / num_hands * 1e6:>12.3f}")
+    print(f"{'incremental':>14} {incremental_time:>12.4f} {incremental_time / num_hands * 1e6:>12.3f}")
+    print(f"Speedup: {rescan_time / incremental_time:.2f}x")
+    return rescan_time, incremental_time
+
+# times a reshuffle for each shoe size: rebuilding a Deck of Card objects (as every reshuffle
+# once did) against permuting the Shoe's buffer in place, early in a run and after many shuffles
+def benchmark_reshuffle(deck_counts=(1, 2, 6, 8, 80), shuffles=2000, run_length=20000):
+    print("\nReshuffle Benchmark")
+    print("-" * 72)
+    print(f"{'Decks':>6} {'new Deck us':>12} {'Shoe us':>10} {'after run us':>13} {'bytes/shuffle':>14} {'Speedup':>9}")
+    print("-" * 72)
+    results = []
+    for num_decks in deck_counts:
+        rebuilds = max(shuffles // num_decks, 20)
+        start = time.perf_counter()
+        for _ in range(rebuilds):
+            Deck(num_decks=num_decks).shuffle()
+        rebuild_us = (time.perf_counter() - start) / rebuilds * 1e6
+
+        shoe = Shoe(num_decks)
+        start = time.perf_counter()
+        for _ in range(shuffles):
+            shoe.shuffle()
+        early_us = (time.perf_counter() - start) / shuffles * 1e6
+        # a long run: the cost of one more shuffle does not grow with the shuffles before it
+        for _ in range(run_length):
+            shoe.shuffle()
+        start = time.perf_counter()
+        for _ in range(shuffles):
+            shoe.shuffle()
+        late_us = (time.perf_counter() - start) / shuffles * 1e6
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(shuffles):
+            shoe.shuffle()
+        retained = (tracemalloc.get_traced_memory()[0] - before) / shuffles
+        tracemalloc.stop()
+
+        print(f"{num_decks:>6} {rebuild_us:>12.1f} {early_us:>10.2f} {late_us:>13.2f} {retained:>14.1f} "
+              f"{rebuild_us / early_us:>8.0f}x")
+        results.append((num_decks, rebuild_us, early_us, late_us, retained))
+    return results
+
 # only run benchmarks if the file is executed directly
 if __name__ == "__main__":
+    benchmark_reshuffle()
+    benchmark_hand_evaluation()
     benchmark_suite()
 
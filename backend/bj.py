@@ -1,21 +1,67 @@
+import math
+from array import array
+import numpy as np
+from rng import make_rng
+
+SUITS = ["♤", "♡", "♧", "♢"]
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+# Hi-Lo tag of every rank: the shoe adds each card's tag to its running count as it is dealt
+HI_LO_TAGS = {'2': 1, '3': 1, '4': 1, '5': 1, '6': 1, '7': 0, '8': 0, '9': 0,
+              '10': -1, 'J': -1, 'Q': -1, 'K': -1, 'A': -1}
+# Fraction of the shoe dealt before the reshuffle (the cut card sits at 25% of the shoe left)
+DEFAULT_PENETRATION = 0.75
+MAX_PENETRATION = 0.9
+# Fewest cards behind the cut card, and between the burn cards and the cut card: a quarter deck
+MIN_CUT_CARDS = 13
+# Cards kept back per hand (the dealer's included) before a multi-seat round is dealt
+HAND_RESERVE = 6
+
+
+def max_penetration(num_decks):
+    """Deepest penetration that leaves MIN_CUT_CARDS behind the cut card."""
+    return min(MAX_PENETRATION, 1 - MIN_CUT_CARDS / (52 * num_decks))
+
+
+def validate_shoe(num_decks, penetration=DEFAULT_PENETRATION, burn_cards=0):
+    """Raise ValueError for a shoe that could run out of cards in the middle of a hand."""
+    if num_decks < 1:
+        raise ValueError("num_decks must be at least 1")
+    size = 52 * num_decks
+    cut_card = math.ceil(size * (1 - penetration))
+    if not 0 < penetration <= MAX_PENETRATION or cut_card < MIN_CUT_CARDS:
+        raise ValueError(f"penetration must be above 0 and at most {max_penetration(num_decks):.4g} "
+                         f"for {num_decks} deck(s), leaving {MIN_CUT_CARDS} cards behind the cut card")
+    most = size - cut_card - MIN_CUT_CARDS
+    if not 0 <= burn_cards <= most:
+        raise ValueError(f"burn_cards must be between 0 and {most} for {num_decks} deck(s) "
+                         f"at penetration {penetration}")
+
+
 class Card:
     def __init__(self, rank, suit):
         self.rank = rank
         self.suit = suit
+        self.value = self._rank_value(rank)
 
-    def get_value(self):
-        if self.rank in ['J', 'Q', 'K']:
+    @staticmethod
+    def _rank_value(rank):
+        if rank in ['J', 'Q', 'K']:
             return 10
-        elif self.rank == 'A':
+        elif rank == 'A':
             return 11  # Initially consider Ace as 11
         else:
-            return int(self.rank)
+            return int(rank)
+
+    def get_value(self):
+        return self.value
 class Deck:
-    def __init__(self, num_decks=1):
+    def __init__(self, num_decks=1, rng=None):
+        self.rng = make_rng(rng=rng)  # per-deck generator, never the global random state
         self.cards = []
         self.games = []  # List to track all active games
-        suits = ["♤", "♡", "♧", "♢"]
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+        self.running_count = 0  # Hi-Lo count of every card dealt from this deck
+        suits = SUITS
+        ranks = RANKS
         #ranks = ['3','3','3','3','3','3','3','3','3','3','3','3','3','3','3','3'] #testing
         #ranks = ['A', '10'] #testing
         for i in range(num_decks):
@@ -24,17 +70,31 @@ class Deck:
                     self.cards.append(Card(rank, suit))
     
     def shuffle(self):
-        import random
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
     
     def deal_card(self):
         if not self.cards:
             raise IndexError("Deck is empty - cannot deal a card")
-        return self.cards.pop()
+        card = self.cards.pop()
+        self.running_count += HI_LO_TAGS[card.rank]
+        return card
+
+    def cards_remaining(self):
+        return len(self.cards)
+
+    @property
+    def decks_remaining(self):
+        return self.cards_remaining() / 52
+
+    @property
+    def true_count(self):
+        """Running count per deck left to deal (0 once the deck is empty)."""
+        cards_left = self.cards_remaining()
+        return self.running_count / (cards_left / 52) if cards_left > 0 else 0
         
-    def new_game(self):
+    def new_game(self, num_seats=1):
         """Create a new game and add it to the deck's games"""
-        game = Game(self)
+        game = Game(self, num_seats)
         self.games.append(game)
         return game
         
@@ -42,14 +102,121 @@ class Deck:
         """Remove a completed game from the deck's games"""
         if game in self.games:
             self.games.remove(game)
-            
+
+
+# One shared Card per (rank, suit); code = suit index * 13 + rank index
+CARD_TABLE = tuple(Card(rank, suit) for suit in SUITS for rank in RANKS)
+# Hi-Lo tag per card code
+CODE_TAGS = tuple(HI_LO_TAGS[card.rank] for card in CARD_TABLE)
+
+
+class Shoe(Deck):
+    """Compact shoe: cards are integer codes (rank index 0-12 plus suit) in a flat array.
+
+    The buffer is allocated once. Dealing moves a cursor over it and returns the
+    shared Card for that code, and shuffle() permutes it in place with a NumPy
+    generator seeded from rng, so a reshuffle allocates nothing and costs
+    microseconds even at 80 decks. Games, hands and strategies run on it
+    exactly as on a Deck. The running count is kept up to date as cards are
+    dealt and restarts at 0 on every shuffle.
+
+    The cut card goes in after `penetration` of the shoe: cut_card_reached() is
+    true once fewer than cut_card cards are left. After every shuffle the
+    dealer burns burn_cards face down; they leave the shoe but are never counted.
+    validate_shoe keeps a quarter deck behind the cut card. Should a round still
+    run the shoe dry, the discards are shuffled back in behind the cards on the
+    table, as a dealer would, and the shoe is retired after that round.
+    """
+    def __init__(self, num_decks=1, rng=None, penetration=DEFAULT_PENETRATION, burn_cards=0):
+        validate_shoe(num_decks, penetration, burn_cards)
+        self.rng = make_rng(rng=rng)
+        self._np_rng = np.random.default_rng(self.rng.getrandbits(128))
+        self.games = []
+        self.num_decks = num_decks
+        self.codes = array('B', range(len(CARD_TABLE))) * num_decks
+        self.size = len(self.codes)
+        self.burn_cards = burn_cards
+        self.cut_card = math.ceil(self.size * (1 - penetration))
+        self.pos = 0
+        self.round_start = 0    # cursor when the current round was dealt
+        self.exhausted = False  # the discards went back in during a round
+        self.running_count = 0
+
+    def shuffle(self):
+        """Collect every card back into the shoe, permute the buffer in place and burn."""
+        self._np_rng.shuffle(np.frombuffer(self.codes, dtype=np.uint8))
+        self.pos = self.round_start = self.burn_cards
+        self.exhausted = False
+        self.running_count = 0
+
+    def cut_card_reached(self):
+        return self.exhausted or self.size - self.pos < self.cut_card
+
+    def new_game(self, num_seats=1):
+        self.round_start = self.pos
+        return super().new_game(num_seats)
+
+    def _reshuffle_discards(self):
+        """Out of cards mid-round: shuffle everything dealt before the round back in
+        behind the cards on the table. The running count restarts from those cards."""
+        start = self.round_start
+        if start == 0:
+            raise IndexError("Deck is empty - cannot deal a card")
+        view = np.frombuffer(self.codes, dtype=np.uint8)
+        self._np_rng.shuffle(view[:start])
+        view[:] = np.concatenate((view[start:], view[:start]))
+        self.pos = self.size - start
+        self.round_start = 0
+        self.exhausted = True
+        self.running_count = sum(CODE_TAGS[code] for code in self.codes[:self.pos])
+
+    def deal_code(self):
+        """Deal the next card as its integer code."""
+        if self.pos >= self.size:
+            self._reshuffle_discards()
+        code = self.codes[self.pos]
+        self.pos += 1
+        self.running_count += CODE_TAGS[code]
+        return code
+
+    def deal_card(self):
+        return CARD_TABLE[self.deal_code()]
+
+    def cards_remaining(self):
+        return self.size - self.pos
+
+    @property
+    def cards(self):
+        """Undealt cards as Card objects (builds a list; avoid in hot loops)."""
+        return [CARD_TABLE[c] for c in self.codes[self.pos:]]
+
+
 class Game:
-    def __init__(self, deck):
+    """One round against the dealer for one or more seats.
+
+    Every seat holds its own list of hands (more than one after a split).
+    player_hands is the seated player's list, and hits, splits and results act
+    on it; sit() moves play to another seat. All seats share the dealer hand.
+    """
+    def __init__(self, deck, num_seats=1):
         self.deck = deck  # Store reference to the parent deck
-        # Start each game with one player hand by default
-        self.player_hands = [PlayerHand()]
+        # Start each game with one player hand per seat
+        self.seats = [[PlayerHand()] for _ in range(num_seats)]
+        self.player_hands = self.seats[0]
         self.dealer_hand = DealerHand()
 
+    def sit(self, seat):
+        """Make seat the one whose hands are played."""
+        self.player_hands = self.seats[seat]
+
+    def deal_seats(self, seats):
+        """Deal the opening cards in table order: one to each listed seat, then
+        the dealer, twice. With one seat this is the order of deal_initial."""
+        for _ in range(2):
+            for seat in seats:
+                self.seats[seat][0].draw_card(self.deck.deal_card())
+            self.dealer_hand.draw_card(self.deck.deal_card())
+
     def new_hand(self):
         """Add a new player hand to this game and return its index."""
         ph = PlayerHand()
@@ -77,7 +244,7 @@ class Game:
         if not original.can_split():
             raise ValueError("Hand cannot be split")
         # take the second card to form the new hand
-        card_to_move = original.cards.pop()
+        card_to_move = original.remove_card()
         new_hand = PlayerHand()
         new_hand.draw_card(card_to_move)
         # deal one new card to each hand
@@ -115,26 +282,45 @@ class Game:
         else:
             return "P"
     def interpret_result(result):
-        """Returns net profit/loss from any result structure"""
+        """Returns net profit/loss from any result structure: an (outcome, bet) tuple or a list of them"""
         if isinstance(result, tuple):
-            outcome, bet, count = result
+            outcome, bet = result
             if outcome not in ['W', 'W!','L','P']:
                 raise ValueError("Invalid outcome")
             return bet*1.5 if outcome == 'W!' else bet if outcome == 'W' else -bet if outcome == 'L' else 0
         return sum(Game.interpret_result(r) for r in result) if isinstance(result, list) else 0
-    def interpret_card_count(result):
-        """Returns card count from any result structure"""
-        if isinstance(result, tuple):
-            _, _, count = result
-            return count
-        return sum(Game.interpret_card_count(r) for r in result) if isinstance(result, list) else 0
 class PlayerHand:
+    """A hand of cards that keeps its total up to date as cards are drawn.
+
+    hard_total counts every ace as 1; the hand is soft when it holds an ace
+    that can still count as 11 without busting.
+    """
     def __init__(self):
         self.cards = []
+        self.hard_total = 0
+        self.aces = 0
     def clear(self):
         self.cards = []
+        self.hard_total = 0
+        self.aces = 0
     def draw_card(self, card):
         self.cards.append(card)
+        value = card.value
+        if value == 11:
+            self.aces += 1
+            self.hard_total += 1
+        else:
+            self.hard_total += value
+    def remove_card(self):
+        """Take the last card back out of the hand (used when splitting)."""
+        card = self.cards.pop()
+        value = card.value
+        if value == 11:
+            self.aces -= 1
+            self.hard_total -= 1
+        else:
+            self.hard_total -= value
+        return card
     def num_cards(self):
         # Return the number of cards in the hand
         return len(self.cards)
@@ -157,38 +343,21 @@ class PlayerHand:
     def can_split(self):
         return len(self.cards) == 2 and self.cards[0].rank == self.cards[1].rank
     
-    def _evaluate(self):
-        total = 0
-        aces = 0
-        for card in self.cards:
-            v = card.get_value()  # Ace returns 11 here
-            total += v
-            if card.rank == 'A':
-                aces += 1
-
-        # Correct threshold: only reduce if busting
-        while total > 21 and aces:
-            total -= 10
-            aces -= 1
-
-        soft = aces > 0  # at least one Ace still counted as 11
-        return total, soft
-
     def get_value(self):
-        total, _ = self._evaluate()
-        return total
+        total = self.hard_total
+        # At most one ace can count as 11 without busting
+        return total + 10 if self.aces and total <= 11 else total
 
     def has_soft_ace(self):
-        _, soft = self._evaluate()
-        return soft
+        return self.aces > 0 and self.hard_total <= 11
 
 
     def blackjack(self):
-        ten = any(card.get_value() == 10 for card in self.cards)
-        return 'A' in [card.rank for card in self.cards] and ten and len(self.cards) == 2
+        # Two cards totalling hard 11 with an ace means ace + ten-value card
+        return len(self.cards) == 2 and self.aces == 1 and self.hard_total == 11
     
     def is_busted(self):
-        return self.get_value() > 21  
+        return self.hard_total > 21  
     
 class DealerHand(PlayerHand):
     def should_hit(self):
@@ -199,4 +368,4 @@ class DealerHand(PlayerHand):
         output = f"{self.cards[0].rank} of {self.cards[0].suit}"
         return output
     def get_card_shown_value(self):
-        return self.cards[0].get_value()
\ No newline at end of file
+        return self.cards[0].value
\ No newline at end of file
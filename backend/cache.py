@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+# In-memory budget for cached results (bytes, across all entries)
+CACHE_MAX_BYTES = int(os.environ.get("BJ_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Optional on-disk tier: set BJ_CACHE_DIR to keep results across restarts
+CACHE_DIR = os.environ.get("BJ_CACHE_DIR") or None
+CACHE_TTL_SECONDS = float(os.environ.get("BJ_CACHE_TTL", str(24 * 60 * 60)))
+
+
+def cache_key(endpoint, params, version=None):
+    """Content address of a request: sha256 over the canonical JSON of the endpoint,
+    its parameters (seed included) and the strategy-bundle version."""
+    payload = json.dumps({"endpoint": endpoint, "params": params, "version": version},
+                         sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-tier result cache: an LRU held in memory under a byte budget, backed by an
+    optional directory on disk whose entries expire after ttl seconds.
+
+    An entry is a dict of named byte blobs (e.g. the JSON body plus the files a run
+    writes), so a hit is served without re-encoding anything.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, disk_dir=CACHE_DIR, ttl=CACHE_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.ttl = ttl
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> (blobs, size), least recently used first
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return the cached blobs for key, or None. Counts a hit or a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        blobs = self._read_disk(key)
+        with self._lock:
+            if blobs is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, blobs)
+        return blobs
+
+    def put(self, key, blobs):
+        with self._lock:
+            self._remember(key, blobs)
+        self._write_disk(key, blobs)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                shutil.rmtree(os.path.join(self.disk_dir, name), ignore_errors=True)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "disk_dir": self.disk_dir,
+        }
+
+    def _remember(self, key, blobs):
+        size = sum(len(blob) for blob in blobs.values())
+        if size > self.max_bytes:
+            return      # never evict everything for one oversized result; disk tier may still hold it
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= old[1]
+        self._entries[key] = (blobs, size)
+        self.bytes_used += size
+        while self.bytes_used > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes_used -= evicted
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        entry_dir = os.path.join(self.disk_dir, key)
+        try:
+            if time.time() - os.path.getmtime(entry_dir) > self.ttl:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                return None
+            blobs = {}
+            for name in os.listdir(entry_dir):
+                with open(os.path.join(entry_dir, name), "rb") as f:
+                    blobs[name] = f.read()
+            return blobs
+        except OSError:
+            return None
+
+    def _write_disk(self, key, blobs):
+        if not self.disk_dir:
+            return
+        entry_dir = os.path.join(self.disk_dir, key)
+        tmp_dir = f"{entry_dir}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+            for name, blob in blobs.items():
+                with open(os.path.join(tmp_dir, name), "wb") as f:
+                    f.write(blob)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except OSError as e:
+            print(f"[ResultCache] Could not write {key[:12]}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self._expire_disk()
+
+    def _expire_disk(self):
+        """Drop on-disk entries older than the TTL."""
+        now = time.time()
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
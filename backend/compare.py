@@ -0,0 +1,129 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from auto import AutoGame
+from results import ResultColumns, RESULT_COLUMNS
+from rng import spawn_seeds
+
+# Shoes per shard. Fixed, so a seeded comparison plays the same shoes for any worker count.
+COMPARE_SHARD_SHOES = 200
+# Simulation options a configuration may change; everything else is shared
+CONFIG_OPTIONS = ("bet_ramp", "strategy_overrides", "insurance_threshold", "use_base_strategy_only",
+                  "counting_system")
+
+_BET_COLUMNS = {name: RESULT_COLUMNS[name] for name in ("hand", "bet")}
+
+
+def _config_shoes(seed, num_shoes, options, config):
+    """Play num_shoes shoes for one configuration; returns per-shoe profit, hands and amount wagered."""
+    rows = AutoGame.auto_play_iter(
+        num_games=sys.maxsize,
+        num_shoes=num_shoes,
+        input_func=lambda *args, **kw: None,
+        output_func=lambda *args, **kw: None,
+        seed=seed,
+        **options,
+        **{name: config[name] for name in CONFIG_OPTIONS if name in config},
+    )
+    bets = ResultColumns(columns=_BET_COLUMNS)
+    summary = AutoGame.drain(rows, bets.append)
+    # shoe j holds hands (h[j-1], h[j]] of the shuffle events. A round spent leaving the
+    # table takes a hand number but yields no row, so shoe ends are turned into row counts.
+    ends = np.searchsorted(bets.column("hand"), summary["shuffles"]["hand"], side="right")
+    starts = np.concatenate(([0], ends[:-1]))
+    wagered = np.concatenate(([0.0], np.cumsum(bets.column("bet"))))
+    return np.stack([
+        np.asarray(summary["shuffles"]["shoe_profit"], dtype=float),
+        (ends - starts).astype(float),
+        wagered[ends] - wagered[starts],
+    ])
+
+
+def _compare_shard(job):
+    """Play one shard's shoes under every configuration (top level so worker processes can pickle it).
+
+    Every configuration starts from the same seed, and a shoe is only reshuffled
+    between shoes, so shoe j is the same card order for all of them however the
+    hands before it were played. Returns [config, (profit, hands, wagered), shoe].
+    """
+    seed, num_shoes, options, configs = job
+    shoes = [_config_shoes(seed, num_shoes, options, config) for config in configs]
+    common = min(s.shape[1] for s in shoes)     # a bankroll can run out before the last shoe
+    return np.stack([s[:, :common] for s in shoes])
+
+
+def _ratio(num, den):
+    """Ratio of sums and its per-shoe linearization (delta method), whose mean is zero."""
+    ratio = num.sum() / den.sum() if den.sum() else 0.0
+    return ratio, (num - ratio * den) / (den.mean() or 1.0)
+
+
+def _se(values):
+    n = len(values)
+    return float(np.std(values, ddof=1) / np.sqrt(n)) if n > 1 else None
+
+
+def compare_configs(configs, num_shoes=1000, seed=None, num_workers=None,
+                    shard_shoes=COMPARE_SHARD_SHOES, balance=None, **options):
+    """Play several configurations on identical shoes and compare them pairwise.
+
+    configs is a list of dicts with any of CONFIG_OPTIONS plus an optional
+    "name"; the first is the baseline. options (bet_amount, num_decks) are shared.
+    balance=None gives every configuration an unlimited bankroll, so no bet is
+    capped by earlier results and shoes stay paired to the end.
+
+    Every configuration sees the same sequence of shuffled shoes; the number of
+    hands each one gets out of a shoe may differ. EVs are ratios over shoes
+    (profit per hand, profit per unit wagered) and their standard errors come
+    from the per-shoe linearization. A difference is computed shoe by shoe, so
+    the luck of the cards cancels out of it: "variance_reduction" is how many
+    times more hands two independent runs would need for the same precision.
+    """
+    if len(configs) < 2:
+        raise ValueError("Need at least two configurations to compare")
+    balance = float("inf") if balance is None else balance
+    options = dict(options, balance=balance)
+    sizes = [min(shard_shoes, num_shoes - start) for start in range(0, num_shoes, shard_shoes)]
+    jobs = [(shard_seed, size, options, configs) for shard_seed, size in zip(spawn_seeds(seed, len(sizes)), sizes)]
+    workers = min(num_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        parts = [_compare_shard(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_compare_shard, jobs))
+    profit, hands, wagered = np.concatenate(parts, axis=2).transpose(1, 0, 2)
+
+    results = []
+    per_hand, per_unit = [], []
+    for k, config in enumerate(configs):
+        ev_hand, z_hand = _ratio(profit[k], hands[k])
+        ev_unit, z_unit = _ratio(profit[k], wagered[k])
+        per_hand.append(z_hand)
+        per_unit.append(z_unit)
+        results.append({
+            "name": config.get("name") or f"config_{k}",
+            "hands": int(hands[k].sum()),
+            "total_wagered": float(wagered[k].sum()),
+            "total_profit": float(profit[k].sum()),
+            "ev_per_hand": float(ev_hand),
+            "ev_per_hand_se": _se(z_hand),
+            "ev_per_unit": float(ev_unit),
+            "ev_per_unit_se": _se(z_unit),
+        })
+
+    differences = []
+    base = results[0]
+    for k in range(1, len(configs)):
+        diff = {"name": results[k]["name"], "baseline": base["name"]}
+        for metric, z in (("ev_per_hand", per_hand), ("ev_per_unit", per_unit)):
+            paired = _se(z[k] - z[0])
+            independent = (np.hypot(results[k][f"{metric}_se"], base[f"{metric}_se"])
+                           if paired is not None else None)
+            diff[metric] = results[k][metric] - base[metric]
+            diff[f"{metric}_se"] = paired
+            diff[f"{metric}_variance_reduction"] = (float((independent / paired) ** 2)
+                                                    if paired else None)
+        differences.append(diff)
+
+    return {"shoes": int(profit.shape[1]), "configs": results, "differences": differences}
@@ -1,24 +1,9 @@
-from bj import Game, PlayerHand, DealerHand, Deck, Card
+from bj import Game, PlayerHand, DealerHand, Shoe, Card
 class ConsoleGame:
     MAX_SPLITS = 4
 
-    def count_cards(hands):
-        """Return Hi-Lo count for a collection of hands."""
-        total = 0
-        for hand in hands:
-            cards = getattr(hand, 'cards', hand)
-            for c in cards:
-                rank = getattr(c, 'rank', c)
-                r = str(rank)
-                if r in ('2', '3', '4', '5', '6'):
-                    total += 1
-                elif r in ('10', 'J', 'Q', 'K', 'A'):
-                    total -= 1
-        return total
-    
     def console_play(balance=1000, input_func=input, output_func=print):
-        deck = Deck(num_decks=8)
-        card_count = 0
+        deck = Shoe(num_decks=8)
         deck.shuffle()
         while True:
             bet = -1
@@ -65,26 +50,16 @@ class ConsoleGame:
                     output_func({'type': 'result', 'outcome': 'push', 'profit': profit})
                 else:
                     output_func({'type': 'result', 'outcome': str(r), 'profit': profit})
-            card_count += ConsoleGame.interpret_count_from_result(round_result)
-            true_count = card_count / (len(deck.cards)/52) if len(deck.cards) > 0 else 0
-            output_func("Card Count: ", card_count)
-            output_func("True Count: ", round(true_count, 2))
+            output_func("Card Count: ", deck.running_count)
+            output_func("True Count: ", round(deck.true_count, 2))
             output_func("Profit/Loss:", Game.interpret_result(round_result))
             balance += Game.interpret_result(round_result)
             game.end_game()
             
-            if len(deck.cards) < (52 * 8 * 0.25):
+            if deck.cut_card_reached():
                 output_func("Reshuffling deck...")
-                deck = Deck(num_decks=8)
                 deck.shuffle()
 
-    def interpret_count_from_result(result):
-        if isinstance(result, tuple):
-            return result[2] if len(result) > 2 else 0
-        if isinstance(result, list):
-            return sum(ConsoleGame.interpret_count_from_result(r) for r in result)
-        return 0
-
     def played_hand_split(game, bet_amount, handnum=0, balance=0, family_for_hand=None, family_splits=None, max_splits=MAX_SPLITS, input_func=input, output_func=print):
         if handnum < 0 or handnum >= len(game.player_hands):
             raise IndexError("Invalid hand number for split play")
@@ -189,15 +164,15 @@ class ConsoleGame:
                 output_func({'type': 'hand', 'owner': 'dealer', 'cards': dealer_hand.get_cards_structured(), 'value': dealer_hand.get_value()})
                 if dealer_hand.blackjack():
                     output_func("Push!")
-                    return ("P", bet_amount, ConsoleGame.count_cards([player_hand, dealer_hand]))
+                    return ("P", bet_amount)
                 output_func("Blackjack! You win!")
-                return ("W!", bet_amount, ConsoleGame.count_cards([player_hand, dealer_hand]))
+                return ("W!", bet_amount)
 
             if dealer_hand.blackjack():
                 # send dealer full hand before announcing result
                 output_func({'type': 'hand', 'owner': 'dealer', 'cards': dealer_hand.get_cards_structured(), 'value': dealer_hand.get_value()})
                 output_func("Dealer has Blackjack! You lose!")
-                return ("L", bet_amount, ConsoleGame.count_cards([player_hand, dealer_hand]))
+                return ("L", bet_amount)
 
             if player_hand.get_value() == 21:
                 output_func("21: no more action")
@@ -224,14 +199,14 @@ class ConsoleGame:
                     # reveal dealer full hand before returning so frontend can show it
                     output_func({'type': 'hand', 'owner': 'dealer', 'cards': dealer_hand.get_cards_structured(), 'value': dealer_hand.get_value()})
                     output_func("Player busted!")
-                    return ("L", bet_amount, ConsoleGame.count_cards([player_hand, dealer_hand]))
+                    return ("L", bet_amount)
                 continue
             elif action == 's':
                 game.dealer_play(Auto=False, output_func=output_func)
                 result = game.get_winner(0)
                 output_func({'type': 'hand', 'owner': 'dealer', 'cards': dealer_hand.get_cards_structured(), 'value': dealer_hand.get_value()})
                 output_func(result)
-                return (result, bet_amount, ConsoleGame.count_cards([player_hand, dealer_hand]))
+                return (result, bet_amount)
             elif action == 'd' and player_hand.num_cards() == 2 and balance >= bet_amount:
                 bet_amount *= 2
                 game.player_hit(handnum=0)
@@ -242,12 +217,12 @@ class ConsoleGame:
                     # reveal dealer full hand before returning so frontend can show it
                     output_func({'type': 'hand', 'owner': 'dealer', 'cards': dealer_hand.get_cards_structured(), 'value': dealer_hand.get_value()})
                     output_func("Player busted after doubling down!")
-                    return ("L", bet_amount, ConsoleGame.count_cards([player_hand, dealer_hand]))
+                    return ("L", bet_amount)
                 game.dealer_play(Auto=False, output_func=output_func)
                 result = game.get_winner(0)
                 output_func({'type': 'hand', 'owner': 'dealer', 'cards': dealer_hand.get_cards_structured(), 'value': dealer_hand.get_value()})
                 output_func(result)
-                return (result, bet_amount, ConsoleGame.count_cards([player_hand, dealer_hand]))
+                return (result, bet_amount)
             elif action == 'v' and player_hand.can_split() and balance >= bet_amount:
                 family_id = family_for_hand.get(player_hand, 0)
                 if family_splits.get(family_id, 0) >= ConsoleGame.MAX_SPLITS:
@@ -293,8 +268,7 @@ class ConsoleGame:
                     if family_for_hand.get(h) == family_id:
                         r = game.get_winner(idx)
                         b = bets.get(idx, bet_amount)
-                        cnt = ConsoleGame.count_cards([h, dealer_hand])
-                        out_results.append((r, b, cnt))
+                        out_results.append((r, b))
                         output_func(f"Hand {idx+1}: {r}")
                 return out_results
             else:
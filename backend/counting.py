@@ -0,0 +1,238 @@
+import numpy as np
+from bj import RANKS, CARD_TABLE
+from precision import PrecisionTracker
+
+# Effect of removing one card of each rank on the player's expectation, in percent
+# (single deck, basic strategy; Griffin, The Theory of Blackjack)
+EFFECTS_OF_REMOVAL = {'2': 0.38, '3': 0.44, '4': 0.55, '5': 0.69, '6': 0.46, '7': 0.28, '8': 0.0,
+                      '9': -0.18, '10': -0.51, 'J': -0.51, 'Q': -0.51, 'K': -0.51, 'A': -0.61}
+
+_ACE = RANKS.index('A')
+# Hands a SystemComparison buffers between reductions
+COMPARISON_BLOCK = 4096
+
+
+class CountingSystem:
+    """A card counting system: one tag per rank and an optional ace side count.
+
+    Balanced systems (tags summing to 0 over a deck) convert to a true count by
+    dividing the running count by the decks left. Unbalanced ones (KO) first
+    take off the drift a neutral shoe gives them for the cards dealt so far.
+    Level-2 systems run about twice as large as Hi-Lo, so a true count is
+    divided by `scale` (the spread of the tags relative to Hi-Lo's) to land in
+    Hi-Lo units: the TCC buckets and bet ramps then apply to every system.
+
+    Ace-neutral systems (Hi-Opt II, Omega II) keep aces in a side count: for
+    betting, every ace more than a neutral shoe would have left adds ace_weight
+    to the running count. Playing decisions use the main count alone.
+    """
+
+    __slots__ = ('name', 'label', 'tags', 'ace_weight')
+
+    def __init__(self, name, label, tags, ace_weight=0):
+        self.name = name
+        self.label = label
+        self.tags = np.array([tags[rank] for rank in RANKS], dtype=np.int64)
+        self.ace_weight = ace_weight
+
+    @property
+    def balanced(self):
+        return int(self.tags.sum()) == 0
+
+    @property
+    def drift_per_card(self):
+        """Expected change of the running count per card dealt from a neutral shoe."""
+        return self.tags.sum() / len(RANKS)
+
+    @property
+    def betting_tags(self):
+        """Tags with the ace side count folded in."""
+        tags = self.tags.copy()
+        if self.ace_weight:
+            tags[_ACE] = -self.ace_weight
+        return tags
+
+    @property
+    def scale(self):
+        return float(np.std(self.tags) / np.std(SYSTEMS[DEFAULT_SYSTEM].tags))
+
+    @property
+    def betting_correlation(self):
+        """Correlation of the betting tags with the effects of removal (tens weighted four times)."""
+        eor = np.array([EFFECTS_OF_REMOVAL[rank] for rank in RANKS])
+        return float(np.corrcoef(self.betting_tags, eor)[0, 1])
+
+    def __repr__(self):
+        return f"CountingSystem({self.name!r})"
+
+
+def _tags(low, high=(), minus=(), **other):
+    tags = {rank: 0 for rank in RANKS}
+    tags.update({rank: 1 for rank in low})
+    tags.update({rank: 2 for rank in high})
+    tags.update({rank: -1 for rank in minus})
+    tags.update(other)
+    return tags
+
+
+_TENS = ('10', 'J', 'Q', 'K')
+_TWOS = {rank: -2 for rank in _TENS}
+
+SYSTEMS = {system.name: system for system in (
+    CountingSystem('hi_lo', 'Hi-Lo', _tags('23456', minus=(*_TENS, 'A'))),
+    CountingSystem('ko', 'KO', _tags('234567', minus=(*_TENS, 'A'))),
+    CountingSystem('hi_opt_2', 'Hi-Opt II', _tags('2367', high='45', **_TWOS), ace_weight=2),
+    CountingSystem('omega_2', 'Omega II', _tags('237', high='456', minus='9', **_TWOS), ace_weight=2),
+    CountingSystem('zen', 'Zen', _tags('237', high='456', minus='A', **_TWOS)),
+)}
+DEFAULT_SYSTEM = 'hi_lo'
+
+
+def get_systems(names):
+    """CountingSystems by name; raises ValueError for an unknown one."""
+    unknown = [name for name in names if name not in SYSTEMS]
+    if unknown:
+        raise ValueError(f"Unknown counting system(s): {', '.join(unknown)}; "
+                         f"choose from {', '.join(SYSTEMS)}")
+    return [SYSTEMS[name] for name in names]
+
+
+class ShoeCounter:
+    """Running and true counts of several systems on one Shoe.
+
+    On every shuffle the tags of the whole shoe order are looked up by card code
+    and summed, and every system's playing and betting true count at every
+    cursor position is worked out in a few NumPy operations over
+    [system, position] arrays. From then on a count is a column read at the
+    shoe's cursor, however many systems are kept. Call shuffle() here instead of
+    on the shoe so the tables are rebuilt.
+    """
+
+    def __init__(self, shoe, systems):
+        self.shoe = shoe
+        self.systems = list(systems)
+        ranks = np.array([RANKS.index(card.rank) for card in CARD_TABLE])
+        # one row of tags per system by card code, then the aces for the side count
+        self._tags = np.vstack([system.tags[ranks] for system in self.systems] + [ranks == _ACE])
+        self._drift = np.array([[system.drift_per_card] for system in self.systems])
+        self._ace_weight = np.array([[system.ace_weight] for system in self.systems], dtype=float)
+        self._scale = np.array([[system.scale] for system in self.systems])
+        self.refresh()
+
+    def shuffle(self):
+        self.shoe.shuffle()
+        self.refresh()
+
+    def refresh(self):
+        codes = np.frombuffer(self.shoe.codes, dtype=np.uint8)
+        tags = self._tags[:, codes]
+        tags[:, :self.shoe.burn_cards] = 0      # burned cards are never seen
+        cumulative = np.zeros((len(self._tags), len(codes) + 1), dtype=np.int64)
+        np.cumsum(tags, axis=1, out=cumulative[:, 1:])
+        dealt = np.arange(len(codes) + 1)
+        seen = np.maximum(dealt - self.shoe.burn_cards, 0)
+        cards_left = len(codes) - dealt
+        decks_left = cards_left / 52 * self._scale     # in Hi-Lo units
+        self._running = cumulative[:-1]
+        playing = self._running - self._drift * seen
+        betting = playing + self._ace_weight * (seen / len(RANKS) - cumulative[-1])
+        # 0 once the shoe is empty
+        self._playing = np.divide(playing, decks_left, out=np.zeros_like(playing), where=cards_left > 0)
+        self._betting = np.divide(betting, decks_left, out=np.zeros_like(betting), where=cards_left > 0)
+
+    def running_counts(self):
+        return self._running[:, self.shoe.pos]
+
+    def true_counts(self, betting=False):
+        """Every system's true count in Hi-Lo units; betting=True adds the ace side counts."""
+        return (self._betting if betting else self._playing)[:, self.shoe.pos]
+
+
+class SystemComparison:
+    """Per-system betting results accumulated over one run.
+
+    Every hand is played once, driven by one system; each tracked system is
+    scored on the same hands as if its own true count had sized the bet: the
+    hand's result per unit bet is weighted by that system's bet multiplier
+    (bet_multiples maps an array of true counts to multipliers). Results are
+    per unit, so doubles and splits scale with any bet. A system that would
+    have left the table still sees the rest of the shoe's hands the driving
+    system played; a zero multiplier just weights them 0.
+
+    Hands are buffered and reduced to running sums every COMPARISON_BLOCK hands.
+    """
+
+    def __init__(self, systems, bet_multiples):
+        self.systems = list(systems)
+        self.bet_multiples = bet_multiples
+        k = len(self.systems)
+        self.hands = 0
+        self.result = 0.0
+        self.result_sq = 0.0
+        self.tc = np.zeros(k)
+        self.tc_sq = np.zeros(k)
+        self.tc_result = np.zeros(k)
+        # PrecisionTracker sums of every system's re-weighted profit and wager
+        self.profit = np.zeros(k)
+        self.wagered = np.zeros(k)
+        self.profit_sq = np.zeros(k)
+        self.wagered_sq = np.zeros(k)
+        self.cross = np.zeros(k)
+        self._counts = np.empty((COMPARISON_BLOCK, k))
+        self._results = np.empty(COMPARISON_BLOCK)
+        self._wagers = np.empty(COMPARISON_BLOCK)
+        self._buffered = 0
+
+    def add(self, true_counts, result, wagered):
+        """One hand: each system's betting true count, and the hand's profit and
+        total amount wagered per unit of initial bet."""
+        i = self._buffered
+        self._counts[i] = true_counts
+        self._results[i] = result
+        self._wagers[i] = wagered
+        self._buffered = i + 1
+        if self._buffered == COMPARISON_BLOCK:
+            self._reduce()
+
+    def _reduce(self):
+        n = self._buffered
+        tc, result, wagered = self._counts[:n], self._results[:n], self._wagers[:n]
+        mults = self.bet_multiples(tc)
+        profit = mults * result[:, None]
+        bet = mults * wagered[:, None]
+        self.hands += n
+        self.result += result.sum()
+        self.result_sq += result @ result
+        self.tc += tc.sum(axis=0)
+        self.tc_sq += (tc * tc).sum(axis=0)
+        self.tc_result += result @ tc
+        self.profit += profit.sum(axis=0)
+        self.wagered += bet.sum(axis=0)
+        self.profit_sq += (profit * profit).sum(axis=0)
+        self.wagered_sq += (bet * bet).sum(axis=0)
+        self.cross += (profit * bet).sum(axis=0)
+        self._buffered = 0
+
+    def summary(self):
+        self._reduce()
+        n = max(self.hands, 1)
+        var_result = self.result_sq / n - (self.result / n) ** 2
+        var_tc = self.tc_sq / n - (self.tc / n) ** 2
+        cov = self.tc_result / n - self.tc / n * self.result / n
+        rows = []
+        for k, system in enumerate(self.systems):
+            tracker = PrecisionTracker.from_sums(self.hands, self.profit[k], self.wagered[k], self.profit_sq[k],
+                                                 self.wagered_sq[k], self.cross[k])
+            denom = np.sqrt(var_tc[k] * var_result)
+            rows.append({
+                "system": system.name,
+                "label": system.label,
+                "balanced": system.balanced,
+                "side_count": bool(system.ace_weight),
+                "betting_correlation": system.betting_correlation,
+                "result_correlation": float(cov[k] / denom) if denom > 0 else None,
+                "mean_true_count": float(self.tc[k] / n),
+                "ev_per_unit": tracker.ev,
+                "ev_per_unit_se": tracker.se,
+            })
+        return rows
@@ -0,0 +1,214 @@
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+# Shoe compositions are card counts by rank index: 0 = ace, 1..8 = 2..9, 9 = ten-valued
+NUM_RANKS = 10
+ACE = 0
+TEN = 9
+RANK_VALUES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)          # hard value (ace counts 1)
+RANK_LABELS = ('A', '2', '3', '4', '5', '6', '7', '8', '9', 'T')
+# bj.Card rank -> rank index
+RANK_INDEX = {'A': 0, '2': 1, '3': 2, '4': 3, '5': 4, '6': 5, '7': 6, '8': 7, '9': 8,
+              '10': 9, 'J': 9, 'Q': 9, 'K': 9}
+# outcomes of every dealer distribution tuple, in order
+DEALER_OUTCOMES = ('17', '18', '19', '20', '21', 'bust', 'blackjack')
+BUST = 5
+BLACKJACK = 6
+
+# Dealer distributions kept by DealerProbabilities (one per composition and upcard)
+DEALER_CACHE_SIZE = 50000
+# Intermediate dealer states kept between queries (~300 bytes each, so ~75 MB at most);
+# a query that leaves more evicts the oldest
+DEALER_STATE_LIMIT = 250_000
+
+# Bits per rank count in a composition signature (up to 511 cards of one rank)
+_SIG_BITS = 9
+
+
+def shoe_composition(num_decks):
+    """Full-shoe composition tuple for num_decks decks."""
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+
+def composition_signature(counts):
+    """Pack a composition into one int: 9 bits per rank count."""
+    sig = 0
+    for rank in range(NUM_RANKS - 1, -1, -1):
+        sig = (sig << _SIG_BITS) | counts[rank]
+    return sig
+
+
+def _remove(comp, rank):
+    return comp[:rank] + (comp[rank] - 1,) + comp[rank + 1:]
+
+
+class Composition:
+    """Remaining cards of a shoe by rank, updated one card at a time.
+
+    The signature is kept up to date incrementally, so looking up the dealer's
+    odds after each card costs no more than a dict lookup.
+    """
+
+    __slots__ = ('counts', 'total', 'signature')
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.total = sum(self.counts)
+        self.signature = composition_signature(self.counts)
+
+    @classmethod
+    def full_shoe(cls, num_decks):
+        return cls(shoe_composition(num_decks))
+
+    def remove(self, rank):
+        """Take one card of rank index rank out of the shoe."""
+        if self.counts[rank] == 0:
+            raise ValueError(f"No {RANK_LABELS[rank]} left in the shoe")
+        self.counts[rank] -= 1
+        self.total -= 1
+        self.signature -= 1 << (_SIG_BITS * rank)
+
+    def add(self, rank):
+        """Put one card of rank index rank back."""
+        self.counts[rank] += 1
+        self.total += 1
+        self.signature += 1 << (_SIG_BITS * rank)
+
+    def remove_card(self, card):
+        """Remove a bj.Card."""
+        self.remove(RANK_INDEX[card.rank])
+
+    def copy(self):
+        other = Composition.__new__(Composition)
+        other.counts = list(self.counts)
+        other.total = self.total
+        other.signature = self.signature
+        return other
+
+    def as_tuple(self):
+        return tuple(self.counts)
+
+
+class DealerProbabilities:
+    """Distribution of the dealer's final hand by upcard and remaining shoe.
+
+    Follows DealerHand.should_hit (draw below 17, stand on all 17s). Answers are
+    kept in an LRU of max_entries keyed by (composition signature, upcard,
+    no_blackjack); the dealer states visited while computing them are shared
+    between queries, so neighbouring compositions are cheap to fill in.
+    Thread-safe.
+    """
+
+    def __init__(self, max_entries=DEALER_CACHE_SIZE, state_limit=DEALER_STATE_LIMIT):
+        self.max_entries = max_entries
+        self.state_limit = state_limit
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._states = {}     # (comp tuple, hard, has_ace) -> distribution of the dealer's finish
+        self._lock = threading.Lock()
+
+    def distribution(self, comp, upcard, no_blackjack=True):
+        """P(dealer finishes 17, 18, 19, 20, 21, bust, blackjack) as a 7-tuple.
+
+        comp is a Composition or a tuple of counts, not including the upcard
+        (a rank index). With no_blackjack the dealer is known not to hold
+        blackjack (it was checked before play), so the blackjack entry is 0.
+        """
+        if isinstance(comp, Composition):
+            signature, counts = comp.signature, comp.counts
+        else:
+            signature, counts = composition_signature(comp), comp
+        key = (signature, upcard, no_blackjack)
+        with self._lock:
+            dist = self._cache.get(key)
+            if dist is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return dist
+            self.misses += 1
+            dist = self._compute(tuple(counts), upcard, no_blackjack)
+            if len(self._states) > self.state_limit:
+                # drop the oldest half; the states just visited are the likeliest to be reused
+                for state in list(islice(self._states, len(self._states) - self.state_limit // 2)):
+                    del self._states[state]
+            self._cache[key] = dist
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return dist
+
+    def blackjack_probability(self, comp, upcard):
+        """P(the hole card completes a dealer blackjack)."""
+        counts = comp.counts if isinstance(comp, Composition) else comp
+        total = sum(counts)
+        if upcard == ACE:
+            return counts[TEN] / total
+        if upcard == TEN:
+            return counts[ACE] / total
+        return 0.0
+
+    def insurance_ev(self, comp, upcard=ACE):
+        """EV of an insurance bet of 1 (pays 2:1): positive means insurance is worth taking."""
+        p = self.blackjack_probability(comp, upcard)
+        return 2 * p - (1 - p)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache),
+                "states": len(self._states)}
+
+    def _compute(self, comp, upcard, no_blackjack):
+        # the hole card completes a blackjack when it is a ten under an ace or an ace under a ten
+        bj_rank = TEN if upcard == ACE else ACE if upcard == TEN else None
+        total = sum(comp)
+        if no_blackjack and bj_rank is not None:
+            total -= comp[bj_rank]
+        acc = [0.0] * 7
+        for rank in range(NUM_RANKS):
+            n = comp[rank]
+            if n == 0:
+                continue
+            p = n / total
+            if rank == bj_rank:
+                if not no_blackjack:
+                    acc[BLACKJACK] += p
+                continue
+            sub = self._finish(_remove(comp, rank), RANK_VALUES[upcard] + RANK_VALUES[rank],
+                               upcard == ACE or rank == ACE)
+            for k in range(6):
+                acc[k] += p * sub[k]
+        return tuple(acc)
+
+    def _finish(self, comp, hard, has_ace):
+        value = hard + 10 if has_ace and hard <= 11 else hard
+        if value >= 17:
+            dist = [0.0] * 6
+            dist[BUST if value > 21 else value - 17] = 1.0
+            return dist
+        key = (comp, hard, has_ace)
+        dist = self._states.get(key)
+        if dist is not None:
+            return dist
+        total = sum(comp)
+        acc = [0.0] * 6
+        for rank in range(NUM_RANKS):
+            n = comp[rank]
+            if n == 0:
+                continue
+            p = n / total
+            new_hard = hard + RANK_VALUES[rank]
+            new_ace = has_ace or rank == ACE
+            new_value = new_hard + 10 if new_ace and new_hard <= 11 else new_hard
+            if new_value >= 17:
+                # the dealer stands or busts on this card: no need to build the next composition
+                acc[BUST if new_value > 21 else new_value - 17] += p
+                continue
+            sub = self._finish(_remove(comp, rank), new_hard, new_ace)
+            for k in range(6):
+                acc[k] += p * sub[k]
+        self._states[key] = acc
+        return acc
+
+
+# Shared by the EV calculator and API handlers
+DEALER_PROBABILITIES = DealerProbabilities()
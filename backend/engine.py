@@ -1,6 +1,8 @@
 import random
 import time
 from typing import List, Dict, Any, Optional
+import numpy as np
+from rng import make_rng, make_np_rng
 
 
 CARD_VALUES = {
@@ -10,13 +12,19 @@ CARD_VALUES = {
 
 SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
 
+# One 52-card deck as card values for the batch engine (Aces stored as 11)
+DECK_VALUES = np.array([CARD_VALUES[value] for suit in SUITS for value in CARD_VALUES], dtype=np.int8)
 
-def create_deck(seed: int = None) -> List[str]:
-    # Generate a fresh 52-card deck, shuffled with optional seed for tests
-    if seed is not None:
-        random.seed(seed)
+# Hands dealt per NumPy chunk in simulate_many_batch (~5 MB of cards per chunk)
+BATCH_CHUNK_SIZE = 100000
+
+
+def create_deck(seed: int = None, rng: Optional[random.Random] = None) -> List[str]:
+    # Generate a fresh 52-card deck, shuffled with the given generator or a new one
+    # seeded with seed (same order the old global random.seed(seed) produced)
+    rng = make_rng(seed, rng)
     deck = [f"{value} of {suit}" for suit in SUITS for value in CARD_VALUES.keys()]
-    random.shuffle(deck)
+    rng.shuffle(deck)
     return deck
 
 
@@ -62,10 +70,10 @@ def determine_outcome(player_total: int, dealer_total: int) -> str:
     return 'push'
 
 
-def simulate_hand(seed: int = None) -> Dict[str, Any]:
+def simulate_hand(seed: int = None, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     # Simulate one full hand: deal, play, outcome
     # Returns structured data for API
-    deck = create_deck(seed)
+    deck = create_deck(seed, rng)
 
     player_cards = [deck.pop(), deck.pop()]
     dealer_cards = [deck.pop(), deck.pop()]
@@ -89,9 +97,11 @@ def simulate_hand(seed: int = None) -> Dict[str, Any]:
     }
 
 
-def simulate_many(count: int, seed: Optional[int] = None, strategy: Optional[Dict] = None) -> Dict[str, Any]:
+def simulate_many(count: int, seed: Optional[int] = None, strategy: Optional[Dict] = None,
+                  rng: Optional[random.Random] = None) -> Dict[str, Any]:
     # Simulate multiple hands using simulate_hand, aggregate stats
     # Returns aggregated stats for analysis mode
+    # With rng every hand draws from that one stream; otherwise hand i uses seed + i
 
     if count < 1:
         raise ValueError("Count must be at least 1")
@@ -101,10 +111,12 @@ def simulate_many(count: int, seed: Optional[int] = None, strategy: Optional[Dic
 
     current_seed = seed
     for i in range(count):
-        if seed is not None:
-            current_seed = seed + i  # Increment to avoid identical hands
-
-        result = simulate_hand(seed=current_seed)
+        if rng is not None:
+            result = simulate_hand(rng=rng)
+        else:
+            if seed is not None:
+                current_seed = seed + i  # Increment to avoid identical hands
+            result = simulate_hand(seed=current_seed)
 
         outcome = result['outcome']
         player_total = result['player_total']
@@ -141,4 +153,101 @@ def simulate_many(count: int, seed: Optional[int] = None, strategy: Optional[Dic
         'dealer_busts': dealer_busts,
         'player_blackjacks': player_blackjacks,
         'elapsed_seconds': round(elapsed, 2)
-    }
\ No newline at end of file
+    }
+
+
+def _batch_values(hard, aces):
+    # Hand totals from hard totals (Aces as 1) and ace counts
+    return hard + 10 * ((aces > 0) & (hard <= 11))
+
+
+def _play_batch(cards: np.ndarray) -> Dict[str, int]:
+    # Play one hand per row of cards with the simulate_hand rules, all rows at once.
+    # Player gets cards 0-1, dealer 2-3, then each hand draws from its own cursor.
+    n = len(cards)
+    rows = np.arange(n)
+    hard = np.where(cards == 11, 1, cards).astype(np.int16)
+    is_ace = (cards == 11).astype(np.int16)
+
+    p_hard = hard[:, 0] + hard[:, 1]
+    p_aces = is_ace[:, 0] + is_ace[:, 1]
+    d_hard = hard[:, 2] + hard[:, 3]
+    d_aces = is_ace[:, 2] + is_ace[:, 3]
+    p_cards = np.full(n, 2)
+    pos = np.full(n, 4)
+
+    # Player hits until >= 17
+    active = rows[_batch_values(p_hard, p_aces) < 17]
+    while active.size:
+        drawn = pos[active]
+        p_hard[active] += hard[active, drawn]
+        p_aces[active] += is_ace[active, drawn]
+        p_cards[active] += 1
+        pos[active] += 1
+        active = active[_batch_values(p_hard[active], p_aces[active]) < 17]
+    player_total = _batch_values(p_hard, p_aces)
+
+    # Dealer only plays against hands that did not bust
+    active = rows[(player_total <= 21) & (_batch_values(d_hard, d_aces) < 17)]
+    while active.size:
+        drawn = pos[active]
+        d_hard[active] += hard[active, drawn]
+        d_aces[active] += is_ace[active, drawn]
+        pos[active] += 1
+        active = active[_batch_values(d_hard[active], d_aces[active]) < 17]
+    dealer_total = _batch_values(d_hard, d_aces)
+
+    player_bust = player_total > 21
+    dealer_bust = dealer_total > 21
+    win = ~player_bust & (dealer_bust | (player_total > dealer_total))
+    lose = player_bust | (~dealer_bust & (player_total < dealer_total))
+    return {
+        'wins': int(win.sum()),
+        'losses': int(lose.sum()),
+        'pushes': int(n - win.sum() - lose.sum()),
+        'player_busts': int(player_bust.sum()),
+        'dealer_busts': int(dealer_bust.sum()),
+        'player_blackjacks': int(((p_cards == 2) & (player_total == 21)).sum()),
+    }
+
+
+def simulate_many_batch(count: int, seed: Optional[int] = None, chunk_size: int = BATCH_CHUNK_SIZE,
+                        rng: Optional[np.random.Generator] = None) -> Dict[str, Any]:
+    # Vectorized simulate_many: same rules (fresh 52-card deck per hand, player hits
+    # to 17, dealer hits below 17) and the same aggregate dict, dealt as NumPy arrays.
+    # Statistically equivalent to simulate_many, not hand-for-hand identical.
+
+    if count < 1:
+        raise ValueError("Count must be at least 1")
+
+    rng = make_np_rng(seed, rng)
+    totals = dict.fromkeys(('wins', 'losses', 'pushes', 'player_busts', 'dealer_busts', 'player_blackjacks'), 0)
+    start_time = time.time()
+
+    remaining = count
+    while remaining:
+        n = min(chunk_size, remaining)
+        cards = rng.permuted(np.broadcast_to(DECK_VALUES, (n, len(DECK_VALUES))), axis=1)
+        for key, value in _play_batch(cards).items():
+            totals[key] += value
+        remaining -= n
+
+    total_hands = count
+    wins, losses = totals['wins'], totals['losses']
+    win_rate = (wins / total_hands) * 100
+    house_edge = ((losses - wins) / total_hands) * 100  # Simplified
+
+    elapsed = time.time() - start_time
+
+    return {
+        'total_hands': total_hands,
+        'wins': wins,
+        'losses': losses,
+        'pushes': totals['pushes'],
+        'win_rate': round(win_rate, 2),
+        'house_edge': round(house_edge, 2),
+        'player_busts': totals['player_busts'],
+        'dealer_busts': totals['dealer_busts'],
+        'player_blackjacks': totals['player_blackjacks'],
+        'elapsed_seconds': round(elapsed, 2)
+    }
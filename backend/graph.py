@@ -1,10 +1,15 @@
-import pandas as pd
+import io
+import threading
 import numpy as np
+import pyarrow as pa
 import warnings
+from collections import OrderedDict
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
+from matplotlib.collections import LineCollection
+from results import read_results, RESULTS_PATH
 
 warnings.filterwarnings("ignore")
 
@@ -17,50 +22,116 @@ TEXT_MED = "#888888"
 TEXT_HI  = "#cccccc"
 FONT     = "monospace"
 
+FIG_SIZE = (18, 7)
+AXES_RECT = [0.06, 0.14, 0.86, 0.72]
+DPI = 180
+# Runs whose results (and rendered PNG) GraphStore keeps for GET /graph
+MAX_GRAPH_RUNS = 8
+# Horizontal pixels of the plot area: above this many hands, series are downsampled
+# to one bucket per pixel column, which renders the same as drawing every hand
+PLOT_WIDTH_PX = int(FIG_SIZE[0] * AXES_RECT[2] * DPI)
+
+
+def _bucket_view(values, buckets):
+    """Pad values to a multiple of buckets (repeating the last value) and view them
+    as a (buckets, size) grid; returns (grid, size)."""
+    size = -(-len(values) // buckets)
+    padded = np.concatenate([values, np.repeat(values[-1:], size * buckets - len(values))])
+    return padded.reshape(buckets, size), size
+
+
+def minmax_downsample(values, buckets):
+    """Indices of the first, min, max and last point of each bucket (M4 downsampling).
+
+    Drawn as a line, these points light the same pixels as the full series when
+    there is one bucket per pixel column, so peaks and drawdowns are kept exactly.
+    """
+    n = len(values)
+    if n <= 4 * buckets:
+        return np.arange(n)
+    grid, size = _bucket_view(values, buckets)
+    starts = np.arange(buckets) * size
+    picks = np.stack([
+        starts,
+        starts + grid.argmin(axis=1),
+        starts + grid.argmax(axis=1),
+        np.minimum(starts + size - 1, n - 1),
+    ], axis=1)
+    return np.unique(np.minimum(picks, n - 1))
+
+
+def envelope_downsample(x, values, buckets):
+    """Per-bucket (x, low, high) of bars drawn from 0 to each value, so a bucket's
+    bars collapse into the single bar covering the same pixels."""
+    grid, size = _bucket_view(values, buckets)
+    starts = np.minimum(np.arange(buckets) * size, len(values) - 1)
+    low = np.minimum(grid.min(axis=1), 0)
+    high = np.maximum(grid.max(axis=1), 0)
+    return x[starts], low, high
+
 
 class SimGraph:
     """
-    Reads results.csv and produces a clean, minimal terminal-style chart:
+    Reads results.parquet (or a results .csv) and produces a clean, minimal terminal-style chart:
       • Balance  — white step line
       • True Card Count — blue line, right y-axis
       • y=0 reference lines for both axes
       • Vertical dashed marks at each shuffle reset
+    Runs longer than max_points hands are downsampled to one bucket per pixel column.
     """
 
-    def __init__(self, csv_path="results.csv", output_path="simulation_graph.png"):
-        self.csv_path   = csv_path
-        self.output_path = output_path
+    def __init__(self, results_path=RESULTS_PATH, output_path="simulation_graph.png",
+                 max_points=PLOT_WIDTH_PX):
+        self.results_path = results_path
+        self.output_path  = output_path
+        self.max_points   = max_points    # None draws every hand
 
     def generate(self):
-        df            = self._load(self.csv_path)
-        shuffle_hands = self._detect_shuffles(df)
+        df            = self._load(self.results_path)
+        shuffle_hands = self._shuffle_hands(df)
         self._plot(df, shuffle_hands)
         print(f"[SimGraph] Graph saved to: {self.output_path}")
 
+    def render_png(self):
+        """Render the chart and return the PNG bytes instead of writing output_path."""
+        df  = self._load(self.results_path)
+        buf = io.BytesIO()
+        self._plot(df, self._shuffle_hands(df), target=buf)
+        return buf.getvalue()
+
     @staticmethod
     def _load(path):
-        df = pd.read_csv(path)
+        df = read_results(path)
         df.columns = [c.strip() for c in df.columns]
         df["hand"] = df["hand"].astype(int)
         return df
 
+    @staticmethod
+    def _shuffle_hands(df):
+        """Hands after which the shoe was reshuffled, from the run's recorded shuffle
+        events; falls back to the count heuristic for files saved without them."""
+        events = df.attrs.get("shuffles")
+        if events is not None:
+            return events["hand"].astype(int).tolist()
+        return SimGraph._detect_shuffles(df)
+
     @staticmethod
     def _detect_shuffles(df):
-        shuffles, cc, hands = [], df["card_count"].values, df["hand"].values
-        for i in range(1, len(cc)):
-            if abs(cc[i]) <= 2 and abs(cc[i - 1]) > 5:
-                shuffles.append(int(hands[i]))
-        return shuffles
+        """Heuristic: a count near zero right after a large one marks a fresh shoe."""
+        cc    = np.abs(df["card_count"].values)
+        hands = df["hand"].values
+        reset = (cc[1:] <= 2) & (cc[:-1] > 5)
+        return hands[1:][reset].astype(int).tolist()
 
-    def _plot(self, df, shuffle_hands):
+    def _plot(self, df, shuffle_hands, target=None):
         hands   = df["hand"].values
         balance = df["balance"].values
         tcc     = df["true_count"].values
         start   = balance[0]
         profit  = balance[-1] - start
 
-        fig = plt.figure(figsize=(18, 7), facecolor=BG)
-        ax  = fig.add_axes([0.06, 0.14, 0.86, 0.72], facecolor=PANEL_BG)
+        fig = plt.figure(figsize=FIG_SIZE, facecolor=BG)
+        ax  = fig.add_axes(AXES_RECT, facecolor=PANEL_BG)
         ax2 = ax.twinx()
 
         # ── spines ──────────────────────────────────────────────────────────
@@ -80,18 +151,33 @@ class SimGraph:
         ax.axhline(start, color="#333333", linewidth=0.7, linestyle="--", zorder=2)
         ax2.axhline(0,    color="#333333", linewidth=0.7, linestyle="--", zorder=2)
 
+        # long runs: one bucket per pixel column, so render time stays flat
+        downsample = self.max_points is not None and len(hands) > self.max_points
+        if downsample:
+            keep = minmax_downsample(balance, self.max_points)
+            bar_x, bar_low, bar_high = envelope_downsample(hands, tcc, self.max_points)
+            shuffles = np.asarray(shuffle_hands)
+            _, first = np.unique(shuffles * self.max_points // len(hands), return_index=True)
+            rulers = shuffles[first]
+        else:
+            keep = slice(None)
+            bar_x, bar_low, bar_high = hands, 0, tcc
+            rulers = shuffle_hands
+
         # ── balance (white step) ─────────────────────────────────────────────
-        ax.step(hands, balance, where="post",
+        ax.step(hands[keep], balance[keep], where="post",
                 color="#e0e0e0", linewidth=1.3, zorder=4)
 
         # ── true card count — vertical bars from y=0 ────────────────────────
-        ax2.vlines(hands, 0, tcc,
-                   color="#3a7bd5", linewidth=0.8, zorder=3, alpha=0.75)
+        # overlapping translucent bars saturate, so a merged bucket is drawn opaque
+        ax2.vlines(bar_x, bar_low, bar_high,
+                   color="#3a7bd5", linewidth=0.8, zorder=3, alpha=1.0 if downsample else 0.75)
 
-        # ── shuffle rulers ───────────────────────────────────────────────────
-        for sh in shuffle_hands:
-            ax.axvline(sh, color="#333333", linewidth=0.7,
-                       linestyle="--", zorder=5)
+        # ── shuffle rulers (one collection, at most one per pixel column) ────
+        if len(rulers):
+            ax.add_collection(LineCollection(
+                [[(sh, 0), (sh, 1)] for sh in rulers], transform=ax.get_xaxis_transform(),
+                colors="#333333", linewidths=0.7, linestyles="--", zorder=5), autolim=False)
 
         # ── axis labels ──────────────────────────────────────────────────────
         ax.set_xlabel("HAND", fontfamily=FONT, fontsize=8,
@@ -122,10 +208,56 @@ class SimGraph:
         fig.text(0.76, 0.05, "MODE: SIM_PROC_001",
                  fontfamily=FONT, fontsize=7, color=TEXT_DIM)
 
-        plt.savefig(self.output_path, dpi=180, bbox_inches="tight",
+        plt.savefig(target or self.output_path, dpi=DPI, bbox_inches="tight",
                     facecolor=BG, edgecolor="none")
         plt.close(fig)
 
 
+
+class GraphStore:
+    """Lazily rendered graphs, one per simulation run id.
+
+    A run registers its results as Parquet bytes; the PNG is drawn on the first
+    request for that run and reused afterwards, so simulations never wait on
+    matplotlib. The most recent max_runs runs are kept.
+    """
+
+    def __init__(self, max_runs=MAX_GRAPH_RUNS):
+        self.max_runs = max_runs
+        self.latest = None
+        self._runs = OrderedDict()   # run_id -> {"results": bytes, "png": bytes | None}
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()   # pyplot is not thread-safe
+
+    def register(self, run_id, data):
+        """Keep a run's results (Parquet bytes) so its graph can be drawn later."""
+        with self._lock:
+            if run_id not in self._runs:
+                self._runs[run_id] = {"results": data, "png": None}
+            self._runs.move_to_end(run_id)
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+            self.latest = run_id
+
+    def results(self, run_id=None):
+        """Parquet bytes of run_id (default: latest run), or None for unknown runs."""
+        with self._lock:
+            run = self._runs.get(run_id or self.latest)
+        return run["results"] if run is not None else None
+
+    def png(self, run_id=None):
+        """Return the PNG bytes for run_id (default: latest run), rendering on first use.
+        Returns None for unknown runs."""
+        with self._lock:
+            run = self._runs.get(run_id or self.latest)
+        if run is None:
+            return None
+        if run["png"] is None:
+            with self._render_lock:
+                if run["png"] is None:
+                    run["png"] = SimGraph(results_path=pa.BufferReader(run["results"])).render_png()
+        return run["png"]
+
+
 if __name__ == "__main__":
     SimGraph().generate()
@@ -0,0 +1,343 @@
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from openpyxl import load_workbook
+from auto import STRATEGY_REGISTRY, _TCC_KEY_THRESHOLDS, _TCC_KEY_TO_PATH, _tcc_slot, DEFAULT_PENETRATION
+from dealer import ACE, TEN, RANK_VALUES, RANK_LABELS, shoe_composition
+from rng import make_rng, spawn_seeds
+from strategy import (HARD, SOFT, PAIR, NUM_TOTALS, NUM_UPCARDS, TWO_CARD_ACTIONS, MULTI_CARD_ACTIONS,
+                      HARD_FIRST_TOTAL, SOFT_FIRST_TOTAL, PAIR_FIRST_VALUE)
+
+# Actions compared for every cell
+STAND, HIT, DOUBLE, SPLIT = range(4)
+ACTION_LETTERS = ('S', 'H', 'D', 'Y')
+NUM_BUCKETS = len(_TCC_KEY_THRESHOLDS)
+
+# Shoe states per worker task. Fixed, so a seeded run gives the same tables for any worker count.
+STATES_PER_TASK = 200
+# Deepest point states are sampled at, matching the simulator's reshuffle
+PENETRATION = DEFAULT_PENETRATION
+HI_LO = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1)   # by rank index
+
+# Two-card hand forced for each decided row (rank indices): hard 4-20, soft 12-20, pairs 2-A.
+# Hard 21 and soft 21 (blackjack) are not decisions and keep their template cells.
+HARD_HANDS = {t: ((1, t - 3) if t <= 12 else (t - 11, TEN)) for t in range(5, 20)}
+HARD_HANDS.update({4: (1, 1), 20: (TEN, TEN)})
+SOFT_HANDS = {t: (ACE, t - 12) for t in range(13, 21)}
+SOFT_HANDS[12] = (ACE, ACE)
+PAIR_HANDS = {(11 if r == ACE else RANK_VALUES[r]): (r, r) for r in range(10)}
+
+
+def _strategy_value(rank):
+    return 11 if rank == ACE else RANK_VALUES[rank]
+
+
+def _cells():
+    """Every decided cell as (kind, row, two-card hand)."""
+    for total, hand in HARD_HANDS.items():
+        yield HARD, total, hand
+    for total, hand in SOFT_HANDS.items():
+        yield SOFT, total, hand
+    for value, hand in PAIR_HANDS.items():
+        yield PAIR, value, hand
+
+
+def _play_on(seq, i, hard, ace, two_cards, cells, column):
+    """Play a hand on with the continuation strategy (no further splits).
+    Returns (final value, 22 for bust; next card index; bet multiplier)."""
+    while True:
+        soft = ace and hard <= 11
+        value = hard + 10 if soft else hard
+        if hard > 21:
+            return 22, i, 1
+        if value >= 21:
+            return value, i, 1
+        code = cells[SOFT if soft else HARD][value][column]
+        action = (TWO_CARD_ACTIONS if two_cards else MULTI_CARD_ACTIONS)[code]
+        if action == 'h':
+            hard += RANK_VALUES[seq[i]]
+            ace = ace or seq[i] == ACE
+            i += 1
+            two_cards = False
+        elif action == 'd':
+            hard += RANK_VALUES[seq[i]]
+            ace = ace or seq[i] == ACE
+            value = hard + 10 if ace and hard <= 11 else hard
+            return (22 if value > 21 else value), i + 1, 2
+        else:
+            return value, i, 1
+
+
+def _dealer_total(seq, i, up, hole):
+    hard = RANK_VALUES[up] + RANK_VALUES[hole]
+    ace = up == ACE or hole == ACE
+    while True:
+        value = hard + 10 if ace and hard <= 11 else hard
+        if value >= 17:
+            return 22 if value > 21 else value
+        hard += RANK_VALUES[seq[i]]
+        ace = ace or seq[i] == ACE
+        i += 1
+
+
+def _settle(player, dealer):
+    if player > 21:
+        return -1
+    if dealer > 21 or player > dealer:
+        return 1
+    return -1 if player < dealer else 0
+
+
+def _action_evs(seq, first, second, up, kind, cells, column):
+    """EV of each action for one forced hand, every action drawing from the same
+    card sequence (common random numbers). seq[0] is the dealer's hole card."""
+    hole = seq[0]
+    hard = RANK_VALUES[first] + RANK_VALUES[second]
+    ace = first == ACE or second == ACE
+    value = hard + 10 if ace and hard <= 11 else hard
+    evs = [None] * 4
+    evs[STAND] = _settle(value, _dealer_total(seq, 1, up, hole))
+    card = seq[1]
+    hit_hard = hard + RANK_VALUES[card]
+    hit_ace = ace or card == ACE
+    final, i, _ = _play_on(seq, 2, hit_hard, hit_ace, False, cells, column)
+    evs[HIT] = _settle(final, _dealer_total(seq, i, up, hole))
+    doubled = hit_hard + 10 if hit_ace and hit_hard <= 11 else hit_hard
+    evs[DOUBLE] = 2 * _settle(22 if doubled > 21 else doubled, _dealer_total(seq, 2, up, hole))
+    if kind == PAIR:
+        pair_value = RANK_VALUES[first]
+        i = 1
+        finals = []
+        for _ in range(2):
+            card = seq[i]
+            final, i, mult = _play_on(seq, i + 1, pair_value + RANK_VALUES[card],
+                                      first == ACE or card == ACE, True, cells, column)
+            finals.append((final, mult))
+        dealer = _dealer_total(seq, i, up, hole)
+        evs[SPLIT] = sum(mult * _settle(final, dealer) for final, mult in finals)
+    return evs
+
+
+def _without(cards, positions, ranks, rng):
+    """cards less one uniformly chosen card of each rank in ranks.
+
+    Dropping the first card of a rank instead would leave the front of the
+    sequence, where every rollout draws, short of that rank.
+    """
+    picked = []
+    for rank in set(ranks):
+        picked.extend(rng.sample(positions[rank], ranks.count(rank)))   # ValueError if too few left
+    picked.sort()
+    seq, start = [], 0
+    for i in picked:
+        seq.extend(cards[start:i])
+        start = i + 1
+    seq.extend(cards[start:])
+    return seq
+
+
+def _sample_states(job):
+    """Worker task: sample shoe states and roll out every cell at each one.
+
+    Returns (sums, squares, counts) over [kind, row, upcard, bucket, action] and
+    per-bucket (state count, true-count sum).
+    """
+    seed, num_states, num_decks = job
+    rng = make_rng(seed)
+    tables = STRATEGY_REGISTRY.compiled().table.tolist()
+    shape = (3, NUM_TOTALS, NUM_UPCARDS, NUM_BUCKETS, 4)
+    sums, squares, counts = np.zeros(shape), np.zeros(shape), np.zeros(shape, dtype=np.int64)
+    bucket_states = np.zeros(NUM_BUCKETS, dtype=np.int64)
+    bucket_tc = np.zeros(NUM_BUCKETS)
+
+    shoe = [rank for rank, n in enumerate(shoe_composition(num_decks)) for _ in range(n)]
+    size = len(shoe)
+    cells_to_play = list(_cells())
+    for _ in range(num_states):
+        rng.shuffle(shoe)
+        depth = rng.randrange(int(size * PENETRATION))
+        count = sum(HI_LO[r] for r in shoe[:depth])
+        true_count = count / ((size - depth) / 52)
+        bucket = _tcc_slot(true_count)
+        bucket_states[bucket] += 1
+        bucket_tc[bucket] += true_count
+        cells = tables[bucket]
+        remaining = shoe[depth:]
+        positions = [[] for _ in range(10)]
+        for i, rank in enumerate(remaining):
+            positions[rank].append(i)
+        for kind, row, (first, second) in cells_to_play:
+            for up in range(10):
+                try:
+                    seq = _without(remaining, positions, [first, second, up], rng)
+                except ValueError:
+                    continue        # the forced cards are not left in this shoe
+                hole = seq[0]
+                if (up == ACE and hole == TEN) or (up == TEN and hole == ACE):
+                    continue        # dealer blackjack: settled before any decision
+                column = _strategy_value(up) - 2
+                evs = _action_evs(seq, first, second, up, kind, cells, column)
+                for action, ev in enumerate(evs):
+                    if ev is not None:
+                        sums[kind, row, column, bucket, action] += ev
+                        squares[kind, row, column, bucket, action] += ev * ev
+                        counts[kind, row, column, bucket, action] += 1
+    return sums, squares, counts, bucket_states, bucket_tc
+
+
+def _fit(tcs, means, weights):
+    """Weighted least-squares line through per-bucket means; returns (slope, intercept)."""
+    mask = weights > 0
+    if mask.sum() < 2:
+        mean = means[mask].mean() if mask.any() else 0.0
+        return 0.0, mean
+    slope, intercept = np.polyfit(tcs[mask], means[mask], 1, w=np.sqrt(weights[mask]))
+    return slope, intercept
+
+
+def generate_indices(num_decks=8, num_states=20000, seed=None, num_workers=None,
+                     states_per_task=STATES_PER_TASK):
+    """Estimate action EVs per cell and true-count bucket by simulation and pick the
+    best action in every bucket.
+
+    Each sampled state is a shuffled shoe dealt to a random depth; every cell's
+    two-card hand is forced from the remaining cards and each competing action
+    (stand, hit, double, and split for pairs) is rolled out on the same cards,
+    so differences between actions carry far less noise than the EVs themselves.
+    After the first action, hands continue with the current tables for that
+    bucket. Per action, EV is fitted as a line in the true count across buckets,
+    and the crossover index of two actions is where their lines meet.
+
+    Returns {"tables": {tcc_key: (hard, soft, split) letter grids for the decided
+    rows, None elsewhere}, "indices": [...], "states": per-bucket state counts}.
+    """
+    tasks = [min(states_per_task, num_states - start) for start in range(0, num_states, states_per_task)]
+    jobs = [(task_seed, n, num_decks) for task_seed, n in zip(spawn_seeds(seed, len(tasks)), tasks)]
+    workers = min(num_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        parts = [_sample_states(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_sample_states, jobs))
+    sums, squares, counts, bucket_states, bucket_tc = (sum(p[k] for p in parts) for k in range(5))
+
+    thresholds = np.array([t for _, t in _TCC_KEY_THRESHOLDS], dtype=float)
+    # bucket position on the true-count axis: observed mean, or its threshold if never seen
+    tcs = np.where(bucket_states > 0, bucket_tc / np.maximum(bucket_states, 1), thresholds)
+
+    tables = {key: ([[None] * 10 for _ in range(18)], [[None] * 10 for _ in range(10)],
+                    [[None] * 10 for _ in range(10)]) for key, _ in _TCC_KEY_THRESHOLDS}
+    indices = []
+    for kind, row, _ in _cells():
+        for column in range(NUM_UPCARDS):
+            n = counts[kind, row, column]                  # [bucket, action]
+            means = sums[kind, row, column] / np.maximum(n, 1)
+            actions = (STAND, HIT, DOUBLE, SPLIT) if kind == PAIR else (STAND, HIT, DOUBLE)
+            lines = {a: _fit(tcs, means[:, a], n[:, a]) for a in actions}
+            for bucket, (key, _) in enumerate(_TCC_KEY_THRESHOLDS):
+                fitted = {a: lines[a][0] * tcs[bucket] + lines[a][1] for a in actions}
+                tables[key][kind][_table_row(kind, row)][column] = _cell_letter(kind, fitted)
+            indices.extend(_crossovers(kind, row, column, lines))
+    return {
+        "num_decks": num_decks,
+        "tables": tables,
+        "indices": indices,
+        "states": dict(zip((key for key, _ in _TCC_KEY_THRESHOLDS), bucket_states.tolist())),
+    }
+
+
+def _table_row(kind, row):
+    return row - (HARD_FIRST_TOTAL if kind == HARD else SOFT_FIRST_TOTAL if kind == SOFT else PAIR_FIRST_VALUE)
+
+
+def _cell_letter(kind, fitted):
+    if kind == PAIR:
+        best_other = max(fitted[STAND], fitted[HIT], fitted[DOUBLE])
+        return 'Y' if fitted[SPLIT] > best_other else 'N'
+    best = max((STAND, HIT, DOUBLE), key=lambda a: fitted[a])
+    if best == DOUBLE:
+        return 'D' if fitted[HIT] >= fitted[STAND] else 'DS'
+    return ACTION_LETTERS[best]
+
+
+def _row_label(kind, row):
+    if kind == HARD:
+        return f"hard {row}"
+    if kind == SOFT:
+        return f"soft {row}"
+    return f"pair {'A' if row == 11 else 'T' if row == 10 else row}"
+
+
+def _crossovers(kind, row, column, lines):
+    """True counts where the two best actions' fitted EV lines cross, within the bucket range."""
+    found = []
+    pairs = [(STAND, HIT), (DOUBLE, HIT), (DOUBLE, STAND)]
+    if kind == PAIR:
+        pairs.append((SPLIT, STAND))
+        pairs.append((SPLIT, HIT))
+    upcard = RANK_LABELS[(column + 1) % 10]
+    for a, b in pairs:
+        slope = lines[a][0] - lines[b][0]
+        if abs(slope) < 1e-9:
+            continue
+        index = -(lines[a][1] - lines[b][1]) / slope
+        at_index = {x: lines[x][0] * index + lines[x][1] for x in lines}
+        if any(at_index[x] > at_index[a] for x in lines if x not in (a, b)):
+            continue        # a third action is better where these two cross: not a playing decision
+        if -6 <= index <= 12:
+            found.append({"hand": _row_label(kind, row), "upcard": upcard,
+                          "action": ACTION_LETTERS[a], "instead_of": ACTION_LETTERS[b],
+                          "when": "tc >=" if slope > 0 else "tc <=", "index": round(float(index), 1)})
+    return found
+
+
+# workbook cell ranges, by kind: (first Excel row of the table, first column letter)
+_TABLE_ORIGIN = {HARD: 3, SOFT: 23, PAIR: 35}
+
+
+def write_workbooks(result, out_dir, template_paths=None):
+    """Write the 11 strategy_tcc_*.xlsx workbooks in the usual layout.
+
+    Each workbook starts as a copy of the current one for its bucket, so rows the
+    generator does not decide (hard 21, soft 21) and all formatting are kept.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    template_paths = template_paths or _TCC_KEY_TO_PATH
+    written = []
+    for key, _ in _TCC_KEY_THRESHOLDS:
+        path = os.path.join(out_dir, os.path.basename(template_paths[key]))
+        shutil.copy(template_paths[key], path)
+        wb = load_workbook(path)
+        ws = wb.active
+        for kind, grid in zip((HARD, SOFT, PAIR), result["tables"][key]):
+            for r, cells in enumerate(grid):
+                for c, letter in enumerate(cells):
+                    if letter is not None:
+                        ws.cell(row=_TABLE_ORIGIN[kind] + r, column=2 + c, value=letter)
+        wb.save(path)
+        written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+    parser = argparse.ArgumentParser(description="Generate TCC strategy workbooks by simulation")
+    parser.add_argument("--decks", type=int, default=8)
+    parser.add_argument("--states", type=int, default=20000, help="shoe states to sample")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=None, help="output directory (default strategies/generated_<decks>d)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = generate_indices(args.decks, args.states, seed=args.seed, num_workers=args.workers)
+    out_dir = args.out or os.path.join("strategies", f"generated_{args.decks}d")
+    for path in write_workbooks(result, out_dir):
+        print(f"[indexgen] Wrote {path}")
+    with open(os.path.join(out_dir, "index_numbers.json"), "w") as f:
+        json.dump({"num_decks": args.decks, "states": result["states"], "indices": result["indices"]}, f, indent=1)
+    print(f"[indexgen] {args.states} states, {len(result['indices'])} crossovers "
+          f"in {time.perf_counter() - start:.1f}s")
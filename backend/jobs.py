@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from auto import AutoGame
+from results import ResultColumns
+from precision import PrecisionTracker
+
+# Simulations allowed to run at once; further jobs wait in the queue. Kept small so
+# long runs never occupy the request threads the quiz and websocket endpoints use.
+MAX_CONCURRENT_JOBS = int(os.environ.get("BJ_MAX_CONCURRENT_JOBS", "2"))
+# limit the number of finished jobs kept in memory; the oldest finished job is dropped first
+MAX_STORED_JOBS = 50
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class SimulationJob:
+    """One auto-play simulation submitted through the job API."""
+
+    def __init__(self, options):
+        self.id = str(uuid.uuid4())
+        self.options = options            # keyword arguments for AutoGame.auto_play_iter
+        self.status = QUEUED
+        self.hands_done = 0
+        self.precision = PrecisionTracker()   # live EV per unit wagered and its standard error
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, CANCELLED, FAILED)
+
+    def snapshot(self):
+        """Status and progress (hands done, hands/sec, ETA, current standard error) for GET /jobs/{id}.
+
+        With a target_se the ETA is for the hands the target is projected to need.
+        """
+        num_games = self.options.get("num_games", 0)
+        target_se = self.options.get("target_se")
+        hands_planned = num_games
+        if target_se is not None:
+            hands_planned = min(num_games, self.precision.hands_needed(target_se) or num_games)
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        rate = self.hands_done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.status == RUNNING and rate > 0:
+            eta = round((hands_planned - self.hands_done) / rate, 2)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": {
+                "hands_done": self.hands_done,
+                "num_games": num_games,
+                "fraction": round(self.hands_done / num_games, 4) if num_games else 1.0,
+                "hands_per_sec": round(rate, 1),
+                "elapsed_seconds": round(elapsed, 2),
+                "eta_seconds": eta,
+                "se": self.precision.se,
+                "target_se": target_se,
+            },
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Runs simulation jobs on a bounded thread pool with cooperative cancellation."""
+
+    def __init__(self, max_workers=MAX_CONCURRENT_JOBS, max_stored=MAX_STORED_JOBS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sim-job")
+        self.max_stored = max_stored
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, options):
+        job = SimulationJob(options)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._evict()
+        self.executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Ask a job to stop; a running simulation stops before its next hand."""
+        job = self.jobs.get(job_id)
+        if job is not None and not job.finished:
+            job.cancel_event.set()
+        return job
+
+    def _evict(self):
+        # drop the oldest finished jobs once we exceed the limit
+        for job_id in [jid for jid, j in self.jobs.items() if j.finished]:
+            if len(self.jobs) <= self.max_stored:
+                break
+            del self.jobs[job_id]
+
+    def _run(self, job):
+        # a job cancelled while queued plays no hands, but still gets a result shaped like /simulate's
+        if not job.cancel_event.is_set():
+            job.status = RUNNING
+            job.started_at = time.time()
+        columns = ResultColumns()
+        last_balance = job.options.get("balance", 1000)
+
+        def count_hand(row):
+            nonlocal last_balance
+            columns.append(row)
+            job.precision.add(row["balance"] - last_balance, row["bet"])
+            last_balance = row["balance"]
+            job.hands_done = columns.size
+
+        try:
+            rows = AutoGame.auto_play_iter(
+                input_func=lambda *args, **kwargs: None,
+                output_func=lambda *args, **kwargs: None,
+                cancel_event=job.cancel_event,
+                **job.options,
+            )
+            summary = AutoGame.drain(rows, count_hand)
+            job.result = {
+                "num_games": job.options.get("num_games"),
+                "results": columns.to_records(),
+                "logs": [],
+                **summary,
+            }
+            job.status = CANCELLED if summary["cancelled"] else DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
@@ -1,18 +1,32 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, HTTPException, Header
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from console import ConsoleGame
-from auto import AutoGame
+from auto import AutoGame, STRATEGY_REGISTRY, DEFAULT_PENETRATION
 from quizMode import generate_quiz_question, check_quiz_answer
+from results import read_results, ResultColumns, RESULTS_PATH
+from jobs import JobManager
+from cache import ResultCache, cache_key
+from graph import GraphStore
 import threading
 import queue
 import asyncio
 import os
-from engine import simulate_hand, simulate_many
+from engine import simulate_hand, simulate_many_batch
+from analysis import HouseEdgeCalculator
+from compare import compare_configs
+from bankroll import calibrated_model, CALIBRATION_SHOES
+from table import play_table, validate_seats
+from sweep import sweep_iter, expand_grid, validate_point, SWEEP_BANKROLL, HANDS_PER_HOUR
+from precision import se_for_ci_width
+from counting import SYSTEMS, DEFAULT_SYSTEM, get_systems
+from bj import RANKS, validate_shoe
 import json
 import time
-from typing import Dict, List, Optional
+import pyarrow as pa
+import uuid
+from typing import Any, Dict, List, Optional
 
 app = FastAPI(title="Blackjack Simulator API")
 
@@ -24,7 +38,7 @@ app.add_middleware(
         "*"
     ],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "OPTIONS", "HEAD"],  #<---------------------NEW Fix: explicit instead of "*"
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS", "HEAD"],  #<---------------------NEW Fix: explicit instead of "*"
     allow_headers=["Content-Type", "Authorization", "Accept", "Origin"],
     expose_headers=["Content-Disposition"],
     allow_origin_regex=None,
@@ -41,25 +55,32 @@ def health_check():
     }
 
 @app.get("/results")
-def get_results():
-    # serve the latest CSV output from auto-play
-    results_path = os.path.join(os.getcwd(), "results.csv")
-    if not os.path.exists(results_path):
-        #return FileResponse(results_path, media_type="text/csv", filename="results.csv")
+def get_results(format: str = "csv"):
+    # serve the latest /simulate run (or a results file left by another run); sent as CSV unless format=parquet
+    data = GRAPHS.results()
+    results_path = os.path.join(os.getcwd(), RESULTS_PATH)
+    if data is None and not os.path.exists(results_path):
         return {"error": "Results file not found. Run a simulation first."}
-    #return {"error": "Results file not found. Run a simulation first."}
-    return FileResponse(
-        results_path,
-        media_type="text/csv",
-        filename="results.csv",
-        headers={
-            "Access-Control-Allow-Origin": "http://localhost:5173",
-            "Access-Control-Allow-Methods": "GET, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type, Accept",
-            "Access-Control-Expose-Headers": "Content-Disposition",
-            "Access-Control-Max-Age": "86400",
-        }
-    )
+    headers = {
+        "Access-Control-Allow-Origin": "http://localhost:5173",
+        "Access-Control-Allow-Methods": "GET, OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type, Accept",
+        "Access-Control-Expose-Headers": "Content-Disposition",
+        "Access-Control-Max-Age": "86400",
+    }
+    if format == "parquet":
+        if data is None:
+            return FileResponse(
+                results_path,
+                media_type="application/vnd.apache.parquet",
+                filename="results.parquet",
+                headers=headers,
+            )
+        headers["Content-Disposition"] = 'attachment; filename="results.parquet"'
+        return Response(content=data, media_type="application/vnd.apache.parquet", headers=headers)
+    csv_text = read_results(results_path if data is None else pa.BufferReader(data)).to_csv(index=False)
+    headers["Content-Disposition"] = 'attachment; filename="results.csv"'
+    return Response(content=csv_text, media_type="text/csv", headers=headers)
 
 # ── Strategy config ────────────────────────────────────────────────────────────
 TCC_FILES = {
@@ -89,14 +110,14 @@ def get_strategy(tcc_key: str):
     if not path:
         raise HTTPException(status_code=404, detail=f"Unknown TCC key: {tcc_key}")
     try:
-        strat = AutoGame.Strategy(path)
+        hard, soft, split = STRATEGY_REGISTRY.tables(path)
         return {
             "tcc_key": tcc_key,
             "row_labels": {"hard": HARD_ROW_LABELS, "soft": SOFT_ROW_LABELS, "split": SPLIT_ROW_LABELS},
             "col_labels": DEALER_COL_LABELS,
-            "hard":  strat.hard_df.values.tolist(),
-            "soft":  strat.soft_df.values.tolist(),
-            "split": strat.split_df.values.tolist(),
+            "hard":  hard,
+            "soft":  soft,
+            "split": split,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -112,6 +133,92 @@ class SimRequest(BaseModel):
     strategy_overrides: Optional[Dict[str, dict]] = None  # {tcc_key: {hard:[[r,c,v],...], ...}}
     insurance_threshold: Optional[float] = None    # take insurance when TCC >= this value
     use_base_strategy_only: bool = False           # ignore TCC deviations, always use tcc_0_1
+    penetration: float = DEFAULT_PENETRATION       # fraction of the shoe dealt before the reshuffle
+    burn_cards: int = 0                            # cards burned unseen after every shuffle
+    counting_system: str = DEFAULT_SYSTEM          # system that sizes bets and picks the strategy bucket
+    compare_systems: Optional[List[str]] = None    # systems scored on the same hands (serial runs only)
+    # Parallel execution: >1 splits the run into independent shards over a process pool
+    workers: Optional[int] = None
+    seed: Optional[int] = None                     # makes the run reproducible (root seed for shards)
+    cache_unseeded: bool = False                   # also cache runs without a seed (served until evicted)
+    # Adaptive length: stop once EV per unit wagered is this precise (num_games becomes the hand budget)
+    target_se: Optional[float] = None              # standard error to reach
+    target_ci_width: Optional[float] = None        # or the full width of the 95% confidence interval
+    max_seconds: Optional[float] = None            # time budget for the run
+
+
+def _target_se(req: SimRequest):
+    target = req.target_se
+    if target is None and req.target_ci_width is not None:
+        target = se_for_ci_width(req.target_ci_width)
+    if target is not None and target <= 0:
+        raise HTTPException(status_code=400, detail="The precision target must be positive")
+    return target
+
+
+def _sim_options(req: SimRequest):
+    """Simulation keyword arguments shared by /simulate, /simulate/stream and /jobs."""
+    try:
+        validate_shoe(req.num_decks, req.penetration, req.burn_cards)
+        get_systems([req.counting_system, *(req.compare_systems or ())])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return dict(
+        num_games=req.num_games,
+        balance=req.balance,
+        bet_amount=req.bet_amount,
+        num_decks=req.num_decks,
+        bet_ramp=req.bet_ramp,
+        strategy_overrides=req.strategy_overrides,
+        insurance_threshold=req.insurance_threshold,
+        use_base_strategy_only=req.use_base_strategy_only,
+        penetration=req.penetration,
+        burn_cards=req.burn_cards,
+        target_se=_target_se(req),
+        max_seconds=req.max_seconds,
+        counting_system=req.counting_system,
+        compare_systems=req.compare_systems,
+    )
+
+
+@app.get("/counting/systems")
+def counting_systems():
+    """Counting systems a simulation can use, with their tags and betting correlation."""
+    return [{
+        "system": system.name,
+        "label": system.label,
+        "tags": dict(zip(RANKS, system.tags.tolist())),
+        "balanced": system.balanced,
+        "side_count": bool(system.ace_weight),
+        "betting_correlation": system.betting_correlation,
+    } for system in SYSTEMS.values()]
+
+
+# Identical seeded requests are served from here instead of re-running the simulation
+RESULT_CACHE = ResultCache()
+# graphs are drawn on the first GET /graph for a run, never on the /simulate path
+GRAPHS = GraphStore()
+
+
+def _cache_lookup(endpoint, params, seed, opt_in, version=None):
+    """Return (key, blobs): key is None when the request bypasses the cache
+    (unseeded and not opted in), blobs is None on a miss."""
+    if seed is None and not opt_in:
+        return None, None
+    key = cache_key(endpoint, params, version)
+    return key, RESULT_CACHE.get(key)
+
+
+def _json_response(body, cache_status):
+    """Send already-encoded JSON, reporting the cache outcome in the body and an X-Cache header."""
+    if body.startswith(b"{") and len(body) > 2:
+        body = b'{"cache":"' + cache_status.encode() + b'",' + body[1:]
+    return Response(content=body, media_type="application/json", headers={"X-Cache": cache_status})
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return RESULT_CACHE.stats()
 
 
 @app.post("/simulate")
@@ -120,61 +227,171 @@ def simulate(req: SimRequest):
     # Timer start for benchmarking
     endpoint_start_time = time.perf_counter()
     print("Request received")
+
+    # shards have fixed sizes, so an adaptive run is always played serially (as is a system comparison)
+    adaptive = _target_se(req) is not None or req.max_seconds is not None
+    parallel = bool(req.workers and req.workers > 1) and not adaptive and not req.compare_systems
+    params = {**_sim_options(req), "seed": req.seed, "workers": req.workers if parallel else None}
+    STRATEGY_REGISTRY.compiled()   # refresh the version if a workbook was edited
+    key, blobs = _cache_lookup("simulate", params, req.seed, req.cache_unseeded,
+                               version=STRATEGY_REGISTRY.version)
+    if blobs is not None:
+        # make this run the latest again so /results and /graph match the response
+        if "results" in blobs:
+            GRAPHS.register(key, blobs["results"])
+        print(f"API cache hit: {time.perf_counter() - endpoint_start_time:.4f}s")
+        return _json_response(blobs["body"], "hit")
+
     sim_start = time.perf_counter()
 
-    # Run the simulation and get results as JSON
-    sim_results = AutoGame.auto_play_loop(
-        num_games=req.num_games,
-        balance=req.balance,
-        bet_amount=req.bet_amount,
-        num_decks=req.num_decks,
-        input_func=lambda *args, **kwargs: None,
-        output_func=lambda *args, **kwargs: None,
-        return_as_json=True,
-        bet_ramp=req.bet_ramp,
-        strategy_overrides=req.strategy_overrides,
-        insurance_threshold=req.insurance_threshold,
-        use_base_strategy_only=req.use_base_strategy_only,
-    )
+    # Run the simulation and get results as JSON; its results are kept in memory, not in the shared file
+    sim_options = _sim_options(req)
+    if parallel:
+        sim_results = AutoGame.parallel_auto_play_loop(num_workers=req.workers, seed=req.seed,
+                                                       save_results=False, **sim_options)
+    else:
+        sim_results = AutoGame.auto_play_loop(
+            input_func=lambda *args, **kwargs: None,
+            output_func=lambda *args, **kwargs: None,
+            return_as_json=True,
+            save_results=False,
+            seed=req.seed,
+            **sim_options,
+        )
 
     # timer
     sim_end = time.perf_counter()
     print(f"API simulation time (auto_play_loop): {sim_end - sim_start:.4f}s")
 
-    # Also save CSV + generate graph in the background
-    graph_start = time.perf_counter()
-    try:
-        import pandas as pd
-        results_df = pd.DataFrame(sim_results.get("results", []))
-        results_df.to_csv("results.csv", index=False)
-        from graph import SimGraph
-        SimGraph().generate()
-    except Exception as e:
-        print(f"Graph generation failed: {e}")
+    # The run's own Parquet bytes back /results and /graph; the graph is rendered on first GET /graph.
+    # Cached runs reuse their cache key as run id, so a repeat request reuses the rendered PNG too.
+    run_id = key or uuid.uuid4().hex
+    results = None
+    if "error" not in sim_results:
+        results = ResultColumns.from_records(sim_results["results"]).parquet_bytes(sim_results["shuffles"])
+        sim_results["run_id"] = run_id
+        GRAPHS.register(run_id, results)
 
-    # timer    
-    graph_end = time.perf_counter()
-    print(f"API graph/CSV generation time: {graph_end - graph_start:.4f}s")
     endpoint_end = time.perf_counter()
     print(f"API total endpoint time: {endpoint_end - endpoint_start_time:.4f}s")
 
-    return sim_results
+    body = json.dumps(sim_results).encode("utf-8")
+    if key is None:
+        return _json_response(body, "bypass")
+    if results is not None:
+        RESULT_CACHE.put(key, {"body": body, "results": results})
+    return _json_response(body, "miss")
+
+
+# rows per NDJSON write in /simulate/stream
+STREAM_CHUNK_ROWS = 500
+
+
+@app.post("/simulate/stream")
+def simulate_stream(req: SimRequest):
+    """Stream a simulation as NDJSON: one line per hand, then a final summary line.
+
+    Rows are produced by AutoGame.auto_play_iter and written in chunks as they are
+    played, so clients can start drawing right away; the run is only kept as
+    compact columns, registered at the end so /results and /graph serve it.
+    The last line is {"done": true, "num_games", "final_balance", "total_profit", "shuffles", "cancelled",
+    "run_id"}.
+    """
+    rows = AutoGame.auto_play_iter(
+        input_func=lambda *args, **kwargs: None,
+        output_func=lambda *args, **kwargs: None,
+        seed=req.seed,
+        **_sim_options(req),
+    )
+
+    def ndjson():
+        columns = ResultColumns()
+        chunk = []
+        while True:
+            try:
+                row = next(rows)
+            except StopIteration as stop:
+                summary = stop.value
+                break
+            columns.append(row)
+            chunk.append(json.dumps(row))
+            if len(chunk) >= STREAM_CHUNK_ROWS:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+        run_id = uuid.uuid4().hex
+        GRAPHS.register(run_id, columns.parquet_bytes(summary["shuffles"]))
+        yield json.dumps({"done": True, "num_games": req.num_games, **summary, "run_id": run_id}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+# Background simulations: submit, poll for progress, cancel, fetch the result
+JOBS = JobManager()
+
+
+@app.post("/jobs", status_code=202)
+def submit_job(req: SimRequest):
+    """Queue a simulation and return its id immediately (202 Accepted)."""
+    if req.num_games <= 0:
+        raise HTTPException(status_code=400, detail="Number of games must be at least 1.")
+    job = JOBS.submit({**_sim_options(req), "seed": req.seed})
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Job status plus progress: hands done, hands/sec and estimated seconds remaining."""
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.snapshot()
+
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """Cancel a queued or running job; the simulation stops before its next hand."""
+    job = JOBS.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.snapshot()
+
+
+@app.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    """Results of a finished job, in the same shape /simulate returns (partial if cancelled)."""
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if not job.finished:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.status}")
+    if job.error is not None:
+        raise HTTPException(status_code=500, detail=job.error)
+    return job.result
 
 
 @app.get("/graph")
-def get_graph():
-    graph_path = os.path.join(os.getcwd(), "simulation_graph.png")
-    if not os.path.exists(graph_path):
-        #return FileResponse(graph_path, media_type="image/png")
+def get_graph(run_id: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
+    """PNG for a run (default: the latest), rendered on first request and cached.
+    The run id is the ETag, so a matching If-None-Match gets 304 without a body."""
+    if GRAPHS.latest is None and os.path.exists(RESULTS_PATH):
+        # results left by an earlier server process or a script run
+        with open(RESULTS_PATH, "rb") as f:
+            GRAPHS.register(f"file-{os.stat(RESULTS_PATH).st_mtime_ns}", f.read())
+    run_id = run_id or GRAPHS.latest
+    headers = {
+        "Access-Control-Allow-Origin": "http://localhost:5173",
+        "ETag": f'"{run_id}"',
+        "Cache-Control": "no-cache",
+        "Content-Disposition": 'inline; filename="simulation_graph.png"',
+    }
+    if run_id is not None and if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    png = GRAPHS.png(run_id) if run_id is not None else None
+    if png is None:
         return {"error": "No graph found. Run a simulation first."}
-    return FileResponse(
-        graph_path,
-        media_type="image/png",
-        filename="simulation_graph.png",
-        headers={
-            "Access-Control-Allow-Origin": "http://localhost:5173",
-        }
-    )
+    return Response(content=png, media_type="image/png", headers=headers)
 
 # quiz mode endpoint: generates question for the frontend!
 @app.get("/quiz-mode/question")
@@ -308,15 +525,282 @@ def simulate_single_hand():
     return result
 
 
+# the vectorized batch engine handles millions of hands per request
+MAX_BATCH_HANDS = 10_000_000
+
+
 @app.post("/simulate-batch")
 def run_batch_simulation(body: Dict = Body(...)):
     count = body.get('count', 1000)
     seed = body.get('seed')  # Optional
-    if not isinstance(count, int) or count < 1 or count > 100000:
-        raise HTTPException(status_code=400, detail="Count must be an integer between 1 and 100,000")
+    if not isinstance(count, int) or count < 1 or count > MAX_BATCH_HANDS:
+        raise HTTPException(status_code=400, detail=f"Count must be an integer between 1 and {MAX_BATCH_HANDS:,}")
+
+    key, blobs = _cache_lookup("simulate-batch", {"count": count, "seed": seed}, seed,
+                               bool(body.get('cache_unseeded', False)))
+    if blobs is not None:
+        return _json_response(blobs["body"], "hit")
 
     try:
-        results = simulate_many(count=count, seed=seed)
-        return results
+        results = simulate_many_batch(count=count, seed=seed)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    encoded = json.dumps(results).encode("utf-8")
+    if key is None:
+        return _json_response(encoded, "bypass")
+    RESULT_CACHE.put(key, {"body": encoded})
+    return _json_response(encoded, "miss")
+
+
+class AnalyzeRequest(BaseModel):
+    num_decks: int = 8
+    tcc_key: str = "tcc_0_1"                       # strategy table to evaluate
+    strategy_overrides: Optional[dict] = None      # {hard:[[r,c,v],...], soft:..., split:...} for that table
+    exact: bool = False                            # dealer odds from the exact cards left at every stand (slower)
+
+
+@app.post("/analyze")
+def analyze(req: AnalyzeRequest):
+    """Exact expected value of one strategy table for every starting hand and upcard.
+
+    Computed by HouseEdgeCalculator instead of simulation; results are cached, so
+    repeating a question returns immediately.
+    """
+    path = TCC_FILES.get(req.tcc_key)
+    if not path:
+        raise HTTPException(status_code=404, detail=f"Unknown TCC key: {req.tcc_key}")
+    if not 1 <= req.num_decks <= 16:
+        raise HTTPException(status_code=400, detail="num_decks must be between 1 and 16")
+
+    compiled = STRATEGY_REGISTRY.compiled()
+    key, blobs = _cache_lookup("analyze", req.model_dump(), None, True, version=STRATEGY_REGISTRY.version)
+    if blobs is not None:
+        return _json_response(blobs["body"], "hit")
+
+    bucket = STRATEGY_REGISTRY.bucket(path)
+    if req.strategy_overrides:
+        compiled = compiled.with_overrides(bucket, req.strategy_overrides)
+    calc = HouseEdgeCalculator(compiled.table[bucket], num_decks=req.num_decks, exact=req.exact)
+    body = json.dumps({"num_decks": req.num_decks, "tcc_key": req.tcc_key, "exact": req.exact,
+                       **calc.analyze()}).encode("utf-8")
+    RESULT_CACHE.put(key, {"body": body})
+    return _json_response(body, "miss")
+
+
+# configurations one /compare request may play against each other
+MAX_COMPARE_CONFIGS = 8
+
+
+class CompareConfig(BaseModel):
+    name: Optional[str] = None
+    bet_ramp: Optional[List[float]] = None
+    strategy_overrides: Optional[Dict[str, dict]] = None
+    insurance_threshold: Optional[float] = None
+    use_base_strategy_only: bool = False
+    counting_system: Optional[str] = None
+
+
+class CompareRequest(BaseModel):
+    configs: List[CompareConfig]                   # the first one is the baseline
+    num_shoes: int = 1000
+    bet_amount: int = 10
+    num_decks: int = 8
+    balance: Optional[int] = None                  # None = unlimited, so bets never depend on earlier results
+    workers: Optional[int] = None
+    seed: Optional[int] = None
+    cache_unseeded: bool = False
+
+
+@app.post("/compare")
+def compare(req: CompareRequest):
+    """Play every configuration on the same shoes and report each EV plus the paired
+    difference from the first configuration, with standard errors."""
+    if not 2 <= len(req.configs) <= MAX_COMPARE_CONFIGS:
+        raise HTTPException(status_code=400, detail=f"Send between 2 and {MAX_COMPARE_CONFIGS} configs")
+    if req.num_shoes < 1:
+        raise HTTPException(status_code=400, detail="num_shoes must be at least 1")
+    try:
+        get_systems([config.counting_system for config in req.configs if config.counting_system])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    STRATEGY_REGISTRY.compiled()
+    params = req.model_dump(exclude={"workers", "cache_unseeded"})
+    key, blobs = _cache_lookup("compare", params, req.seed, req.cache_unseeded,
+                               version=STRATEGY_REGISTRY.version)
+    if blobs is not None:
+        return _json_response(blobs["body"], "hit")
+
+    result = compare_configs([config.model_dump(exclude_none=True) for config in req.configs],
+                             num_shoes=req.num_shoes, seed=req.seed, num_workers=req.workers,
+                             balance=req.balance, bet_amount=req.bet_amount, num_decks=req.num_decks)
+    body = json.dumps(result).encode("utf-8")
+    if key is None:
+        return _json_response(body, "bypass")
+    RESULT_CACHE.put(key, {"body": body})
+    return _json_response(body, "miss")
+
+
+# per-request limits of /bankroll
+MAX_TRAJECTORIES = 100_000
+MAX_BANKROLL_HANDS = 10_000_000
+
+
+class BankrollRequest(BaseModel):
+    bankroll: float = 10000
+    bet_amount: int = 10
+    bet_ramp: Optional[List[float]] = None          # 11 multipliers; default follows determine_bet_multiple
+    num_hands: int = 100_000                        # horizon of every trajectory
+    num_trajectories: int = 10_000
+    stop_loss: Optional[float] = None               # session mode: stop after losing this much
+    win_goal: Optional[float] = None                # session mode: stop once this much ahead
+    num_decks: int = 8
+    strategy_overrides: Optional[Dict[str, dict]] = None
+    insurance_threshold: Optional[float] = None
+    use_base_strategy_only: bool = False
+    calibration_shoes: int = CALIBRATION_SHOES      # shoes simulated to build the model
+    workers: Optional[int] = None
+    seed: Optional[int] = None
+    cache_unseeded: bool = False
+
+
+@app.post("/bankroll")
+def bankroll(req: BankrollRequest):
+    """Risk of ruin, time to double, drawdowns and session outcomes for a bankroll and bet ramp.
+
+    Trajectories are resampled from a calibration simulation (kept between
+    requests for the same rules and seed) and advanced together in NumPy.
+    """
+    if req.bet_ramp is not None and len(req.bet_ramp) != 11:
+        raise HTTPException(status_code=400, detail="bet_ramp needs 11 multipliers")
+    if not 1 <= req.num_trajectories <= MAX_TRAJECTORIES:
+        raise HTTPException(status_code=400, detail=f"num_trajectories must be between 1 and {MAX_TRAJECTORIES:,}")
+    if not 1 <= req.num_hands <= MAX_BANKROLL_HANDS:
+        raise HTTPException(status_code=400, detail=f"num_hands must be between 1 and {MAX_BANKROLL_HANDS:,}")
+    if req.bankroll <= 0 or req.calibration_shoes < 1:
+        raise HTTPException(status_code=400, detail="bankroll and calibration_shoes must be positive")
+
+    STRATEGY_REGISTRY.compiled()
+    key, blobs = _cache_lookup("bankroll", req.model_dump(exclude={"workers", "cache_unseeded"}), req.seed,
+                               req.cache_unseeded, version=STRATEGY_REGISTRY.version)
+    if blobs is not None:
+        return _json_response(blobs["body"], "hit")
+
+    options = {name: value for name, value in (("strategy_overrides", req.strategy_overrides),
+                                               ("insurance_threshold", req.insurance_threshold))
+               if value is not None}
+    model = calibrated_model(req.num_decks, req.calibration_shoes, seed=req.seed, num_workers=req.workers,
+                             use_base_strategy_only=req.use_base_strategy_only, **options)
+    try:
+        result = model.simulate(req.bankroll, req.bet_ramp, bet_amount=req.bet_amount, num_hands=req.num_hands,
+                                num_trajectories=req.num_trajectories, stop_loss=req.stop_loss,
+                                win_goal=req.win_goal, seed=req.seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    body = json.dumps(result).encode("utf-8")
+    if key is None:
+        return _json_response(body, "bypass")
+    RESULT_CACHE.put(key, {"body": body})
+    return _json_response(body, "miss")
+
+
+class TableSeat(BaseModel):
+    name: Optional[str] = None
+    bet_amount: int = 10
+    balance: int = 1000
+    bet_ramp: Optional[List[float]] = None
+    strategy_overrides: Optional[Dict[str, dict]] = None
+    insurance_threshold: Optional[float] = None
+    use_base_strategy_only: bool = False
+
+
+class TableRequest(BaseModel):
+    seats: List[TableSeat]                          # seat order is dealing order
+    num_rounds: int = 1000
+    num_decks: int = 8
+    penetration: float = DEFAULT_PENETRATION
+    burn_cards: int = 0
+    counting_system: str = DEFAULT_SYSTEM
+    seed: Optional[int] = None
+    cache_unseeded: bool = False
+
+
+@app.post("/table")
+def table(req: TableRequest):
+    """Play 1-7 seats, each with its own bet ramp, strategy and bankroll, against one
+    dealer from one shoe. Returns a summary per seat and the per-seat results as
+    columns (one row per seat per round it bet)."""
+    seats = [seat.model_dump(exclude_none=True) for seat in req.seats]
+    if req.num_rounds < 1:
+        raise HTTPException(status_code=400, detail="num_rounds must be at least 1")
+    try:
+        validate_seats(seats)
+        validate_shoe(req.num_decks, req.penetration, req.burn_cards)
+        get_systems([req.counting_system])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    STRATEGY_REGISTRY.compiled()
+    key, blobs = _cache_lookup("table", req.model_dump(exclude={"cache_unseeded"}), req.seed, req.cache_unseeded,
+                               version=STRATEGY_REGISTRY.version)
+    if blobs is not None:
+        return _json_response(blobs["body"], "hit")
+
+    columns, summary = play_table(seats, num_rounds=req.num_rounds, num_decks=req.num_decks,
+                                  penetration=req.penetration, burn_cards=req.burn_cards,
+                                  counting_system=req.counting_system, seed=req.seed)
+    body = json.dumps({**summary, "results": columns.to_lists()}).encode("utf-8")
+    if key is None:
+        return _json_response(body, "bypass")
+    RESULT_CACHE.put(key, {"body": body})
+    return _json_response(body, "miss")
+
+
+# points one /sweep request may run
+MAX_SWEEP_POINTS = 1000
+
+
+class SweepRequest(BaseModel):
+    grid: Optional[Dict[str, List[Any]]] = None     # {parameter: [values]}, every combination is run
+    points: Optional[List[Dict[str, Any]]] = None   # or an explicit list of parameter sets
+    num_games: int = 100_000                        # hands per point
+    bet_amount: int = 10                            # defaults for points that do not set them
+    num_decks: int = 8
+    bankroll: float = SWEEP_BANKROLL                # for the risk-of-ruin column
+    hands_per_hour: int = HANDS_PER_HOUR
+    workers: Optional[int] = None
+    seed: Optional[int] = None
+
+
+@app.post("/sweep")
+def sweep(req: SweepRequest):
+    """Run a grid or list of parameter sets across a process pool, streaming NDJSON.
+
+    One summary line per point (EV, SD, hourly win, risk of ruin) is written as
+    soon as that point finishes, in completion order with its "index"; the last
+    line is {"done": true, "points", "seconds"}.
+    """
+    if (req.grid is None) == (req.points is None):
+        raise HTTPException(status_code=400, detail="Send either grid or points")
+    points = expand_grid(req.grid) if req.grid is not None else req.points
+    if not 1 <= len(points) <= MAX_SWEEP_POINTS:
+        raise HTTPException(status_code=400, detail=f"A sweep needs between 1 and {MAX_SWEEP_POINTS} points")
+    if req.num_games < 1:
+        raise HTTPException(status_code=400, detail="Number of games must be at least 1.")
+    points = [{"bet_amount": req.bet_amount, "num_decks": req.num_decks, **point} for point in points]
+    try:
+        for point in points:
+            validate_point(point)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = sweep_iter(points, req.num_games, seed=req.seed, num_workers=req.workers,
+                      bankroll=req.bankroll, hands_per_hour=req.hands_per_hour)
+
+    def ndjson():
+        start = time.perf_counter()
+        for row in rows:
+            yield json.dumps(row) + "\n"
+        yield json.dumps({"done": True, "points": len(points), "seconds": time.perf_counter() - start}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
@@ -0,0 +1,97 @@
+import math
+import numpy as np
+
+# Hands between checks of a run's precision target and time budget
+PRECISION_CHECK_HANDS = 1000
+# A target can only stop a run after this many hands; earlier variance estimates are too rough
+PRECISION_MIN_HANDS = 5000
+# two-sided 95% normal quantile
+Z_95 = 1.959963984540054
+
+
+def se_for_ci_width(width, z=Z_95):
+    """Standard error giving a confidence interval of total width `width`."""
+    return width / (2 * z)
+
+
+class PrecisionTracker:
+    """Running EV per unit wagered and its standard error.
+
+    EV is total profit over total wagered. Its standard error uses the per-hand
+    linearization profit - ev * wagered, whose variance follows from five running
+    sums, so adding a hand costs a few float operations and nothing is stored.
+    Hands are treated as independent; the count moves bets from hand to hand but
+    the cards of one hand say little about the next hand's result.
+    """
+
+    __slots__ = ('hands', 'profit', 'wagered', 'profit_sq', 'wagered_sq', 'cross')
+
+    def __init__(self):
+        self.hands = 0
+        self.profit = 0.0
+        self.wagered = 0.0
+        self.profit_sq = 0.0
+        self.wagered_sq = 0.0
+        self.cross = 0.0
+
+    @classmethod
+    def from_arrays(cls, profit, wagered):
+        """Tracker over whole columns of per-hand profit and amount wagered."""
+        profit = np.asarray(profit, dtype=float)
+        wagered = np.asarray(wagered, dtype=float)
+        return cls.from_sums(len(profit), profit.sum(), wagered.sum(), profit @ profit,
+                             wagered @ wagered, profit @ wagered)
+
+    @classmethod
+    def from_sums(cls, hands, profit, wagered, profit_sq, wagered_sq, cross):
+        """Tracker from running sums kept elsewhere."""
+        tracker = cls()
+        tracker.hands = int(hands)
+        tracker.profit = float(profit)
+        tracker.wagered = float(wagered)
+        tracker.profit_sq = float(profit_sq)
+        tracker.wagered_sq = float(wagered_sq)
+        tracker.cross = float(cross)
+        return tracker
+
+    def add(self, profit, wagered):
+        self.hands += 1
+        self.profit += profit
+        self.wagered += wagered
+        self.profit_sq += profit * profit
+        self.wagered_sq += wagered * wagered
+        self.cross += profit * wagered
+
+    @property
+    def ev(self):
+        return self.profit / self.wagered if self.wagered else 0.0
+
+    @property
+    def se(self):
+        """Standard error of ev, or None before there are two hands with money on them."""
+        n = self.hands
+        if n < 2 or not self.wagered:
+            return None
+        r = self.ev
+        var = (self.profit_sq - 2 * r * self.cross + r * r * self.wagered_sq) / (n - 1)
+        return math.sqrt(max(var, 0.0) / n) / (self.wagered / n)
+
+    def reached(self, target_se, min_hands=PRECISION_MIN_HANDS):
+        se = self.se
+        return self.hands >= min_hands and se is not None and se <= target_se
+
+    def hands_needed(self, target_se):
+        """Projected total hands for se to reach target_se (se shrinks as 1/sqrt(hands))."""
+        se = self.se
+        if se is None or not target_se:
+            return None
+        return max(self.hands, math.ceil(self.hands * (se / target_se) ** 2))
+
+    def snapshot(self):
+        se = self.se
+        return {
+            "hands": self.hands,
+            "ev_per_unit": self.ev,
+            "se": se,
+            "ci95": [self.ev - Z_95 * se, self.ev + Z_95 * se] if se is not None else None,
+        }
@@ -1,6 +1,6 @@
 from console import ConsoleGame
-from bj import PlayerHand, Deck, Card
-from auto import AutoGame
+from bj import PlayerHand, Shoe, Card, HI_LO_TAGS
+from auto import AutoGame, STRATEGY_REGISTRY
 import uuid
 
 # interprets the actions returned from strategy
@@ -35,8 +35,8 @@ def generate_quiz_question():
         "playerTotal": scenario["player_total"],
         "dealerUpcard": scenario["dealer_upcard"],
         "allowedActions": scenario["allowed_actions"],
-        ##"runningCount": 0,
-        ##"trueCount": 0,
+        "runningCount": scenario["running_count"],
+        "trueCount": round(scenario["true_count"], 2),
         "strategy": "Basic Strategy",
         "rules": {
             "dealerHitsSoft17": False,
@@ -82,7 +82,7 @@ def generate_quiz_scenario():
                 # stop the game after capturing the allowed actions, since that's the main output we need for the quiz
                 raise StopIteration 
 
-        deck = Deck(num_decks=8)
+        deck = Shoe(num_decks=8)
         # gives a a new hand every time, so we can capture different scenarios
         deck.shuffle()
         game = deck.new_game()
@@ -97,9 +97,11 @@ def generate_quiz_scenario():
                 output_func=capture_output
             )
         except StopIteration:
-            # unecessary rn but to be updated to reflect actual running count and true count in the quiz
-            captured["running_count"] = 0
-            captured["true_count"] = 0
+            # the count as the player sees it: every card dealt except the dealer's hole card
+            hole = game.dealer_hand.cards[1]
+            unseen = deck.cards_remaining() + 1
+            captured["running_count"] = deck.running_count - HI_LO_TAGS[hole.rank]
+            captured["true_count"] = captured["running_count"] / (unseen / 52)
             return captured
 
         
@@ -135,7 +137,7 @@ def get_correct_action(scenario):
 
     # for now assume true count to be 0; meaning basic strategy
     strategy_path = AutoGame.determine_strategy(0)
-    strategy = AutoGame.Strategy(strategy_path)
+    strategy = STRATEGY_REGISTRY.strategy(strategy_path)
 
     action_code = strategy.get_action(player_hand, dealer_value)
     
@@ -0,0 +1,146 @@
+import io
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Per-hand result columns and their storage types
+RESULT_COLUMNS = {
+    "hand":       np.int64,
+    "balance":    np.float64,
+    "card_count": np.int32,
+    "true_count": np.float64,
+    "bet":        np.float64,
+}
+
+# One row per reshuffle: the last hand dealt from the shoe, its profit and how deep it went
+SHUFFLE_COLUMNS = {
+    "hand":        np.int64,
+    "shoe_profit": np.float64,
+    "cards_dealt": np.int32,
+}
+# One row per seat per round it bet in a multi-seat table run (table.py)
+SEAT_COLUMNS = {
+    "round":      np.int64,
+    "seat":       np.int8,
+    "balance":    np.float64,
+    "bet":        np.float64,
+    "profit":     np.float64,
+    "true_count": np.float64,   # the count the bet was made on
+}
+# Parquet schema-metadata key holding a run's shuffle events next to its hands
+SHUFFLES_METADATA_KEY = b"shuffles"
+
+RESULTS_PATH = "results.parquet"
+RESULTS_CSV_PATH = "results.csv"
+
+
+class ResultColumns:
+    """Per-hand results held as typed NumPy column buffers that grow by doubling.
+
+    Replaces a list of row dicts: a hand costs ~36 bytes instead of a dict, and
+    the columns go straight to Parquet/Arrow, pandas or back to JSON rows.
+    """
+
+    def __init__(self, capacity=1024, columns=RESULT_COLUMNS):
+        self.columns = dict(columns)
+        self.size = 0
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in self.columns.items()}
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return len(next(iter(self._data.values())))
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, buf in self._data.items():
+            grown = np.empty(capacity, dtype=buf.dtype)
+            grown[:self.size] = buf[:self.size]
+            self._data[name] = grown
+
+    def append(self, row):
+        """Append one row dict (as yielded by AutoGame.auto_play_iter)."""
+        i = self.size
+        if i == self.capacity:
+            self._grow(i + 1)
+        for name, buf in self._data.items():
+            buf[i] = row[name]
+        self.size = i + 1
+
+    def extend(self, arrays):
+        """Append whole columns at once ({name: array}, equal lengths)."""
+        n = len(next(iter(arrays.values())))
+        if self.size + n > self.capacity:
+            self._grow(self.size + n)
+        for name, buf in self._data.items():
+            buf[self.size:self.size + n] = arrays[name]
+        self.size += n
+
+    @classmethod
+    def from_records(cls, records, columns=RESULT_COLUMNS):
+        """Columns from a list of row dicts (the JSON form of to_records)."""
+        result = cls(capacity=max(len(records), 1), columns=columns)
+        if records:
+            result.extend({name: [row[name] for row in records] for name in result.columns})
+        return result
+
+    def column(self, name):
+        """View of one column (no copy)."""
+        return self._data[name][:self.size]
+
+    def arrays(self):
+        return {name: self.column(name) for name in self.columns}
+
+    def to_lists(self):
+        """Columns as {name: list} with plain Python values; the compact JSON form."""
+        return {name: self.column(name).tolist() for name in self.columns}
+
+    def to_records(self):
+        """Rows as a list of dicts with plain Python values, for JSON responses."""
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*(self.column(n).tolist() for n in names))]
+
+    def to_dataframe(self):
+        return pd.DataFrame(self.arrays())
+
+    def to_arrow(self, shuffles=None):
+        """Arrow table of the columns; shuffles ({name: list}, SHUFFLE_COLUMNS) ride along
+        as schema metadata so one file holds the whole run."""
+        table = pa.table(self.arrays())
+        if shuffles is not None:
+            table = table.replace_schema_metadata({SHUFFLES_METADATA_KEY: json.dumps(shuffles)})
+        return table
+
+    def write_parquet(self, path=RESULTS_PATH, shuffles=None):
+        pq.write_table(self.to_arrow(shuffles), path)
+
+    def parquet_bytes(self, shuffles=None):
+        """The Parquet file write_parquet would write, in memory."""
+        buf = io.BytesIO()
+        pq.write_table(self.to_arrow(shuffles), buf)
+        return buf.getvalue()
+
+    def write_csv(self, path=RESULTS_CSV_PATH):
+        self.to_dataframe().to_csv(path, index=False)
+
+
+def read_results(path=RESULTS_PATH):
+    """Load saved results as a DataFrame (Parquet, or CSV for older/exported files).
+
+    When the file carries shuffle events they are attached as a DataFrame in
+    df.attrs["shuffles"]; files without them (CSV, older runs) leave attrs empty.
+    """
+    if str(path).endswith(".csv"):
+        return pd.read_csv(path)
+    table = pq.read_table(path)
+    df = table.to_pandas()
+    metadata = table.schema.metadata or {}
+    if SHUFFLES_METADATA_KEY in metadata:
+        df.attrs["shuffles"] = pd.DataFrame(json.loads(metadata[SHUFFLES_METADATA_KEY]))
+    return df
@@ -0,0 +1,32 @@
+import random
+import numpy as np
+
+
+def make_rng(seed=None, rng=None) -> random.Random:
+    """Return the generator a simulation should draw from.
+
+    An explicit rng wins; otherwise a new random.Random seeded with seed
+    (fresh OS entropy when seed is None). Simulations never touch the global
+    random module, so concurrent runs cannot disturb each other.
+    """
+    if rng is not None:
+        return rng
+    return random.Random(seed)
+
+
+def make_np_rng(seed=None, rng=None) -> np.random.Generator:
+    """NumPy counterpart of make_rng for the vectorized engines."""
+    if rng is not None:
+        return rng
+    return np.random.default_rng(seed)
+
+
+def spawn_seeds(seed, count):
+    """Spawn count non-overlapping child seeds from one root seed.
+
+    Uses NumPy's SeedSequence, so child k depends only on (seed, k): shard k of a
+    run gets the same stream whatever the thread or process count. Each child is
+    returned as a 128-bit int usable by random.Random or np.random.default_rng.
+    """
+    children = np.random.SeedSequence(seed).spawn(count)
+    return [int.from_bytes(child.generate_state(4).tobytes(), 'little') for child in children]
@@ -0,0 +1,238 @@
+import hashlib
+import os
+import threading
+import numpy as np
+from openpyxl import load_workbook
+
+# Cell codes. "Double else X" and "surrender else X" get their own codes so the
+# fallback is decided when the tables are compiled, not on every lookup.
+NONE            = 0
+HIT             = 1
+STAND           = 2
+DOUBLE_HIT      = 3   # D:  double on two cards, otherwise hit
+DOUBLE_STAND    = 4   # DS: double on two cards, otherwise stand
+SPLIT           = 5   # Y
+NO_SPLIT        = 6   # N
+SURRENDER_HIT   = 7   # R:  surrender is not offered, so hit
+SURRENDER_STAND = 8   # RS: surrender is not offered, so stand
+
+CELL_CODES = {
+    'H': HIT, 'S': STAND, 'D': DOUBLE_HIT, 'DS': DOUBLE_STAND,
+    'Y': SPLIT, 'N': NO_SPLIT, 'R': SURRENDER_HIT, 'RS': SURRENDER_STAND,
+}
+CELL_LETTERS = {code: letter for letter, code in CELL_CODES.items()}
+
+# Action per code for a two-card hand and for a hand that can no longer double.
+# Unknown cells stand, which is what auto play falls back to for bad actions.
+TWO_CARD_ACTIONS = ('s', 'h', 's', 'd', 'd', 'v', 's', 'h', 's')
+MULTI_CARD_ACTIONS = ('s', 'h', 's', 'h', 's', 'v', 's', 'h', 's')
+
+# Hand kinds (second tensor axis)
+HARD = 0
+SOFT = 1
+PAIR = 2
+
+NUM_TOTALS = 22     # totals are stored at their own index (hard 4-21, soft 12-21, pair card value 2-11)
+NUM_UPCARDS = 10    # dealer 2..A, stored at dealer value - 2
+
+# First table row of each kind in the workbook layout
+HARD_FIRST_TOTAL = 4
+SOFT_FIRST_TOTAL = 12
+PAIR_FIRST_VALUE = 2
+
+# Cell ranges of the three tables in every strategy workbook
+HARD_RANGE = "B3:K20"
+SOFT_RANGE = "B23:K32"
+SPLIT_RANGE = "B35:K44"
+
+BUNDLE_PATH = 'strategies/compiled_strategies.npz'
+
+
+def read_strategy_cells(path):
+    """Read the hard/soft/split cell grids (lists of rows) from a strategy workbook."""
+    wb = load_workbook(path, data_only=True)
+    ws = wb.active
+
+    def get_range(ref):
+        return [[cell.value for cell in row] for row in ws[ref]]
+
+    return get_range(HARD_RANGE), get_range(SOFT_RANGE), get_range(SPLIT_RANGE)
+
+
+class CompiledStrategy:
+    """All TCC strategy tables as one int tensor indexed [tcc_bucket, hand_kind, total, upcard].
+
+    Buckets follow the TCC slot order used for bet ramps (tcc_8plus first,
+    tcc_under_neg2 last). buckets[i] is a view with the same get_action()
+    signature as AutoGame.Strategy, so played_hand can use either.
+    """
+
+    def __init__(self, table):
+        self.table = np.ascontiguousarray(table, dtype=np.uint8)
+        self._cells = self.table.tobytes()
+        self.buckets = [BucketStrategy(self, b) for b in range(self.table.shape[0])]
+
+    @staticmethod
+    def encode_tables(hard, soft, split):
+        """Encode one TCC level's hard/soft/split cell grids (rows of letters) as a [3, 22, 10] block."""
+        block = np.zeros((3, NUM_TOTALS, NUM_UPCARDS), dtype=np.uint8)
+        for kind, rows, first in ((HARD, hard, HARD_FIRST_TOTAL),
+                                  (SOFT, soft, SOFT_FIRST_TOTAL),
+                                  (PAIR, split, PAIR_FIRST_VALUE)):
+            for r, row in enumerate(rows):
+                for c, cell in enumerate(row):
+                    block[kind, first + r, c] = CELL_CODES.get(str(cell).strip().upper(), NONE)
+        return block
+
+    @classmethod
+    def from_workbooks(cls, paths):
+        """Compile strategy workbooks (one per TCC bucket, in bucket order)."""
+        return cls(np.stack([cls.encode_tables(*read_strategy_cells(path)) for path in paths]))
+
+    @classmethod
+    def from_strategies(cls, strategies):
+        """Compile AutoGame.Strategy objects (one per TCC bucket, in bucket order)."""
+        return cls(np.stack([
+            cls.encode_tables(s.hard_df.values.tolist(), s.soft_df.values.tolist(), s.split_df.values.tolist())
+            for s in strategies
+        ]))
+
+    def decode_tables(self, bucket):
+        """Return (hard, soft, split) cell grids for a bucket in the workbook layout."""
+        block = self.table[bucket]
+        def rows(kind, first, count):
+            return [[CELL_LETTERS.get(int(code)) for code in block[kind, first + r]] for r in range(count)]
+        return (rows(HARD, HARD_FIRST_TOTAL, 18),
+                rows(SOFT, SOFT_FIRST_TOTAL, 10),
+                rows(PAIR, PAIR_FIRST_VALUE, 10))
+
+    def with_overrides(self, bucket, overrides):
+        """Return a new CompiledStrategy with cells of one bucket patched.
+        overrides = {hard: [[row, col, val], ...], soft: [...], split: [...]} using workbook row/col indices.
+        """
+        table = self.table.copy()
+        for name, kind, first in (('hard', HARD, HARD_FIRST_TOTAL),
+                                  ('soft', SOFT, SOFT_FIRST_TOTAL),
+                                  ('split', PAIR, PAIR_FIRST_VALUE)):
+            for r, c, v in overrides.get(name, []):
+                table[bucket, kind, first + int(r), int(c)] = CELL_CODES.get(str(v).upper(), NONE)
+        return CompiledStrategy(table)
+
+    def get_action(self, bucket, player_hand, dealer_value, splitallowed=True) -> str:
+        return self.buckets[bucket].get_action(player_hand, dealer_value, splitallowed)
+
+
+class BucketStrategy:
+    """One TCC bucket of a CompiledStrategy, usable wherever an AutoGame.Strategy is."""
+
+    def __init__(self, compiled, bucket):
+        self.compiled = compiled
+        self.bucket = bucket
+        self._cells = compiled._cells
+        self._base = bucket * (3 * NUM_TOTALS * NUM_UPCARDS) - 2
+
+    def get_action(self, player_hand, dealer_value, splitallowed=True) -> str:
+        # Each lookup is a single index into the flattened tensor
+        cells = self._cells
+        base = self._base + dealer_value
+        if splitallowed and player_hand.can_split():
+            if cells[base + (PAIR * NUM_TOTALS + player_hand.cards[0].value) * NUM_UPCARDS] == SPLIT:
+                return 'v'
+        kind = SOFT if player_hand.has_soft_ace() else HARD
+        code = cells[base + (kind * NUM_TOTALS + player_hand.get_value()) * NUM_UPCARDS]
+        if len(player_hand.cards) == 2:
+            return TWO_CARD_ACTIONS[code]
+        return MULTI_CARD_ACTIONS[code]
+
+
+class StrategyRegistry:
+    """Process-wide cache of the compiled TCC strategy tables.
+
+    Workbooks are parsed at most once per change: entries are checked against
+    each file's mtime/size on every access, and the compiled tensor is also
+    written to an .npz bundle keyed by a content hash of the workbooks, so a
+    fresh process loads the bundle instead of opening 11 workbooks.
+    """
+
+    def __init__(self, paths, bundle_path=BUNDLE_PATH):
+        # absolute, so a later chdir (or a worker process) still finds the files
+        self.paths = [os.path.abspath(path) for path in paths]  # bucket order
+        self.bundle_path = os.path.abspath(bundle_path)
+        self.version = None       # sha256 of the workbook contents
+        self._compiled = None
+        self._stamps = None
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        return [(st.st_mtime_ns, st.st_size) for st in map(os.stat, self.paths)]
+
+    def _source_hash(self):
+        digest = hashlib.sha256()
+        for path in self.paths:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def _read_bundle(self, version):
+        try:
+            with np.load(self.bundle_path, allow_pickle=False) as bundle:
+                if str(bundle['version']) == version:
+                    return CompiledStrategy(bundle['table'])
+        except (OSError, KeyError, ValueError):
+            pass
+        return None
+
+    def _write_bundle(self, compiled, version):
+        tmp_path = self.bundle_path[:-len('.npz')] + '.tmp.npz'
+        try:
+            np.savez(tmp_path, table=compiled.table, version=np.array(version))
+            os.replace(tmp_path, self.bundle_path)
+        except OSError as e:
+            print(f"[StrategyRegistry] Could not write bundle: {e}")
+
+    def compiled(self) -> CompiledStrategy:
+        """Return the compiled tables, reloading only if a workbook changed."""
+        stamps = self._stat()
+        with self._lock:
+            if self._compiled is None or stamps != self._stamps:
+                version = self._source_hash()
+                compiled = self._read_bundle(version)
+                if compiled is None:
+                    compiled = CompiledStrategy.from_workbooks(self.paths)
+                    self._write_bundle(compiled, version)
+                self._compiled, self._stamps, self.version = compiled, stamps, version
+            return self._compiled
+
+    def adopt(self, compiled: CompiledStrategy, version: str):
+        """Use tables compiled by another process (e.g. a pool's parent) without re-reading anything."""
+        with self._lock:
+            self._compiled, self._stamps, self.version = compiled, self._stat(), version
+
+    def rebuild(self) -> CompiledStrategy:
+        """Recompile every workbook and rewrite the bundle."""
+        with self._lock:
+            stamps = self._stat()
+            version = self._source_hash()
+            compiled = CompiledStrategy.from_workbooks(self.paths)
+            self._write_bundle(compiled, version)
+            self._compiled, self._stamps, self.version = compiled, stamps, version
+            return compiled
+
+    def bucket(self, path) -> int:
+        """Bucket index of one workbook path in the compiled tensor."""
+        return self.paths.index(os.path.abspath(path))
+
+    def strategy(self, path) -> 'BucketStrategy':
+        """Return the compiled strategy for one workbook path."""
+        return self.compiled().buckets[self.bucket(path)]
+
+    def tables(self, path):
+        """Return (hard, soft, split) cell grids for one workbook path."""
+        return self.compiled().decode_tables(self.bucket(path))
+
+
+if __name__ == "__main__":
+    # Rebuild the compiled bundle from the XLSX sources
+    from auto import STRATEGY_REGISTRY
+    STRATEGY_REGISTRY.rebuild()
+    print(f"[StrategyRegistry] Wrote {STRATEGY_REGISTRY.bundle_path} ({STRATEGY_REGISTRY.version[:12]})")
@@ -0,0 +1,147 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+import numpy as np
+from auto import AutoGame, STRATEGY_REGISTRY, DEFAULT_PENETRATION
+from bj import validate_shoe
+from precision import PrecisionTracker
+from counting import get_systems
+from strategy import CompiledStrategy
+
+# Parameters a sweep point may set; anything else is rejected
+SWEEP_PARAMETERS = ("num_decks", "penetration", "bet_ramp", "insurance_threshold", "bet_amount",
+                    "use_base_strategy_only", "strategy_overrides", "counting_system", "burn_cards")
+# Summary columns of every point, after its parameters
+SWEEP_METRICS = ("hands", "ev_per_hand", "sd_per_hand", "ev_per_unit", "ev_per_unit_se",
+                 "hourly_win", "hourly_sd", "risk_of_ruin", "seconds")
+HANDS_PER_HOUR = 100
+SWEEP_BANKROLL = 10000
+# Points run on a bankroll that never binds, so bet sizing never depends on earlier results
+_SWEEP_BALANCE = 10 ** 12
+
+
+def expand_grid(grid):
+    """Every combination of a {parameter: [values]} grid, as a list of points."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in product(*(grid[name] for name in names))]
+
+
+def validate_point(point):
+    """Raise ValueError for an unknown parameter or a value the simulator would reject."""
+    unknown = set(point) - set(SWEEP_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameter(s): {', '.join(sorted(unknown))}")
+    validate_shoe(point.get("num_decks", 8), point.get("penetration", DEFAULT_PENETRATION),
+                  point.get("burn_cards", 0))
+    if point.get("bet_ramp") is not None and len(point["bet_ramp"]) != 11:
+        raise ValueError("bet_ramp needs 11 multipliers")
+    if "counting_system" in point:
+        get_systems([point["counting_system"]])
+
+
+def _init_worker(table, version):
+    # every worker starts from the parent's compiled tables instead of loading the bundle itself
+    STRATEGY_REGISTRY.adopt(CompiledStrategy(table), version)
+
+
+def _run_point(job):
+    """Simulate one sweep point and summarize it (top level so worker processes can pickle it)."""
+    index, point, num_games, seed, bankroll, hands_per_hour = job
+    start = time.perf_counter()
+    tracker = PrecisionTracker()
+    last_balance = _SWEEP_BALANCE
+
+    def add(row):
+        nonlocal last_balance
+        tracker.add(row["balance"] - last_balance, row["bet"])
+        last_balance = row["balance"]
+
+    AutoGame.drain(AutoGame.auto_play_iter(
+        num_games=num_games, balance=_SWEEP_BALANCE, seed=seed,
+        input_func=lambda *args, **kw: None, output_func=lambda *args, **kw: None,
+        **point,
+    ), add)
+    n = max(tracker.hands, 1)
+    ev = tracker.profit / n
+    sd = math.sqrt(max(tracker.profit_sq / n - ev * ev, 0.0))
+    # diffusion approximation for a bankroll that plays this game forever
+    ruin = math.exp(-2 * ev * bankroll / (sd * sd)) if ev > 0 and sd > 0 else 1.0
+    return {
+        "index": index,
+        **point,
+        "hands": tracker.hands,
+        "ev_per_hand": ev,
+        "sd_per_hand": sd,
+        "ev_per_unit": tracker.ev,
+        "ev_per_unit_se": tracker.se,
+        "hourly_win": ev * hands_per_hour,
+        "hourly_sd": sd * math.sqrt(hands_per_hour),
+        "risk_of_ruin": ruin,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def sweep_iter(points, num_games=100_000, seed=None, num_workers=None, bankroll=SWEEP_BANKROLL,
+               hands_per_hour=HANDS_PER_HOUR):
+    """Simulate every point across a process pool, yielding summary rows as points finish.
+
+    Rows come back in completion order; "index" is the point's position in
+    points. Every point plays from the same seed, so points that differ only in
+    the bet ramp or insurance threshold see the same shoes and their
+    differences are not swamped by luck. Risk of ruin is the diffusion estimate
+    exp(-2 * EV * bankroll / SD^2) for play without end.
+    """
+    for point in points:
+        validate_point(point)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    jobs = [(i, point, num_games, seed, bankroll, hands_per_hour) for i, point in enumerate(points)]
+    compiled = STRATEGY_REGISTRY.compiled()
+    workers = min(num_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            yield _run_point(job)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(compiled.table, STRATEGY_REGISTRY.version))
+    try:
+        futures = [pool.submit(_run_point, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # a consumer that stops early (e.g. a closed stream) does not wait for the rest
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    import csv
+    import json
+    parser = argparse.ArgumentParser(description="Sweep simulation parameters across a process pool")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--grid", help='JSON grid, e.g. \'{"num_decks": [2, 6, 8], "penetration": [0.7, 0.8]}\'')
+    source.add_argument("--points", help="JSON file holding a list of points")
+    parser.add_argument("--hands", type=int, default=100_000, help="hands per point")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bankroll", type=float, default=SWEEP_BANKROLL)
+    parser.add_argument("--out", default="sweep.csv", help="CSV written row by row as points finish")
+    args = parser.parse_args()
+
+    if args.grid:
+        points = expand_grid(json.loads(args.grid))
+    else:
+        with open(args.points) as f:
+            points = json.load(f)
+    names = [name for name in SWEEP_PARAMETERS if any(name in point for point in points)]
+    with open(args.out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["index", *names, *SWEEP_METRICS])
+        writer.writeheader()
+        for done, row in enumerate(sweep_iter(points, args.hands, seed=args.seed, num_workers=args.workers,
+                                              bankroll=args.bankroll), start=1):
+            writer.writerow({k: json.dumps(v) if isinstance(v, (list, dict)) else v for k, v in row.items()})
+            f.flush()
+            print(f"[sweep] {done}/{len(points)} point {row['index']}: EV/hand {row['ev_per_hand']:+.4f}, "
+                  f"RoR {row['risk_of_ruin']:.3f}")
@@ -0,0 +1,152 @@
+from bj import Game, Shoe, DEFAULT_PENETRATION, HAND_RESERVE
+from auto import (AutoGame, STRATEGY_REGISTRY, _tcc_slot, _with_overrides, _strategy_slot,
+                  _bet_multiple, _insurance_profit)
+from counting import ShoeCounter, get_systems, DEFAULT_SYSTEM
+from precision import PrecisionTracker
+from results import ResultColumns, SEAT_COLUMNS, SHUFFLE_COLUMNS
+from rng import make_rng
+
+MAX_SEATS = 7
+# What a seat may set; everything else about the table (shoe, rules, count) is shared
+SEAT_OPTIONS = ("name", "bet_amount", "balance", "bet_ramp", "strategy_overrides", "insurance_threshold",
+                "use_base_strategy_only")
+SEAT_DEFAULTS = {"bet_amount": 1, "balance": 1000, "bet_ramp": None, "strategy_overrides": None,
+                 "insurance_threshold": None, "use_base_strategy_only": False}
+MAX_SPLITS = 4
+
+
+def validate_seats(seats):
+    """Raise ValueError for a table the simulator would reject."""
+    if not 1 <= len(seats) <= MAX_SEATS:
+        raise ValueError(f"A table has between 1 and {MAX_SEATS} seats")
+    for k, seat in enumerate(seats):
+        unknown = set(seat) - set(SEAT_OPTIONS)
+        if unknown:
+            raise ValueError(f"Seat {k}: unknown option(s) {', '.join(sorted(unknown))}")
+        if seat.get("bet_amount", SEAT_DEFAULTS["bet_amount"]) <= 0:
+            raise ValueError(f"Seat {k}: bet_amount must be positive")
+        if seat.get("bet_ramp") is not None and len(seat["bet_ramp"]) != 11:
+            raise ValueError(f"Seat {k}: bet_ramp needs 11 multipliers")
+
+
+def table_iter(seats, num_rounds=1000, num_decks=8, penetration=DEFAULT_PENETRATION, burn_cards=0,
+               counting_system=DEFAULT_SYSTEM, seed=None, rng=None, cancel_event=None):
+    """Play a table of 1-7 seats against one dealer from one shoe, yielding a row
+    (results.SEAT_COLUMNS) for every seat that bets in a round.
+
+    seats is a list of dicts with any of SEAT_OPTIONS: every seat has its own
+    bet ramp, strategy and bankroll, and bets on the table's count. Seats are
+    dealt and played in order, then the dealer draws once for all of them. A
+    seat whose ramp gives 0 sits the round out; when every seat does, the table
+    leaves and the shoe is reshuffled, as a single player leaves in
+    auto_play_iter. A broke seat stays out. A round is only dealt from a shoe
+    holding HAND_RESERVE cards per seat and the dealer; otherwise it is
+    reshuffled first. One seat plays exactly the hands auto_play_iter plays
+    with the same options and seed.
+
+    The return value (StopIteration.value) summarizes the run: rounds played,
+    shuffles (hand = rounds played), why it stopped and, per seat, hands, final
+    balance, profit and EV per hand and per unit wagered with its standard error.
+    """
+    validate_seats(seats)
+    seats = [{**SEAT_DEFAULTS, **seat} for seat in seats]
+    deck = Shoe(num_decks, rng=make_rng(seed, rng), penetration=penetration, burn_cards=burn_cards)
+    deck.shuffle()
+    counter = ShoeCounter(deck, get_systems([counting_system])) if counting_system != DEFAULT_SYSTEM else None
+    reshuffle = counter.shuffle if counter is not None else deck.shuffle
+    shoe_size = deck.size
+    compiled = STRATEGY_REGISTRY.compiled()
+    tables = [_with_overrides(compiled, seat["strategy_overrides"]) for seat in seats]
+    balances = [seat["balance"] for seat in seats]
+    trackers = [PrecisionTracker() for _ in seats]
+    shuffles = ResultColumns(capacity=64, columns=SHUFFLE_COLUMNS)
+    shoe_profit = 0
+    rounds = 0
+    stopped = "rounds"
+
+    for r in range(num_rounds):
+        if cancel_event is not None and cancel_event.is_set():
+            stopped = "cancelled"
+            break
+        if all(balance <= 0 for balance in balances):
+            stopped = "bankroll"
+            break
+        rounds = r + 1
+
+        cards_left = deck.cards_remaining()
+        # a full table can need more cards than sit behind the cut card: keep HAND_RESERVE per hand
+        seated = sum(1 for balance in balances if balance > 0)
+        if deck.pos > deck.burn_cards and cards_left < HAND_RESERVE * (seated + 1):
+            shuffles.append({"hand": r, "shoe_profit": shoe_profit, "cards_dealt": shoe_size - cards_left})
+            reshuffle()
+            shoe_profit = 0
+            cards_left = deck.cards_remaining()
+        if counter is None:
+            true_count = bet_count = deck.true_count
+        else:
+            true_count = float(counter.true_counts()[0])
+            bet_count = float(counter.true_counts(betting=True)[0])
+        tcc_slot = _tcc_slot(true_count)
+        bet_slot = tcc_slot if bet_count == true_count else _tcc_slot(bet_count)
+
+        playing, bets, room, strategies = [], [], [], []
+        for k, seat in enumerate(seats):
+            if balances[k] <= 0:
+                continue
+            bet = min(seat["bet_amount"] * _bet_multiple(seat["bet_ramp"], bet_slot, bet_count), balances[k])
+            if bet == 0:
+                continue
+            playing.append(k)
+            bets.append(bet)
+            room.append(balances[k] - bet)
+            slot = _strategy_slot(true_count, tcc_slot, seat["strategy_overrides"], seat["use_base_strategy_only"])
+            strategies.append(tables[k].buckets[slot])
+
+        if not playing:
+            shuffles.append({"hand": r, "shoe_profit": shoe_profit, "cards_dealt": shoe_size - cards_left})
+            reshuffle()
+            shoe_profit = 0
+            continue
+
+        game = deck.new_game(len(seats))
+        results = AutoGame.played_table(game, playing, bets, room, strategies, MAX_SPLITS)
+        for k, bet, result in zip(playing, bets, results):
+            profit = Game.interpret_result(result) + _insurance_profit(game, bet, true_count,
+                                                                       seats[k]["insurance_threshold"])
+            wagered = sum(b for _, b in result) if isinstance(result, list) else result[1]
+            balances[k] += profit
+            shoe_profit += profit
+            trackers[k].add(profit, wagered)
+            yield {"round": r + 1, "seat": k, "balance": balances[k], "bet": wagered, "profit": profit,
+                   "true_count": true_count}
+        game.end_game()
+
+        if deck.cut_card_reached():
+            cards_left = deck.cards_remaining()
+            shuffles.append({"hand": r + 1, "shoe_profit": shoe_profit, "cards_dealt": shoe_size - cards_left})
+            reshuffle()
+            shoe_profit = 0
+
+    return {
+        "rounds": rounds,
+        "shuffles": shuffles.to_lists(),
+        "cancelled": stopped == "cancelled",
+        "stopped": stopped,
+        "seats": [{
+            "seat": k,
+            "name": seat.get("name") or f"seat_{k}",
+            "hands": tracker.hands,
+            "final_balance": balances[k],
+            "total_profit": tracker.profit,
+            "total_wagered": tracker.wagered,
+            "ev_per_hand": tracker.profit / tracker.hands if tracker.hands else 0.0,
+            **tracker.snapshot(),
+        } for k, (seat, tracker) in enumerate(zip(seats, trackers))],
+    }
+
+
+def play_table(seats, **options):
+    """Drain table_iter; returns (ResultColumns of SEAT_COLUMNS, summary)."""
+    columns = ResultColumns(columns=SEAT_COLUMNS)
+    summary = AutoGame.drain(table_iter(seats, **options), columns.append)
+    return columns, summary
@@ -0,0 +1,60 @@
+import sys
+sys.path.insert(0, '.')
+import random
+from auto import STRATEGY_REGISTRY, _TCC_BASE_SLOT
+from analysis import HouseEdgeCalculator
+from dealer import DEALER_PROBABILITIES, shoe_composition, RANK_LABELS
+from bj import Card, DealerHand, RANKS, SUITS
+
+block = STRATEGY_REGISTRY.compiled().table[_TCC_BASE_SLOT]
+
+print('=== Test 1: dealer distributions are probabilities ===')
+shoe = shoe_composition(1)
+for up in range(10):
+    comp = shoe[:up] + (shoe[up] - 1,) + shoe[up + 1:]
+    dist = DEALER_PROBABILITIES.distribution(comp, up)
+    assert abs(sum(dist) - 1) < 1e-12, (up, dist)
+print('  PASS\n')
+
+print('=== Test 2: dealer odds match DealerHand.should_hit played out on a real shoe ===')
+rng = random.Random(4)
+up_rank = RANK_LABELS.index('6')
+comp = shoe[:up_rank] + (shoe[up_rank] - 1,) + shoe[up_rank + 1:]
+expected = DEALER_PROBABILITIES.distribution(comp, up_rank)
+upcard = Card('6', '♤')
+rest = [Card(rank, suit) for rank in RANKS for suit in SUITS if (rank, suit) != ('6', '♤')]
+counts = [0] * 6
+trials = 40000
+for _ in range(trials):
+    rng.shuffle(rest)
+    dealer = DealerHand()
+    dealer.draw_card(upcard)
+    drawn = iter(rest)
+    while dealer.should_hit():
+        dealer.draw_card(next(drawn))
+    value = dealer.get_value()
+    counts[5 if value > 21 else value - 17] += 1
+for k in range(6):
+    assert abs(counts[k] / trials - expected[k]) < 0.01, (k, counts[k] / trials, expected[k])
+print('  PASS\n')
+
+print('=== Test 3: game EV is consistent across modes and deck counts ===')
+fast = HouseEdgeCalculator(block, num_decks=8).analyze()
+exact = HouseEdgeCalculator(block, num_decks=8, exact=True).analyze()
+assert abs(fast['ev'] - exact['ev']) < 1e-4, (fast['ev'], exact['ev'])
+assert abs(sum(h['probability'] for h in fast['hands']) - 1) < 1e-9
+one_deck = HouseEdgeCalculator(block, num_decks=1).analyze()
+assert one_deck['ev'] > fast['ev'], 'Fewer decks should favour the player'
+# a simulated house edge of this table at 8 decks (1M hands) is about 0.15% +- 0.12%
+assert 0.0 < fast['house_edge_pct'] < 0.6, fast['house_edge_pct']
+print('  PASS\n')
+
+print('=== Test 4: blackjack and obvious hands ===')
+hands = {(h['player'], h['upcard']): h for h in fast['hands']}
+assert hands[('A,T', '6')]['action'] == 'bj' and abs(hands[('A,T', '6')]['ev'] - 1.5) < 1e-12
+assert hands[('A,T', 'A')]['ev'] < 1.5
+assert hands[('T,T', '6')]['ev'] > 0.6 and hands[('6,T', 'T')]['ev'] < -0.5
+assert hands[('8,8', '9')]['action'] == 'v'
+print('  PASS\n')
+
+print('=== All analysis tests PASSED ===')
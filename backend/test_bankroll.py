@@ -0,0 +1,63 @@
+import sys
+sys.path.insert(0, '.')
+import numpy as np
+from bankroll import BankrollModel, default_ramp
+from auto import _TCC_BASE_SLOT
+
+print('=== Test 1: calibration keeps whole shoes and the count they were bet on ===')
+model = BankrollModel.calibrate(60, num_decks=6, seed=8, num_workers=1, shard_shoes=20)
+assert model.shoe_lengths.sum() == len(model.units) == len(model.slots) and len(model.shoe_lengths) == 60
+assert (model.slots[model.shoe_starts] == _TCC_BASE_SLOT).all()     # every shoe starts at a count of 0
+assert (model.units * 2 == np.round(model.units * 2)).all() and np.abs(model.units).max() <= 8   # unit bets, 3:2 blackjacks
+pooled = BankrollModel.calibrate(60, num_decks=6, seed=8, num_workers=2, shard_shoes=20)
+assert (pooled.units == model.units).all() and (pooled.slots == model.slots).all()
+print('  PASS\n')
+
+print('=== Test 2: trajectories follow the resampled shoes exactly ===')
+model = BankrollModel.calibrate(300, seed=1, num_workers=1)
+ramp = default_ramp()
+result = model.simulate(10**9, ramp, bet_amount=10, num_hands=3000, num_trajectories=1, seed=5)
+rng = np.random.default_rng(5)
+profit = 10 * np.asarray(ramp, dtype=float)[model.slots] * model.units
+path, played = [], 0
+while played < 3000:
+    shoe = rng.integers(len(model.shoe_lengths), size=1)[0]
+    start = model.shoe_starts[shoe]
+    take = min(model.shoe_lengths[shoe], 3000 - played)
+    path.extend(profit[start:start + take])
+    played += take
+balance = 10**9 + np.cumsum(path)
+drawdown = (np.maximum.accumulate(np.concatenate(([10**9], balance)))[1:] - balance).max()
+assert abs(result['final_bankroll']['mean'] - balance[-1]) < 1e-6
+assert abs(result['max_drawdown']['p50'] - max(drawdown, 0)) < 1e-6
+print('  PASS\n')
+
+print('=== Test 3: scaling the bankroll with the bets scales every trajectory ===')
+one = model.simulate(2000, ramp, bet_amount=10, num_hands=20000, num_trajectories=2000, seed=3)
+two = model.simulate(4000, ramp, bet_amount=20, num_hands=20000, num_trajectories=2000, seed=3)
+assert one['risk_of_ruin'] == two['risk_of_ruin'] and 0 < one['risk_of_ruin'] < 1
+assert abs(2 * one['final_bankroll']['mean'] - two['final_bankroll']['mean']) < 1e-6
+# with a bankroll that cannot be lost, the mean result is the ramp's EV per hand
+rich = model.simulate(10**9, ramp, bet_amount=10, num_hands=20000, num_trajectories=2000, seed=3)
+se = rich['sd_per_hand'] * np.sqrt(20000 / 2000)
+assert rich['risk_of_ruin'] == 0
+assert abs(rich['final_bankroll']['mean'] - 10**9 - 20000 * rich['ev_per_hand']) < 4 * se
+print('  PASS\n')
+
+print('=== Test 4: sessions stop at the stop-loss or the win goal ===')
+flat = [1] * 11
+result = model.simulate(1000, flat, bet_amount=10, num_hands=400, num_trajectories=5000,
+                        stop_loss=200, win_goal=150, seed=4)
+outcomes = result['outcomes']
+assert abs(sum(outcomes.values()) - 1) < 1e-12 and outcomes['stop_loss'] > 0 and outcomes['win_goal'] > 0
+assert result['final_bankroll']['p5'] <= 800 and result['final_bankroll']['p95'] >= 1150
+assert result['hands_to_ruin']['p90'] <= 400
+print(f"  {outcomes}")
+try:
+    model.simulate(1000, [0] * 11)
+    assert False, 'a ramp that never bets cannot be simulated'
+except ValueError:
+    pass
+print('  PASS\n')
+
+print('=== All bankroll tests PASSED ===')
@@ -0,0 +1,47 @@
+import sys
+sys.path.insert(0, '.')
+import os
+import shutil
+import tempfile
+import time
+from cache import ResultCache, cache_key
+
+print('=== Test 1: cache keys are canonical and content-addressed ===')
+a = cache_key("simulate", {"num_games": 10, "seed": 1, "bet_ramp": [1, 2]}, "v1")
+b = cache_key("simulate", {"bet_ramp": [1, 2], "seed": 1, "num_games": 10}, "v1")
+assert a == b, 'Key order must not matter'
+assert a != cache_key("simulate", {"num_games": 10, "seed": 2, "bet_ramp": [1, 2]}, "v1")
+assert a != cache_key("simulate", {"num_games": 10, "seed": 1, "bet_ramp": [1, 2]}, "v2")
+assert a != cache_key("simulate-batch", {"num_games": 10, "seed": 1, "bet_ramp": [1, 2]}, "v1")
+print('  PASS\n')
+
+print('=== Test 2: memory tier evicts least recently used entries past the byte budget ===')
+cache = ResultCache(max_bytes=300, disk_dir=None)
+cache.put("a", {"body": b"x" * 100})
+cache.put("b", {"body": b"x" * 100})
+cache.put("c", {"body": b"x" * 100})
+assert cache.get("a") is not None     # a is now most recently used
+cache.put("d", {"body": b"x" * 100})
+assert cache.get("b") is None, 'b should have been evicted'
+assert cache.get("a") is not None and cache.get("d") is not None
+assert cache.bytes_used <= 300
+cache.put("huge", {"body": b"x" * 1000})
+assert cache.get("huge") is None and cache.get("a") is not None, 'Oversized entries are not kept in memory'
+stats = cache.stats()
+assert stats["hits"] == 4 and stats["misses"] == 2, stats
+print('  PASS\n')
+
+print('=== Test 3: disk tier survives a restart and expires after the TTL ===')
+tmp = tempfile.mkdtemp()
+first = ResultCache(max_bytes=1000, disk_dir=tmp, ttl=60)
+first.put("k", {"body": b'{"x":1}', "results.parquet": b"PAR1"})
+second = ResultCache(max_bytes=1000, disk_dir=tmp, ttl=60)
+assert second.get("k") == {"body": b'{"x":1}', "results.parquet": b"PAR1"}
+old = time.time() - 120
+os.utime(os.path.join(tmp, "k"), (old, old))
+third = ResultCache(max_bytes=1000, disk_dir=tmp, ttl=60)
+assert third.get("k") is None and not os.path.exists(os.path.join(tmp, "k"))
+shutil.rmtree(tmp)
+print('  PASS\n')
+
+print('=== All cache tests PASSED ===')
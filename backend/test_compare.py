@@ -0,0 +1,60 @@
+import sys
+sys.path.insert(0, '.')
+from compare import compare_configs
+from auto import AutoGame
+from rng import spawn_seeds
+
+FLAT = [1.0] * 11
+
+print('=== Test 1: identical configurations differ by exactly zero ===')
+result = compare_configs([{}, {"name": "same"}], num_shoes=40, seed=4, num_decks=6)
+diff = result['differences'][0]
+assert result['shoes'] == 40
+assert result['configs'][0]['hands'] == result['configs'][1]['hands']
+assert diff['ev_per_hand'] == 0 and diff['ev_per_hand_se'] == 0
+print('  PASS\n')
+
+print('=== Test 2: every configuration sees the same shoes ===')
+# doubling every bet with an unlimited bankroll plays the same hands for twice the money
+result = compare_configs([{"bet_ramp": FLAT}, {"bet_ramp": [2.0] * 11}], num_shoes=40, seed=9)
+one, two = result['configs']
+assert one['hands'] == two['hands']
+assert two['total_profit'] == 2 * one['total_profit'] and two['total_wagered'] == 2 * one['total_wagered']
+assert abs(result['differences'][0]['ev_per_unit']) < 1e-12
+# num_shoes stops a run after whole shoes
+rows = AutoGame.auto_play_iter(num_games=10**9, num_shoes=3, balance=float('inf'), seed=9,
+                               input_func=lambda *a, **k: None, output_func=lambda *a, **k: None)
+_, summary = AutoGame.collect(rows)
+assert len(summary['shuffles']['hand']) == 3
+print('  PASS\n')
+
+print('=== Test 3: pairing removes most of the noise ===')
+result = compare_configs([{"name": "deviations"}, {"name": "basic", "use_base_strategy_only": True}],
+                         num_shoes=300, seed=1)
+diff = result['differences'][0]
+print(f"  difference {diff['ev_per_unit']:+.5f} +/- {diff['ev_per_unit_se']:.5f}, "
+      f"variance reduction {diff['ev_per_unit_variance_reduction']:.1f}x")
+assert diff['ev_per_unit_variance_reduction'] > 5
+print('  PASS\n')
+
+print('=== Test 4: seeded comparisons do not depend on the worker count ===')
+configs = [{"bet_ramp": FLAT}, {"use_base_strategy_only": True}]
+serial = compare_configs(configs, num_shoes=30, seed=2, num_workers=1, shard_shoes=10)
+pooled = compare_configs(configs, num_shoes=30, seed=2, num_workers=2, shard_shoes=10)
+assert serial == pooled
+print('  PASS\n')
+
+print('=== Test 5: a ramp that leaves the table counts only the hands played ===')
+WONG_OUT = [12, 10, 8, 6, 4, 2, 1, 1, 0, 0, 0]
+result = compare_configs([{"bet_ramp": FLAT}, {"bet_ramp": WONG_OUT}], num_shoes=60, seed=3, num_decks=6)
+flat, wong = result['configs']
+# one shard: the comparison plays the shard's seed
+rows = AutoGame.auto_play_iter(num_games=10**9, num_shoes=60, balance=float('inf'), seed=spawn_seeds(3, 1)[0],
+                               num_decks=6, bet_ramp=WONG_OUT, input_func=lambda *a, **k: None,
+                               output_func=lambda *a, **k: None)
+columns, summary = AutoGame.collect(rows)
+assert wong['hands'] == len(columns) < flat['hands']
+assert abs(wong['total_wagered'] - columns.column('bet').sum()) < 1e-9
+print('  PASS\n')
+
+print('=== All compare tests PASSED ===')
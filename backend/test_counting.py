@@ -0,0 +1,100 @@
+import sys
+sys.path.insert(0, '.')
+import random
+import numpy as np
+from bj import Shoe, CARD_TABLE
+from counting import SYSTEMS, ShoeCounter, SystemComparison, get_systems
+from auto import AutoGame
+
+quiet = lambda *a, **k: None
+RAMP = [12, 12, 10, 8, 6, 4, 2, 1, 1, 1, 1]
+
+
+def run(**kwargs):
+    return AutoGame.auto_play_loop(balance=10**12, bet_amount=1, input_func=quiet, output_func=quiet,
+                                   return_as_json=True, save_results=False, **kwargs)
+
+
+print('=== Test 1: system definitions ===')
+assert [s.balanced for s in SYSTEMS.values()] == [True, False, True, True, True]
+assert abs(SYSTEMS['ko'].drift_per_card - 1 / 13) < 1e-12
+assert SYSTEMS['hi_lo'].scale == 1.0 and SYSTEMS['zen'].scale > 1.5
+# published betting correlations (Hi-Opt II and Omega II with the ace side count)
+for name, bc in (('hi_lo', 0.97), ('ko', 0.98), ('hi_opt_2', 0.98), ('omega_2', 0.99), ('zen', 0.96)):
+    assert abs(SYSTEMS[name].betting_correlation - bc) < 0.01, (name, SYSTEMS[name].betting_correlation)
+try:
+    get_systems(['hi_lo', 'wong_halves'])
+    assert False, "Should raise ValueError"
+except ValueError:
+    pass
+print('  PASS\n')
+
+print('=== Test 2: counts read at the cursor match a recount of the dealt cards ===')
+systems = list(SYSTEMS.values())
+shoe = Shoe(6, rng=random.Random(11))
+counter = ShoeCounter(shoe, systems)
+for _ in range(3):
+    counter.shuffle()
+    dealt = []
+    while shoe.cards_remaining() > 1:
+        rc = [sum(int(s.tags[code % 13]) for code in dealt) for s in systems]
+        assert list(counter.running_counts()) == rc
+        decks_left = shoe.cards_remaining() / 52
+        aces_surplus = len(dealt) / 13 - sum(1 for code in dealt if CARD_TABLE[code].rank == 'A')
+        for k, s in enumerate(systems):
+            playing = (rc[k] - s.drift_per_card * len(dealt)) / decks_left / s.scale
+            betting = playing + s.ace_weight * aces_surplus / decks_left / s.scale
+            assert abs(counter.true_counts()[k] - playing) < 1e-9
+            assert abs(counter.true_counts(betting=True)[k] - betting) < 1e-9
+        assert counter.running_counts()[0] == shoe.running_count
+        assert counter.true_counts()[0] == shoe.true_count
+        dealt.append(shoe.deal_code())
+print('  PASS\n')
+
+print('=== Test 3: one Hi-Lo run scores every system without changing its hands ===')
+plain = run(num_games=20000, seed=5, bet_ramp=RAMP)
+scored = run(num_games=20000, seed=5, bet_ramp=RAMP, compare_systems=list(SYSTEMS))
+assert scored['results'] == plain['results'] and plain['counting'] == {'system': 'hi_lo', 'systems': []}
+rows = scored['counting']['systems']
+assert [row['system'] for row in rows] == list(SYSTEMS)
+# Hi-Lo re-weighted by its own ramp is the run itself
+assert abs(rows[0]['ev_per_unit'] - scored['precision']['ev_per_unit']) < 1e-9
+for row in rows:
+    assert row['ev_per_unit_se'] > 0 and -1 < row['result_correlation'] < 1
+    print(f"  {row['label']:<10} BC {row['betting_correlation']:.3f}  "
+          f"EV/unit {row['ev_per_unit']:+.4f} +/- {row['ev_per_unit_se']:.4f}")
+print('  PASS\n')
+
+print('=== Test 4: block reduction matches direct sums ===')
+rng = np.random.default_rng(2)
+tc = rng.normal(size=(10000, 2))
+result = rng.choice([-1.0, 0.0, 1.0, 1.5], size=10000)
+comparison = SystemComparison(get_systems(['hi_lo', 'ko']), lambda tcs: np.where(tcs > 1, 4.0, 1.0))
+for k in range(10000):
+    comparison.add(tc[k], result[k], 1.0)
+summary = comparison.summary()
+mults = np.where(tc > 1, 4.0, 1.0)
+for k, row in enumerate(summary):
+    assert abs(row['ev_per_unit'] - (mults[:, k] * result).sum() / mults[:, k].sum()) < 1e-12
+    assert abs(row['result_correlation'] - np.corrcoef(tc[:, k], result)[0, 1]) < 1e-9
+print('  PASS\n')
+
+print('=== Test 5: another system can drive bets and strategy ===')
+zen = run(num_games=5000, seed=5, bet_ramp=RAMP, counting_system='zen')
+assert zen['results'] == run(num_games=5000, seed=5, bet_ramp=RAMP, counting_system='zen')['results']
+assert [r['bet'] for r in zen['results']] != [r['bet'] for r in plain['results'][:5000]]
+assert zen['counting']['system'] == 'zen'
+try:
+    AutoGame.parallel_auto_play_loop(num_games=10, compare_systems=['ko'], save_results=False)
+    assert False, "Should raise ValueError"
+except ValueError:
+    pass
+print('  PASS\n')
+
+print('=== Test 6: comparing the default system alone ===')
+alone = run(num_games=5000, seed=5, bet_ramp=RAMP, compare_systems=['hi_lo'])
+assert alone['results'] == plain['results'][:5000]
+assert [row['system'] for row in alone['counting']['systems']] == ['hi_lo']
+print('  PASS\n')
+
+print('=== All counting tests PASSED ===')
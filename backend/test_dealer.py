@@ -0,0 +1,71 @@
+import sys
+sys.path.insert(0, '.')
+import time
+from dealer import (DealerProbabilities, Composition, composition_signature, shoe_composition,
+                    ACE, TEN, BLACKJACK, RANK_INDEX)
+from bj import Shoe
+from rng import make_rng
+
+print('=== Test 1: incremental removal keeps the signature in step ===')
+comp = Composition.full_shoe(8)
+shoe = Shoe(8, rng=make_rng(5))
+shoe.shuffle()
+for _ in range(300):
+    comp.remove_card(shoe.deal_card())
+    assert comp.signature == composition_signature(comp.counts)
+assert comp.total == shoe.cards_remaining()
+counts = [0] * 10
+for card in shoe.cards:
+    counts[RANK_INDEX[card.rank]] += 1
+assert comp.counts == counts
+print('  PASS\n')
+
+print('=== Test 2: blackjack conditioning is consistent ===')
+dealer = DealerProbabilities()
+full = shoe_composition(6)
+for up in (ACE, TEN, 5):
+    rest = Composition(full)
+    rest.remove(up)
+    free = dealer.distribution(rest, up, no_blackjack=False)
+    peeked = dealer.distribution(rest, up)
+    p_bj = dealer.blackjack_probability(rest, up)
+    assert abs(sum(free) - 1) < 1e-12 and abs(sum(peeked) - 1) < 1e-12
+    assert abs(free[BLACKJACK] - p_bj) < 1e-12 and peeked[BLACKJACK] == 0
+    for k in range(6):
+        assert abs(free[k] - (1 - p_bj) * peeked[k]) < 1e-12
+# a ten-rich shoe makes insurance worth taking
+rich = Composition([4, 4, 4, 4, 4, 4, 4, 4, 4, 30])
+assert dealer.insurance_ev(rich) > 0 and dealer.insurance_ev(Composition(full)) < 0
+print('  PASS\n')
+
+print('=== Test 3: warm queries take microseconds and the LRU stays bounded ===')
+small = DealerProbabilities(max_entries=20)
+comp = Composition.full_shoe(8)
+comp.remove(TEN)
+small.distribution(comp, TEN)
+start = time.perf_counter()
+for _ in range(10000):
+    small.distribution(comp, TEN)
+per_query = (time.perf_counter() - start) / 10000
+assert per_query < 20e-6, f'{per_query * 1e6:.1f}us per warm query'
+for rank in range(10):
+    comp.remove(rank)
+    for up in range(10):
+        small.distribution(comp, up)
+assert small.stats()['entries'] == 20
+print(f'  warm query: {per_query * 1e6:.2f}us')
+print('  PASS\n')
+
+print('=== Test 4: the shared dealer states stay bounded ===')
+bounded = DealerProbabilities(state_limit=500)
+unbounded = DealerProbabilities(state_limit=10**9)
+comp = Composition.full_shoe(2)
+for rank in (TEN, 4, TEN, 2, 7, TEN, 0, 5):
+    comp.remove(rank)
+    for up in range(10):
+        assert bounded.distribution(comp, up) == unbounded.distribution(comp, up)
+        assert bounded.stats()['states'] <= 500
+assert unbounded.stats()['states'] > 2000
+print('  PASS\n')
+
+print('=== All dealer tests PASSED ===')
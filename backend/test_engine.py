@@ -1,4 +1,4 @@
-from engine import simulate_hand, simulate_many
+from engine import simulate_hand, simulate_many, simulate_many_batch
 
 # Run once with no seed (random)
 result = simulate_hand()
@@ -29,4 +29,27 @@ try:
     simulate_many(0)
     assert False, "Should raise ValueError"
 except ValueError:
-    pass
\ No newline at end of file
+    pass
+
+# Batch engine: same aggregate shape, reproducible with a seed
+batch = simulate_many_batch(200000, seed=7)
+print("\nBatch engine (200k, seeded):")
+print(batch)
+assert batch['total_hands'] == 200000
+assert batch['wins'] + batch['losses'] + batch['pushes'] == 200000
+assert set(batch) == set(many_result)
+assert simulate_many_batch(1000, seed=3)['wins'] == simulate_many_batch(1000, seed=3)['wins']
+
+# Batch engine agrees statistically with the scalar path
+scalar = simulate_many(20000, seed=7)
+for key in ('wins', 'losses', 'pushes', 'player_busts', 'dealer_busts', 'player_blackjacks'):
+    p_batch = batch[key] / batch['total_hands']
+    p_scalar = scalar[key] / scalar['total_hands']
+    se = (p_batch * (1 - p_batch) / scalar['total_hands']) ** 0.5
+    assert abs(p_batch - p_scalar) < 5 * se + 1e-9, (key, p_batch, p_scalar)
+
+try:
+    simulate_many_batch(0)
+    assert False, "Should raise ValueError"
+except ValueError:
+    pass
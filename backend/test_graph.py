@@ -0,0 +1,66 @@
+import sys
+sys.path.insert(0, '.')
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from graph import SimGraph, minmax_downsample, envelope_downsample
+
+print('=== Test 1: min/max downsampling keeps endpoints and extremes ===')
+rng = np.random.default_rng(3)
+balance = 1000 + np.cumsum(rng.choice([-10.0, 10.0], size=1_000_003))
+keep = minmax_downsample(balance, 2000)
+assert len(keep) <= 4 * 2000 and np.all(np.diff(keep) > 0)
+assert keep[0] == 0 and keep[-1] == len(balance) - 1
+assert balance[keep].min() == balance.min() and balance[keep].max() == balance.max()
+small = np.arange(50.0)
+assert (minmax_downsample(small, 2000) == np.arange(50)).all(), 'Short series are not downsampled'
+print('  PASS\n')
+
+print('=== Test 2: envelope bars cover every bar of their bucket ===')
+tcc = rng.normal(0, 3, size=100_000)
+x, low, high = envelope_downsample(np.arange(100_000), tcc, 1000)
+assert len(x) == 1000
+assert low.min() == min(tcc.min(), 0) and high.max() == max(tcc.max(), 0)
+assert (low <= 0).all() and (high >= 0).all()
+print('  PASS\n')
+
+print('=== Test 3: vectorized shuffle detection matches the row loop ===')
+cc = rng.integers(-12, 13, size=20_000)
+df = pd.DataFrame({"hand": np.arange(1, 20_001), "card_count": cc})
+expected = [int(df["hand"][i]) for i in range(1, len(cc)) if abs(cc[i]) <= 2 and abs(cc[i - 1]) > 5]
+assert SimGraph._detect_shuffles(df) == expected
+print('  PASS\n')
+
+print('=== Test 4: large runs render through the downsampled path ===')
+tmp = tempfile.mkdtemp()
+n = 200_000
+results = os.path.join(tmp, "results.csv")
+pd.DataFrame({"hand": np.arange(1, n + 1), "balance": balance[:n], "card_count": cc.repeat(10),
+              "true_count": tcc.repeat(2), "bet": 10.0}).to_csv(results, index=False)
+out = os.path.join(tmp, "graph.png")
+SimGraph(results_path=results, output_path=out).generate()
+assert os.path.getsize(out) > 0
+print('  PASS\n')
+
+print('=== Test 5: GraphStore renders lazily, once per run ===')
+import pyarrow as pa
+import pyarrow.parquet as pq
+from graph import GraphStore
+parquet = os.path.join(tmp, "results.parquet")
+pq.write_table(pa.table({"hand": np.arange(1, 501), "balance": balance[:500], "card_count": cc[:500],
+                         "true_count": tcc[:500], "bet": np.full(500, 10.0)}), parquet)
+store = GraphStore(max_runs=2)
+with open(parquet, "rb") as f:
+    data = f.read()
+store.register("a", data)
+assert store._runs["a"]["png"] is None, 'Registering must not render'
+png = store.png()
+assert png.startswith(b"\x89PNG") and store.png("a") is png
+store.register("b", data)
+store.register("c", data)
+assert store.png("a") is None and store.latest == "c", 'Oldest run should be evicted'
+assert store.results() is data and store.results("a") is None
+print('  PASS\n')
+
+print('=== All graph tests PASSED ===')
@@ -0,0 +1,147 @@
+import sys
+sys.path.insert(0, '.')
+import random
+from bj import (Card, PlayerHand, DealerHand, Deck, Shoe, HI_LO_TAGS, RANKS, SUITS, MIN_CUT_CARDS,
+                max_penetration, validate_shoe)
+from auto import AutoGame
+from counting import SYSTEMS, ShoeCounter
+
+
+def rescan(cards):
+    total = sum(c.get_value() for c in cards)
+    aces = sum(1 for c in cards if c.rank == 'A')
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total, aces > 0
+
+
+print('=== Test 1: running totals match a full rescan ===')
+rng = random.Random(7)
+for _ in range(20000):
+    hand = PlayerHand()
+    for _ in range(rng.randint(1, 7)):
+        hand.draw_card(Card(rng.choice(RANKS), rng.choice(SUITS)))
+        total, soft = rescan(hand.cards)
+        assert hand.get_value() == total, (hand.get_cards(), hand.get_value(), total)
+        assert hand.has_soft_ace() == soft, hand.get_cards()
+        assert hand.is_busted() == (total > 21)
+print('  PASS\n')
+
+print('=== Test 2: blackjack / can_split from running state ===')
+hand = PlayerHand()
+hand.draw_card(Card('A', '♤'))
+hand.draw_card(Card('K', '♡'))
+assert hand.blackjack() and not hand.can_split()
+hand.draw_card(Card('2', '♡'))
+assert not hand.blackjack()
+pair = PlayerHand()
+pair.draw_card(Card('A', '♤'))
+pair.draw_card(Card('A', '♢'))
+assert pair.can_split() and not pair.blackjack() and pair.get_value() == 12
+print('  PASS\n')
+
+print('=== Test 3: deal_split keeps both hands consistent ===')
+for _ in range(2000):
+    shoe = Shoe(2)
+    shoe.shuffle()
+    game = shoe.new_game()
+    game.deal_initial()
+    hand = game.player_hands[0]
+    hand.clear()
+    hand.draw_card(Card('8', '♤'))
+    hand.draw_card(Card('8', '♡'))
+    game.deal_split(0)
+    for h in game.player_hands:
+        assert h.num_cards() == 2
+        assert (h.get_value(), h.has_soft_ace()) == rescan(h.cards)
+    assert isinstance(game.dealer_hand, DealerHand)
+print('  PASS\n')
+
+print('=== Test 4: running count kept at deal time matches a recount ===')
+for deck in (Shoe(6, rng=random.Random(3)), Deck(6, rng=random.Random(3))):
+    deck.shuffle()
+    dealt = []
+    while deck.cards_remaining() > 20:
+        dealt.append(deck.deal_card())
+        recount = sum(HI_LO_TAGS[c.rank] for c in dealt)
+        assert deck.running_count == recount
+        assert abs(deck.true_count - recount / (deck.cards_remaining() / 52)) < 1e-12
+    while deck.cards_remaining():
+        deck.deal_card()
+    assert deck.running_count == 0 and deck.true_count == 0    # Hi-Lo is balanced
+shoe = Shoe(2)
+shoe.shuffle()
+shoe.deal_card()
+shoe.shuffle()
+assert shoe.running_count == 0
+print('  PASS\n')
+
+print('=== Test 5: in-place reshuffle, cut card and burn cards ===')
+shoe = Shoe(6, rng=random.Random(9), penetration=0.8, burn_cards=3)
+buffer = shoe.codes
+orders = set()
+for _ in range(5):
+    shoe.shuffle()
+    # same buffer, same cards, a new order
+    assert shoe.codes is buffer and sorted(shoe.codes) == sorted(Shoe(6).codes)
+    orders.add(bytes(shoe.codes))
+    assert shoe.pos == 3 and shoe.running_count == 0 and shoe.cards_remaining() == 312 - 3
+    assert shoe.cut_card == 63
+    while not shoe.cut_card_reached():
+        assert shoe.cards_remaining() >= 63
+        shoe.deal_code()
+    assert shoe.cards_remaining() == 62
+assert len(orders) == 5
+# burned cards are not counted, by the shoe or a counter on it
+counter = ShoeCounter(shoe, [SYSTEMS['hi_lo']])
+counter.shuffle()
+while shoe.cards_remaining():
+    assert counter.running_counts()[0] == shoe.running_count
+    assert counter.true_counts()[0] == shoe.true_count
+    shoe.deal_code()
+# a seed fixes the card order
+first, second = Shoe(8, rng=random.Random(1)), Shoe(8, rng=random.Random(1))
+first.shuffle(); second.shuffle()
+assert first.codes == second.codes
+for bad in ({"penetration": 0}, {"penetration": 0.95}, {"burn_cards": -1}, {"burn_cards": 52}):
+    try:
+        Shoe(1, **bad)
+        assert False, "Should raise ValueError"
+    except ValueError:
+        pass
+print('  PASS\n')
+
+print('=== Test 6: penetration is capped per deck count ===')
+quiet = lambda *a, **k: None
+assert max_penetration(1) == 0.75 and max_penetration(2) == 0.875 and max_penetration(8) == 0.9
+for num_decks in (1, 2):
+    deepest = max_penetration(num_decks)
+    assert Shoe(num_decks, penetration=deepest).cut_card == MIN_CUT_CARDS
+    result = AutoGame.auto_play_loop(num_games=30000, num_decks=num_decks, penetration=deepest, balance=10**9,
+                                     seed=3, input_func=quiet, output_func=quiet, return_as_json=True,
+                                     save_results=False)
+    assert len(result['results']) == 30000
+for num_decks, penetration in ((1, 0.8), (2, 0.9)):
+    try:
+        validate_shoe(num_decks, penetration)
+        assert False, "Should raise ValueError"
+    except ValueError:
+        pass
+print('  PASS\n')
+
+print('=== Test 7: burn cards leave a quarter deck before the cut card ===')
+validate_shoe(1, burn_cards=26)
+validate_shoe(6, burn_cards=312 - 78 - 13)
+for num_decks, burn in ((1, 27), (1, 49), (6, 312 - 78 - 12)):
+    try:
+        validate_shoe(num_decks, burn_cards=burn)
+        assert False, "Should raise ValueError"
+    except ValueError:
+        pass
+result = AutoGame.auto_play_loop(num_games=30000, num_decks=1, burn_cards=26, balance=10**9, seed=3,
+                                 input_func=quiet, output_func=quiet, return_as_json=True, save_results=False)
+assert len(result['results']) == 30000
+print('  PASS\n')
+
+print('=== All hand tests PASSED ===')
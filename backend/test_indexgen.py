@@ -0,0 +1,45 @@
+import sys
+sys.path.insert(0, '.')
+import os
+import tempfile
+from indexgen import generate_indices, write_workbooks, _action_evs, STAND, HIT, DOUBLE
+from auto import STRATEGY_REGISTRY, _TCC_KEY_THRESHOLDS
+from dealer import TEN
+from strategy import read_strategy_cells, HARD
+
+print('=== Test 1: actions share the same cards ===')
+cells = STRATEGY_REGISTRY.compiled().table[STRATEGY_REGISTRY.bucket('strategies/strategy_tcc_0_1.xlsx')].tolist()
+# hole 7 under a 10, then a 4: standing on 16 loses, hitting makes 20 and wins, doubling wins 2
+evs = _action_evs([6, 3, TEN, TEN], TEN, 5, TEN, HARD, cells, 8)
+assert evs[STAND] == -1 and evs[HIT] == 1 and evs[DOUBLE] == 2, evs
+print('  PASS\n')
+
+print('=== Test 2: seeded runs do not depend on the worker count ===')
+one = generate_indices(8, 60, seed=11, num_workers=1, states_per_task=20)
+two = generate_indices(8, 60, seed=11, num_workers=2, states_per_task=20)
+assert one == two
+assert sum(one['states'].values()) == 60
+print('  PASS\n')
+
+print('=== Test 3: obvious cells come out right ===')
+result = generate_indices(8, 200, seed=3, num_workers=1)
+hard, soft, split = result['tables']['tcc_0_1']
+assert hard[20 - 4] == ['S'] * 10           # hard 20 always stands
+assert hard[11 - 4][4] == 'D'               # 11 v 6 doubles
+assert split[11 - 2][4] == 'Y'              # A,A v 6 splits
+assert hard[21 - 4] == [None] * 10          # 21 is not a decision: the template cells are kept
+assert all(None not in row for row in hard[:-1] + soft[:-1] + split)
+assert all(i['when'] in ('tc >=', 'tc <=') for i in result['indices'])
+print(f"  {len(result['indices'])} crossovers")
+print('  PASS\n')
+
+print('=== Test 4: workbooks keep the strategy layout ===')
+with tempfile.TemporaryDirectory() as out_dir:
+    paths = write_workbooks(result, out_dir)
+    assert len(paths) == len(_TCC_KEY_THRESHOLDS)
+    hard_cells, soft_cells, split_cells = read_strategy_cells(os.path.join(out_dir, 'strategy_tcc_0_1.xlsx'))
+    assert hard_cells[20 - 4] == ['S'] * 10 and hard_cells[21 - 4][0] is not None
+    assert split_cells[11 - 2][4] == 'Y'
+print('  PASS\n')
+
+print('=== All indexgen tests PASSED ===')
@@ -0,0 +1,62 @@
+import sys
+sys.path.insert(0, '.')
+import time
+from jobs import JobManager, DONE, CANCELLED
+
+
+def wait(job, timeout=60):
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+print('=== Test 1: a job runs to completion with the same rows as a direct run ===')
+from auto import AutoGame
+manager = JobManager(max_workers=1)
+job = wait(manager.submit({"num_games": 300, "balance": 1000, "bet_amount": 10, "num_decks": 6, "seed": 5}))
+assert job.status == DONE, job.snapshot()
+direct = AutoGame.auto_play_loop(num_games=300, balance=1000, bet_amount=10, num_decks=6, seed=5,
+                                 input_func=lambda *a, **k: None, output_func=lambda *a, **k: None,
+                                 return_as_json=True, save_results=False)
+assert job.result["results"] == direct["results"]
+assert job.result["final_balance"] == direct["final_balance"]
+snap = job.snapshot()
+assert snap["progress"]["hands_done"] == len(direct["results"]) and snap["progress"]["eta_seconds"] is None
+print('  PASS\n')
+
+print('=== Test 2: cancelling stops a running job early ===')
+job = manager.submit({"num_games": 10_000_000, "balance": 10**12, "bet_amount": 1, "seed": 1})
+while job.hands_done < 200:
+    time.sleep(0.01)
+snap = job.snapshot()
+assert snap["status"] == "running" and snap["progress"]["eta_seconds"] is not None
+manager.cancel(job.id)
+wait(job)
+assert job.status == CANCELLED and job.result["cancelled"]
+assert 0 < len(job.result["results"]) < 10_000_000
+print('  PASS\n')
+
+print('=== Test 3: jobs queue behind the pool limit and can be cancelled while queued ===')
+blocker = manager.submit({"num_games": 10_000_000, "balance": 10**12, "bet_amount": 1})
+queued = manager.submit({"num_games": 100})
+time.sleep(0.1)
+assert queued.status == "queued"
+manager.cancel(queued.id)
+manager.cancel(blocker.id)
+wait(queued)
+assert queued.status == CANCELLED and queued.hands_done == 0
+assert queued.result["cancelled"] and queued.result["results"] == [] and queued.result["final_balance"] == 1000
+assert queued.result["shuffles"]["hand"] == [] and queued.result["precision"]["hands"] == 0
+print('  PASS\n')
+
+print('=== Test 4: jobs report their standard error and stop on a target ===')
+job = wait(manager.submit({"num_games": 1_000_000, "balance": 10**12, "bet_amount": 1, "seed": 2,
+                           "target_se": 0.015}))
+assert job.status == DONE and job.result["precision"]["stopped"] == "target"
+snap = job.snapshot()
+assert snap["progress"]["target_se"] == 0.015
+assert abs(snap["progress"]["se"] - job.result["precision"]["se"]) < 1e-9
+print('  PASS\n')
+
+print('=== All job tests PASSED ===')
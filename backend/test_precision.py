@@ -0,0 +1,59 @@
+import sys
+sys.path.insert(0, '.')
+import numpy as np
+from precision import PrecisionTracker, se_for_ci_width, PRECISION_CHECK_HANDS, PRECISION_MIN_HANDS, Z_95
+from auto import AutoGame
+
+quiet = lambda *a, **k: None
+
+
+def run(**kwargs):
+    return AutoGame.auto_play_loop(balance=10**12, bet_amount=1, input_func=quiet, output_func=quiet,
+                                   return_as_json=True, save_results=False, **kwargs)
+
+
+print('=== Test 1: running sums match the batch ratio estimate ===')
+rng = np.random.default_rng(0)
+wagered = rng.choice([1.0, 2.0, 4.0], size=5000)
+profit = wagered * rng.choice([-1.0, 0.0, 1.0, 1.5], size=5000, p=[0.48, 0.08, 0.40, 0.04])
+tracker = PrecisionTracker()
+for p, w in zip(profit, wagered):
+    tracker.add(p, w)
+ev = profit.sum() / wagered.sum()
+z = (profit - ev * wagered) / wagered.mean()
+assert abs(tracker.ev - ev) < 1e-12
+assert abs(tracker.se - z.std(ddof=1) / np.sqrt(len(z))) < 1e-12
+assert abs(PrecisionTracker.from_arrays(profit, wagered).se - tracker.se) < 1e-12
+assert PrecisionTracker().se is None
+assert abs(se_for_ci_width(2 * Z_95 * 0.01) - 0.01) < 1e-15
+print('  PASS\n')
+
+print('=== Test 2: a run stops once the target standard error is reached ===')
+result = run(num_games=500_000, seed=3, target_se=0.012)
+precision = result['precision']
+assert precision['stopped'] == 'target' and precision['se'] <= 0.012
+assert precision['hands'] == len(result['results']) >= PRECISION_MIN_HANDS
+assert precision['hands'] % PRECISION_CHECK_HANDS == 0
+lo, hi = precision['ci95']
+assert lo < precision['ev_per_unit'] < hi
+# the reported precision is the one the rows give
+balances = np.array([row['balance'] for row in result['results']])
+bets = np.array([row['bet'] for row in result['results']])
+again = PrecisionTracker.from_arrays(np.diff(balances, prepend=10**12), bets)
+assert abs(again.se - precision['se']) < 1e-9
+print(f"  stopped after {precision['hands']} hands, se {precision['se']:.5f}")
+print('  PASS\n')
+
+print('=== Test 3: hand and time budgets still end the run ===')
+result = run(num_games=3000, seed=3, target_se=1e-6)
+assert result['precision']['stopped'] == 'hands' and len(result['results']) == 3000
+result = run(num_games=10_000_000, seed=3, target_se=1e-6, max_seconds=0.2)
+assert result['precision']['stopped'] == 'time' and len(result['results']) < 10_000_000
+try:
+    AutoGame.parallel_auto_play_loop(num_games=100, target_se=0.01, save_results=False)
+    assert False, 'parallel runs cannot stop on a target'
+except ValueError:
+    pass
+print('  PASS\n')
+
+print('=== All precision tests PASSED ===')
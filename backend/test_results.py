@@ -0,0 +1,60 @@
+import sys
+sys.path.insert(0, '.')
+import os
+import tempfile
+from results import ResultColumns, read_results
+from auto import AutoGame
+
+print('=== Test 1: column buffers grow and round-trip rows ===')
+cols = ResultColumns(capacity=4)
+rows = [{"hand": i + 1, "balance": 1000 + i * 1.5, "card_count": i % 7 - 3,
+         "true_count": (i % 7 - 3) / 4, "bet": 10 * (1 + i % 3)} for i in range(1000)]
+for row in rows:
+    cols.append(row)
+assert len(cols) == 1000
+assert cols.to_records() == rows
+assert list(cols.to_dataframe().columns) == ["hand", "balance", "card_count", "true_count", "bet"]
+print('  PASS\n')
+
+print('=== Test 2: Parquet and CSV exports read back the same ===')
+tmp = tempfile.mkdtemp()
+cols.write_parquet(os.path.join(tmp, 'r.parquet'))
+cols.write_csv(os.path.join(tmp, 'r.csv'))
+a = read_results(os.path.join(tmp, 'r.parquet'))
+b = read_results(os.path.join(tmp, 'r.csv'))
+assert a.to_dict('records') == rows
+assert (a.values == b.values).all()
+print('  PASS\n')
+
+print('=== Test 3: auto_play_loop JSON rows match the saved columns ===')
+cwd = os.getcwd()
+os.chdir(tmp)
+try:
+    result = AutoGame.auto_play_loop(
+        num_games=300, seed=2, return_as_json=True,
+        input_func=lambda *a, **k: None, output_func=lambda *a, **k: None,
+    )
+finally:
+    os.chdir(cwd)
+saved = read_results(os.path.join(tmp, 'results.parquet'))
+assert saved.to_dict('records') == result['results']
+assert not os.path.exists(os.path.join(tmp, 'results.csv')), 'CSV export is opt-in'
+print('  PASS\n')
+
+print('=== Test 4: shuffle events are recorded and saved with the results ===')
+shuffles = result['shuffles']
+assert set(shuffles) == {'hand', 'shoe_profit', 'cards_dealt'}
+assert len(shuffles['hand']) > 0 and shuffles['hand'] == sorted(shuffles['hand'])
+# every reshuffle happens past 75% penetration of the 8-deck shoe
+assert all(dealt > 52 * 8 * 0.75 for dealt in shuffles['cards_dealt'])
+events = saved.attrs['shuffles']
+assert events.to_dict('list') == shuffles
+# shoe profits add up to the balance change at each shuffle
+start = 1000
+for hand, profit in zip(shuffles['hand'], shuffles['shoe_profit']):
+    end = saved['balance'][hand - 1]
+    assert abs((end - start) - profit) < 1e-9
+    start = end
+print('  PASS\n')
+
+print('=== All results tests PASSED ===')
@@ -0,0 +1,58 @@
+import sys
+sys.path.insert(0, '.')
+import random
+import threading
+from rng import spawn_seeds
+from bj import Shoe
+from engine import simulate_many, simulate_many_batch
+from auto import AutoGame
+
+quiet = dict(input_func=lambda *a, **k: None, output_func=lambda *a, **k: None,
+             return_as_json=True, save_results=False)
+
+print('=== Test 1: explicit generators make runs reproducible ===')
+a = Shoe(2, rng=random.Random(5))
+b = Shoe(2, rng=random.Random(5))
+a.shuffle()
+b.shuffle()
+assert list(a.codes) == list(b.codes)
+s1 = simulate_many(50, rng=random.Random(1))
+s2 = simulate_many(50, rng=random.Random(1))
+assert {k: v for k, v in s1.items() if k != 'elapsed_seconds'} == {k: v for k, v in s2.items() if k != 'elapsed_seconds'}
+r1 = AutoGame.auto_play_loop(num_games=300, seed=9, **quiet)
+r2 = AutoGame.auto_play_loop(num_games=300, seed=9, **quiet)
+assert r1['results'] == r2['results']
+assert simulate_many_batch(5000, seed=4)['wins'] == simulate_many_batch(5000, seed=4)['wins']
+print('  PASS\n')
+
+print('=== Test 2: global random state is not used ===')
+random.seed(0)
+before = random.random()
+random.seed(0)
+AutoGame.auto_play_loop(num_games=100, seed=1, **quiet)
+assert random.random() == before
+print('  PASS\n')
+
+print('=== Test 3: concurrent runs do not disturb each other ===')
+out = {}
+def run(key):
+    out[key] = AutoGame.auto_play_loop(num_games=400, seed=key % 2, **quiet)['results']
+threads = [threading.Thread(target=run, args=(k,)) for k in range(4)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+assert out[0] == out[2] and out[1] == out[3]
+print('  PASS\n')
+
+print('=== Test 4: spawned shard streams are stable and distinct ===')
+seeds = spawn_seeds(123, 4)
+assert seeds == spawn_seeds(123, 4)
+assert spawn_seeds(123, 6)[:4] == seeds
+assert len(set(seeds)) == 4
+one = AutoGame.parallel_auto_play_loop(num_games=1200, seed=3, num_workers=1, shard_hands=400, bet_amount=10)
+two = AutoGame.parallel_auto_play_loop(num_games=1200, seed=3, num_workers=2, shard_hands=400, bet_amount=10)
+assert one['results'] == two['results'] and one['final_balance'] == two['final_balance']
+print('  PASS\n')
+
+print('=== All RNG tests PASSED ===')
@@ -0,0 +1,84 @@
+import sys
+sys.path.insert(0, '.')
+import random
+from auto import AutoGame, _TCC_KEY_THRESHOLDS, _TCC_KEY_TO_PATH, _tcc_slot
+from bj import Card, PlayerHand, RANKS
+from strategy import CompiledStrategy
+
+strategies = [AutoGame.Strategy(_TCC_KEY_TO_PATH[key]) for key, _ in _TCC_KEY_THRESHOLDS]
+compiled = CompiledStrategy.from_strategies(strategies)
+
+
+def random_hand(rng):
+    hand = PlayerHand()
+    while True:
+        hand.clear()
+        for _ in range(rng.choice([2, 2, 2, 3, 4])):
+            hand.draw_card(Card(rng.choice(RANKS), '♤'))
+        if hand.get_value() < 21:
+            return hand
+
+
+print('=== Test 1: compiled lookups match the DataFrame strategy ===')
+rng = random.Random(11)
+for _ in range(20000):
+    slot = rng.randrange(len(strategies))
+    hand = random_hand(rng)
+    dealer_value = rng.randint(2, 11)
+    split_ok = rng.random() < 0.8
+    expected = strategies[slot].get_action(hand, dealer_value, splitallowed=split_ok)
+    got = compiled.buckets[slot].get_action(hand, dealer_value, splitallowed=split_ok)
+    assert expected == got, (slot, hand.get_cards(), dealer_value, expected, got)
+print('  PASS\n')
+
+print('=== Test 2: overrides patch one bucket only ===')
+base_slot = _tcc_slot(0)
+patched = compiled.with_overrides(base_slot, {'hard': [[8, 0, 'S']], 'split': [[6, 0, 'N']]})
+hand = PlayerHand()
+hand.draw_card(Card('10', '♤'))
+hand.draw_card(Card('2', '♤'))
+assert compiled.buckets[base_slot].get_action(hand, 2) == 'h'
+assert patched.buckets[base_slot].get_action(hand, 2) == 's'
+assert patched.buckets[base_slot - 1].get_action(hand, 2) == compiled.buckets[base_slot - 1].get_action(hand, 2)
+eights = PlayerHand()
+eights.draw_card(Card('8', '♤'))
+eights.draw_card(Card('8', '♡'))
+assert compiled.buckets[base_slot].get_action(eights, 2) == 'v'
+assert patched.buckets[base_slot].get_action(eights, 2) != 'v'
+print('  PASS\n')
+
+print('=== Test 3: decode_tables round-trips the workbook cells ===')
+for slot, s in enumerate(strategies):
+    hard, soft, split = compiled.decode_tables(slot)
+    assert hard == s.hard_df.values.tolist()
+    assert soft == s.soft_df.values.tolist()
+    assert split == s.split_df.values.tolist()
+print('  PASS\n')
+
+print('=== Test 4: registry reuses the bundle and notices edited workbooks ===')
+import os
+import shutil
+import tempfile
+from strategy import StrategyRegistry
+tmp = tempfile.mkdtemp()
+paths = []
+for key, _ in _TCC_KEY_THRESHOLDS:
+    paths.append(shutil.copy(_TCC_KEY_TO_PATH[key], tmp))
+bundle = os.path.join(tmp, 'bundle.npz')
+registry = StrategyRegistry(paths, bundle_path=bundle)
+first = registry.compiled()
+assert os.path.exists(bundle)
+assert registry.compiled() is first, 'Unchanged workbooks should not be reloaded'
+fresh = StrategyRegistry(paths, bundle_path=bundle)
+assert (fresh.compiled().table == first.table).all() and fresh.version == registry.version
+from openpyxl import load_workbook
+wb = load_workbook(paths[7])
+wb.active['B11'] = 'S'   # H12 vs 2 in tcc_0_1
+wb.save(paths[7])
+reloaded = registry.compiled()
+assert reloaded is not first and registry.version != fresh.version
+assert registry.tables(paths[7])[0][8][0] == 'S'
+shutil.rmtree(tmp)
+print('  PASS\n')
+
+print('=== All strategy tests PASSED ===')
@@ -0,0 +1,52 @@
+import sys
+sys.path.insert(0, '.')
+import csv
+import json
+import os
+import subprocess
+import tempfile
+from sweep import sweep_iter, expand_grid, validate_point, SWEEP_METRICS
+from auto import AutoGame
+
+quiet = lambda *a, **k: None
+
+print('=== Test 1: grids expand to every combination ===')
+points = expand_grid({"num_decks": [2, 8], "penetration": [0.6, 0.8], "insurance_threshold": [None, 3]})
+assert len(points) == 8 and points[0] == {"num_decks": 2, "penetration": 0.6, "insurance_threshold": None}
+for bad in ({"decks": 2}, {"penetration": 0.95}, {"num_decks": 1, "penetration": 0.8}, {"bet_ramp": [1, 2]}):
+    try:
+        validate_point(bad)
+        assert False, bad
+    except ValueError:
+        pass
+print('  PASS\n')
+
+print('=== Test 2: penetration moves the reshuffle ===')
+for penetration in (0.5, 0.85):
+    _, summary = AutoGame.collect(AutoGame.auto_play_iter(num_games=2000, num_decks=6, balance=10**9, seed=1,
+                                                          penetration=penetration,
+                                                          input_func=quiet, output_func=quiet))
+    dealt = summary['shuffles']['cards_dealt']
+    assert all(312 * penetration <= d < 312 * penetration + 20 for d in dealt), (penetration, dealt)
+print('  PASS\n')
+
+print('=== Test 3: pooled sweeps match serial ones and stream every point ===')
+serial = sorted(sweep_iter(points[:4], 1500, seed=5, num_workers=1), key=lambda row: row['index'])
+pooled = sorted(sweep_iter(points[:4], 1500, seed=5, num_workers=2), key=lambda row: row['index'])
+strip = lambda rows: [{k: v for k, v in row.items() if k != 'seconds'} for row in rows]
+assert strip(serial) == strip(pooled)
+assert [row['index'] for row in serial] == [0, 1, 2, 3]
+assert all(row['hands'] == 1500 and row['sd_per_hand'] > 0 and 0 <= row['risk_of_ruin'] <= 1 for row in serial)
+print('  PASS\n')
+
+print('=== Test 4: the CLI writes a row per finished point ===')
+with tempfile.TemporaryDirectory() as tmp:
+    out = os.path.join(tmp, 'sweep.csv')
+    subprocess.run([sys.executable, 'sweep.py', '--grid', json.dumps({"num_decks": [1, 6]}), '--hands', '500',
+                    '--seed', '3', '--workers', '1', '--out', out], check=True, capture_output=True)
+    with open(out) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2 and set(SWEEP_METRICS) <= set(rows[0])
+print('  PASS\n')
+
+print('=== All sweep tests PASSED ===')
@@ -0,0 +1,109 @@
+import sys
+sys.path.insert(0, '.')
+from array import array
+import numpy as np
+from bj import Shoe, CARD_TABLE, HI_LO_TAGS
+from rng import make_rng
+from auto import AutoGame, STRATEGY_REGISTRY
+from table import play_table, validate_seats
+
+quiet = lambda *a, **k: None
+RAMP = [12, 12, 10, 8, 6, 4, 2, 1, 0, 0, 0]
+
+
+def single(num_games, seed, balance=10**6, **options):
+    columns, summary = AutoGame.collect(AutoGame.auto_play_iter(
+        num_games=num_games, balance=balance, seed=seed, input_func=quiet, output_func=quiet, **options))
+    return columns, summary
+
+
+print('=== Test 1: one seat plays exactly the hands of auto_play_iter ===')
+for options in ({}, {"bet_ramp": RAMP, "insurance_threshold": 2}):
+    expected, expected_summary = single(10000, seed=4, bet_amount=10, **options)
+    columns, summary = play_table([{"bet_amount": 10, "balance": 10**6, **options}], num_rounds=10000, seed=4)
+    assert (columns.column("round") == expected.column("hand")).all()
+    assert (columns.column("balance") == expected.column("balance")).all()
+    assert (columns.column("bet") == expected.column("bet")).all()
+    assert summary["shuffles"] == expected_summary["shuffles"]
+    assert summary["seats"][0]["final_balance"] == expected_summary["final_balance"]
+print('  PASS\n')
+
+print('=== Test 2: seats share the shoe and its count ===')
+seats = [{"bet_amount": 10, "balance": 10**6} for _ in range(7)]
+columns, summary = play_table(seats, num_rounds=3000, seed=1)
+rounds, seat = columns.column("round"), columns.column("seat")
+assert len(columns) == 7 * 3000 and summary["rounds"] == 3000
+assert (np.bincount(seat) == 3000).all()
+# every seat of a round bet on the same count
+tc = columns.column("true_count").reshape(3000, 7)
+assert (tc == tc[:, :1]).all() and (rounds.reshape(3000, 7) == np.arange(1, 3001)[:, None]).all()
+_, alone = play_table(seats[:1], num_rounds=3000, seed=1)
+# seven seats use up a shoe in far fewer rounds
+assert len(summary["shuffles"]["hand"]) > 3 * len(alone["shuffles"]["hand"])
+assert abs(sum(s["total_profit"] for s in summary["seats"]) - columns.column("profit").sum()) < 1e-6
+print('  PASS\n')
+
+print('=== Test 3: seats sit out at their own ramp; an empty table reshuffles ===')
+columns, summary = play_table([{"bet_amount": 10, "balance": 10**6},
+                               {"bet_amount": 10, "balance": 10**6, "bet_ramp": RAMP}], num_rounds=5000, seed=2)
+hands = [s["hands"] for s in summary["seats"]]
+assert hands[0] == 5000 and 0 < hands[1] < 5000
+columns, summary = play_table([{"bet_amount": 10, "balance": 10**6, "bet_ramp": RAMP}] * 3, num_rounds=5000,
+                              seed=2)
+# shoes left before the cut card (8 decks at 0.75 penetration) in rounds nobody played
+early = [(h, dealt) for h, dealt in zip(summary["shuffles"]["hand"], summary["shuffles"]["cards_dealt"])
+         if dealt <= 312]
+assert early and not set(h + 1 for h, _ in early) & set(columns.column("round").tolist())
+print('  PASS\n')
+
+print('=== Test 4: a broke seat stays out and the run ends when all are broke ===')
+columns, summary = play_table([{"bet_amount": 100, "balance": 200}, {"bet_amount": 1, "balance": 10**6}],
+                              num_rounds=2000, seed=3)
+broke = summary["seats"][0]
+assert broke["final_balance"] <= 0 and broke["hands"] < 2000 and summary["seats"][1]["hands"] == 2000
+_, summary = play_table([{"bet_amount": 100, "balance": 200}] * 2, num_rounds=100000, seed=3)
+assert summary["stopped"] == "bankroll" and summary["rounds"] < 100000
+print('  PASS\n')
+
+print('=== Test 5: a dealer blackjack settles every seat at once ===')
+shoe = Shoe(1)
+# seat 0: A, J (blackjack); seat 1: 10, Q (20); dealer: A, K
+shoe.codes = array('B', [12, 8, 12, 9, 10, 11]) + shoe.codes[6:]
+game = shoe.new_game(2)
+strategy = STRATEGY_REGISTRY.compiled().buckets[7]
+results = AutoGame.played_table(game, [0, 1], [10, 10], [100, 100], [strategy, strategy])
+assert results == [("P", 10), ("L", 10)] and len(game.dealer_hand.cards) == 2
+print('  PASS\n')
+
+print('=== Test 6: invalid tables are rejected ===')
+for bad in ([], [{}] * 8, [{"bet_amount": 0}], [{"bet_ramp": [1, 2]}], [{"seat_size": 3}]):
+    try:
+        validate_seats(bad)
+        assert False, "Should raise ValueError"
+    except ValueError:
+        pass
+print('  PASS\n')
+
+print('=== Test 7: a full table on one or two decks never runs the shoe dry ===')
+for num_decks in (1, 2):
+    columns, summary = play_table([{"bet_amount": 10, "balance": 10**6}] * 7, num_rounds=3000, num_decks=num_decks,
+                                  seed=1)
+    assert summary["rounds"] == 3000 and all(s["hands"] == 3000 for s in summary["seats"])
+_, summary = play_table([{}] * 7, num_rounds=500, num_decks=1, burn_cards=26, seed=1)
+assert summary["rounds"] == 500
+# a round that still runs out gets the discards shuffled back in, and the shoe is retired after it
+shoe = Shoe(1, rng=make_rng(2))
+shoe.shuffle()
+for _ in range(40):
+    shoe.deal_code()
+game = shoe.new_game(7)
+game.deal_seats(range(7))
+on_table = [card for seat in game.seats for card in seat[0].cards] + game.dealer_hand.cards
+assert shoe.cut_card_reached() and shoe.pos == 16 and shoe.cards_remaining() == 36
+assert sorted(shoe.codes) == sorted(Shoe(1).codes)
+# the cards on the table stay out of the shoe
+assert sorted(id(CARD_TABLE[code]) for code in shoe.codes[:16]) == sorted(id(card) for card in on_table)
+assert shoe.running_count == sum(HI_LO_TAGS[card.rank] for card in on_table)
+print('  PASS\n')
+
+print('=== All table tests PASSED ===')
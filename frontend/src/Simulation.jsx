@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import ResultsChart from './ResultsChart';
 import './App.css';
 import './Simulation.css';
 
@@ -21,6 +22,11 @@ const TCC_KEYS = [
 // [tcc_8plus, tcc_7, tcc_6, tcc_5, tcc_4, tcc_3, tcc_2, tcc_0_1, tcc_neg1, tcc_neg2, tcc_under_neg2]
 const DEFAULT_BET_RAMP = [12, 12, 12, 10, 8, 6, 4, 1, 1, 1, 1];
 
+// Points kept for the live balance chart (and the dashboard history), however long the run
+const LIVE_CHART_POINTS = 500;
+// Least time between redraws of the live chart while the stream is read (ms)
+const LIVE_CHART_REDRAW_MS = 100;
+
 // Cell colour coding
 const ACTION_COLORS = {
   H:  '#1a1a1a', S:  '#1f3a5f', D:  '#5c3a00',
@@ -35,6 +41,7 @@ const Simulation = () => {
   const [betAmount, setBetAmount] = useState(10);
   const [numDecks, setNumDecks] = useState(8);
   const [graphUrl, setGraphUrl] = useState(null);
+  const [liveSeries, setLiveSeries] = useState([]);   // [{handNumber, balance, trueCount}] drawn while streaming
   const [isBetBalanceModalOpen, setIsBetBalanceModalOpen] = useState(false);
   const [draftBalance, setDraftBalance] = useState('');
   const [draftBetAmount, setDraftBetAmount] = useState('');
@@ -196,7 +203,8 @@ const Simulation = () => {
       return;
     }
 
-    setOutput('Running REST simulation...');
+    setOutput('Running simulation...');
+    setLiveSeries([]);
 
     // Build effective bet ramp: 11 values in TCC_KEYS order.
     // Each stratRow stores its own betMultiplier; if stratRows is populated
@@ -206,7 +214,7 @@ const Simulation = () => {
       return row?.betMultiplier ?? betRamp[i] ?? 1;
     });
 
-    const res = await fetch('http://localhost:8000/simulate', {
+    const res = await fetch('http://localhost:8000/simulate/stream', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({
@@ -233,9 +241,49 @@ const Simulation = () => {
       throw new Error(`Server error ${res.status}: ${errorDetail}`);
     }
 
-    const data = await res.json();
+    // NDJSON: one row per hand as it is played, then {"done": true, ...totals}.
+    // Rows are thinned to about LIVE_CHART_POINTS points and drawn as they arrive.
+    const stride = Math.max(1, Math.ceil(games / LIVE_CHART_POINTS));
+    const points = [];
+    let played = 0;
+    let lastRow = null;
+    let data = null;
+    const readLine = (line) => {
+      if (!line.trim()) return;
+      const row = JSON.parse(line);
+      if (row.done) { data = row; return; }
+      played += 1;
+      lastRow = row;
+      if (played === 1 || row.hand % stride === 0)
+        points.push({ handNumber: row.hand, balance: row.balance, trueCount: row.true_count });
+    };
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let pending = '';
+    let lastDraw = 0;
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      pending += decoder.decode(value, { stream: true });
+      const lines = pending.split('\n');
+      pending = lines.pop();          // a row cut off at the end of this chunk
+      lines.forEach(readLine);
+      const now = performance.now();
+      if (now - lastDraw >= LIVE_CHART_REDRAW_MS) {
+        lastDraw = now;
+        setLiveSeries([...points]);
+        setOutput(`Running simulation... ${played.toLocaleString()} of ${games.toLocaleString()} hands`);
+      }
+    }
+    readLine(pending + decoder.decode());
+    if (lastRow && points[points.length - 1]?.handNumber !== lastRow.hand)
+      points.push({ handNumber: lastRow.hand, balance: lastRow.balance, trueCount: lastRow.true_count });
+    setLiveSeries([...points]);
+    if (!data) throw new Error('The simulation stream ended before its summary line.');
+
     const finalBalance = data.final_balance ?? null;
-    const gamesActuallyPlayed = data.results?.length ?? data.num_games;
+    const gamesActuallyPlayed = played;
     const balanceMsg = finalBalance === 0
       ? `You're broke! Ran out of money on game ${gamesActuallyPlayed} of ${data.num_games}.`
       : `Success! ${data.num_games} games played. Final balance: $${finalBalance ?? 'unknown'}`;
@@ -248,15 +296,10 @@ const Simulation = () => {
       finalBankroll: data.final_balance || bal + (data.total_profit || 0),
       netProfit: data.total_profit || 0,
 
-        balanceHistory: data.results?.length > 500                      //<---------------------------NEW Fix: Updated results history for history clearing button
-        ? data.results.filter((_, idx) => idx % Math.ceil(data.results.length / 500) === 0)
-        .map((r) => ({ handNumber: r.hand, balance: r.balance }))
-        : data.results?.map((r) => ({ handNumber: r.hand, balance: r.balance })) || [],
+        // the streamed points are already thinned to about 500
+        balanceHistory: points.map((p) => ({ handNumber: p.handNumber, balance: p.balance })),
 
-        trueCountHistory: data.results?.length > 500
-        ? data.results.filter((_, idx) => idx % Math.ceil(data.results.length / 500) === 0)
-        .map((r) => ({ handNumber: r.hand, trueCount: r.true_count }))
-        : data.results?.map((r) => ({ handNumber: r.hand, trueCount: r.true_count })) || [],
+        trueCountHistory: points.map((p) => ({ handNumber: p.handNumber, trueCount: p.trueCount })),
 
         inputs: {    //<-------------------------NEW Added the original user inputs to the dashboard graphs
         numGames: games,
@@ -440,6 +483,10 @@ const Simulation = () => {
              {output && <div className="results-output-line">{output}</div>}
              {!output && !resultsData && 'Click "Run Simulation" to start.'}
 
+             {liveSeries.length > 0 && (
+               <ResultsChart data={liveSeries} title="Balance" dataKey="balance" yLabel="Balance ($)" />
+             )}
+
              {resultsData && resultsData.length > 0 && (
             <div className="results-scroll">
             <table className="simulation-results-table">